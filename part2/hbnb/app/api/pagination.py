@@ -0,0 +1,45 @@
+"""Query-string handling shared by the paginated list endpoints."""
+from flask import request
+from app.persistence.repository import MAX_PAGE_LIMIT
+
+PAGINATION_PARAMS = {
+    'limit': 'Maximum number of items to return (capped by the server)',
+    'cursor': 'Opaque cursor taken from the X-Next-Cursor header of the previous page'
+}
+
+def page_args():
+    """Read ``limit`` and ``cursor`` from the query string."""
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("Limit must be a positive integer")
+    return {'limit': limit, 'cursor': request.args.get('cursor')}
+
+IDS_PARAMS = {
+    'ids': 'Comma-separated ids to fetch instead of a page, returned in that order '
+           '(ids matching nothing are listed in the X-Missing-Ids header)'
+}
+
+def ids_arg():
+    """Read ``ids`` from the query string, or None without one; raises ValueError."""
+    value = request.args.get('ids')
+    if value is None:
+        return None
+    ids = [obj_id.strip() for obj_id in value.split(',') if obj_id.strip()]
+    if not ids:
+        raise ValueError("ids must list at least one id")
+    if len(ids) > MAX_PAGE_LIMIT:
+        raise ValueError(f"ids must list at most {MAX_PAGE_LIMIT} ids")
+    if set(request.args) != {'ids'}:
+        raise ValueError("ids cannot be combined with limit or cursor")
+    return ids
+
+def missing_headers(missing):
+    """Response headers listing the requested ids that matched nothing."""
+    return {'X-Missing-Ids': ','.join(missing)} if missing else {}
+
+def page_headers(next_cursor):
+    """Response headers advertising the next page, if there is one."""
+    return {'X-Next-Cursor': next_cursor} if next_cursor else {}
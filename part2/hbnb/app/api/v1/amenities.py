@@ -1,6 +1,7 @@
 from datetime import datetime
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import facade
+from app.api.pagination import IDS_PARAMS, PAGINATION_PARAMS, ids_arg, missing_headers, page_args, page_headers
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -27,16 +28,27 @@ class AmenityList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params={**PAGINATION_PARAMS, **IDS_PARAMS})
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters or ids')
     def get(self):
-        """Get list of all amenities"""
-        amenities = facade.get_all_amenities()
+        """Get a page of amenities, or amenities by ids"""
+        try:
+            ids = ids_arg()
+            if ids is not None:
+                amenities, missing = facade.get_amenities_by_ids(ids)
+                headers = missing_headers(missing)
+            else:
+                amenities, next_cursor = facade.get_amenities_page(**page_args())
+                headers = page_headers(next_cursor)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return [{
             'id': amenity.id,
             'name': amenity.name,
             'created_at': amenity.created_at.isoformat() if isinstance(amenity.created_at, datetime) else str(amenity.created_at),
             'updated_at': amenity.updated_at.isoformat() if isinstance(amenity.updated_at, datetime) else str(amenity.updated_at)
-        } for amenity in amenities], 200
+        } for amenity in amenities], 200, headers
         
 @api.route('/<string:amenity_id>')
 @api.param('amenity_id', 'The amenity identifier')
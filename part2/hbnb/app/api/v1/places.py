@@ -1,5 +1,8 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import facade
+from app.api.pagination import IDS_PARAMS, PAGINATION_PARAMS, ids_arg, missing_headers, page_args, page_headers
+from app.persistence.geo import parse_bbox
 from datetime import datetime
 
 api = Namespace('places', description='Place operations')
@@ -66,16 +69,75 @@ class PlaceList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params={**PAGINATION_PARAMS, **IDS_PARAMS})
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters or ids')
     def get(self):
-        """Retrieve a list of all places"""
-        places = facade.get_all_places()
+        """Retrieve a page of places, or places by ids"""
+        try:
+            ids = ids_arg()
+            if ids is not None:
+                places, missing = facade.get_places_by_ids(ids)
+                headers = missing_headers(missing)
+            else:
+                places, next_cursor = facade.get_places_page(**page_args())
+                headers = page_headers(next_cursor)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return [{
+            'id': place.id,
+            'title': place.title,
+            'latitude': place.latitude,
+            'longitude': place.longitude,
+            'review_count': place.review_count,
+            'average_rating': place.average_rating
+        } for place in places], 200, headers
+
+SEARCH_PARAMS = {
+    'lat': 'Latitude of the search centre',
+    'lon': 'Longitude of the search centre',
+    'radius_km': 'Search radius in kilometres (needs lat and lon)',
+    'bbox': 'Bounding box min_lon,min_lat,max_lon,max_lat',
+    **PAGINATION_PARAMS
+}
+MAX_RADIUS_KM = 500
+
+def search_args():
+    """Read the geo search arguments from the query string; raises ValueError."""
+    args = {}
+    for name, key in (('lat', 'latitude'), ('lon', 'longitude'), ('radius_km', 'radius_km')):
+        value = request.args.get(name)
+        if value is not None:
+            try:
+                args[key] = float(value)
+            except ValueError:
+                raise ValueError(f"{name} must be a number")
+    if args.get('radius_km', 0) > MAX_RADIUS_KM:
+        raise ValueError(f"radius_km must be at most {MAX_RADIUS_KM}")
+    if request.args.get('bbox') is not None:
+        args['bbox'] = parse_bbox(request.args['bbox'])
+    return args
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc(params=SEARCH_PARAMS)
+    @api.response(200, 'Places retrieved successfully, nearest first')
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """Retrieve a page of places within radius_km of lat/lon or inside bbox"""
+        try:
+            results, next_cursor = facade.search_places(**search_args(), **page_args())
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return [{
             'id': place.id,
             'title': place.title,
             'latitude': place.latitude,
-            'longitude': place.longitude
-        } for place in places], 200
+            'longitude': place.longitude,
+            'review_count': place.review_count,
+            'average_rating': place.average_rating,
+            'distance_km': round(distance, 3)
+        } for place, distance in results], 200, page_headers(next_cursor)
 
 @api.route('/<string:place_id>')
 @api.param('place_id', 'The place identifier')
@@ -136,6 +198,9 @@ place_detail_model = api.model('PlaceDetail', {
     'owner': fields.Nested(user_model, description='Owner details'),
     'amenities': fields.List(fields.Nested(amenity_model), description='List of amenities'),
     'reviews': fields.List(fields.Nested(review_model), description='List of reviews'),
+    'review_count': fields.Integer(description='Number of reviews'),
+    'average_rating': fields.Float(description='Mean rating, null without reviews'),
+    'rating_histogram': fields.Raw(description='Number of reviews per rating, 1 to 5'),
     'created_at': fields.String(description='Creation timestamp'),
     'updated_at': fields.String(description='Last update timestamp')
 })
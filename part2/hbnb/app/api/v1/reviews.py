@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import facade
+from app.api.pagination import PAGINATION_PARAMS, page_args, page_headers
 from datetime import datetime
 
 api = Namespace('reviews', description='Review operations')
@@ -35,17 +36,22 @@ class ReviewList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params=PAGINATION_PARAMS)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
+        """Retrieve a page of reviews"""
+        try:
+            reviews, next_cursor = facade.get_reviews_page(**page_args())
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return [{
             'id': review.id,
             'text': review.text,
             'rating': review.rating,
             'created_at': review.created_at.isoformat() if isinstance(review.created_at, datetime) else str(review.created_at),
             'updated_at': review.updated_at.isoformat() if isinstance(review.updated_at, datetime) else str(review.updated_at)
-        } for review in reviews], 200
+        } for review in reviews], 200, page_headers(next_cursor)
 
 @api.route('/<string:review_id>')
 @api.param('review_id', 'The review identifier')
@@ -1,6 +1,7 @@
 from datetime import datetime
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import facade
+from app.api.pagination import IDS_PARAMS, PAGINATION_PARAMS, ids_arg, missing_headers, page_args, page_headers
 
 api = Namespace('users', description='User operations')
 
@@ -43,10 +44,21 @@ class UserList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params={**PAGINATION_PARAMS, **IDS_PARAMS})
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters or ids')
     def get(self):
-        """Get list of all users"""
-        users = facade.get_all_users()
+        """Get a page of users, or users by ids"""
+        try:
+            ids = ids_arg()
+            if ids is not None:
+                users, missing = facade.get_users_by_ids(ids)
+                headers = missing_headers(missing)
+            else:
+                users, next_cursor = facade.get_users_page(**page_args())
+                headers = page_headers(next_cursor)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return [{
             'id': user.id, 
             'first_name': user.first_name, 
@@ -54,7 +66,7 @@ class UserList(Resource):
             'email': user.email,
             'created_at': user.created_at.isoformat() if isinstance(user.created_at, datetime) else str(user.created_at),
             'updated_at': user.updated_at.isoformat() if isinstance(user.updated_at, datetime) else str(user.updated_at)
-        } for user in users], 200
+        } for user in users], 200, headers
 
 @api.route('/<string:user_id>')
 @api.param('user_id', 'The user identifier')
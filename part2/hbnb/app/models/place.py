@@ -13,6 +13,9 @@ class Place(BaseModel):
         self.longitude = longitude
         self.owner_id = owner_id
         self.amenities = amenities if amenities else []
+        # Review ids and rating aggregates, maintained by the facade
+        self.reviews = []
+        self.reset_ratings()
 
     def _validate_string(self, value, field_name, max_length):
         if not isinstance(value, str) or len(value.strip()) == 0:
@@ -57,6 +60,26 @@ class Place(BaseModel):
             raise ValueError("Longitude must be between -180 and 180")
         self._longitude = float(value)
 
+    @property
+    def average_rating(self):
+        """Mean rating, or None when the place has no reviews"""
+        return self.rating_sum / self.review_count if self.review_count else None
+
+    def reset_ratings(self):
+        self.review_count = 0
+        self.rating_sum = 0
+        self.rating_histogram = {rating: 0 for rating in range(1, 6)}
+
+    def add_rating(self, rating):
+        self.review_count += 1
+        self.rating_sum += rating
+        self.rating_histogram[rating] += 1
+
+    def remove_rating(self, rating):
+        self.review_count -= 1
+        self.rating_sum -= rating
+        self.rating_histogram[rating] -= 1
+
     def update(self, data):
         if 'title' in data:
             self.title = self._validate_string(data['title'], "Title", 100)
@@ -0,0 +1,43 @@
+"""Distances and bounding boxes for the in-memory place search."""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def bbox_around(latitude, longitude, radius_km):
+    """Bounding box ``(min_lat, min_lon, max_lat, max_lon)`` of a circle.
+
+    Clamped to the valid coordinate ranges; circles crossing the poles or
+    the antimeridian are truncated there.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    d_lon = 180.0 if cos_lat < 1e-9 else min(180.0, d_lat / cos_lat)
+    return (max(-90.0, latitude - d_lat), max(-180.0, longitude - d_lon),
+            min(90.0, latitude + d_lat), min(180.0, longitude + d_lon))
+
+def bbox_center(bbox):
+    """Centre ``(latitude, longitude)`` of a bbox, the origin of bbox-only searches."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+def in_bbox(latitude, longitude, bbox):
+    """Whether a point lies inside ``bbox`` (edges included)."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    return min_lat <= latitude <= max_lat and min_lon <= longitude <= max_lon
+
+def parse_bbox(value):
+    """Parse ``min_lon,min_lat,max_lon,max_lat`` (GeoJSON order) into a bbox tuple."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat within valid coordinates")
+    return min_lat, min_lon, max_lat, max_lon
@@ -0,0 +1,32 @@
+"""Opaque cursors for keyset pagination over ``(created_at, id)``."""
+import base64
+import json
+from datetime import datetime
+
+def encode_cursor(created_at, obj_id):
+    """Encode the sort key of the last row of a page into an opaque string."""
+    raw = json.dumps([created_at.isoformat(), obj_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor back into ``(created_at, id)``; raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        created_at, obj_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(obj_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+def encode_distance_cursor(distance, obj_id):
+    """Encode the ``(distance, id)`` sort key of a distance-ordered page."""
+    raw = json.dumps([distance, obj_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_distance_cursor(cursor):
+    """Decode a distance cursor into ``(distance, id)``; raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        distance, obj_id = json.loads(raw)
+        return float(distance), str(obj_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
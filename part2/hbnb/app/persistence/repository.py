@@ -1,4 +1,14 @@
+import heapq
+import math
 from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from collections import defaultdict
+from app.persistence import geo
+from app.persistence.pagination import (encode_cursor, decode_cursor,
+                                        encode_distance_cursor, decode_distance_cursor)
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
 
 class Repository(ABC):
     @abstractmethod
@@ -9,10 +19,18 @@ class Repository(ABC):
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_page(self, limit=None, cursor=None):
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -29,16 +47,40 @@ class Repository(ABC):
 class InMemoryRepository(Repository):
     def __init__(self):
         self._storage = {}
+        self._order = []  # sorted (created_at, id) keys, for keyset pagination
 
     def add(self, obj):
+        if obj.id not in self._storage:
+            insort(self._order, (obj.created_at, obj.id))
         self._storage[obj.id] = obj
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        """Return ``(items, missing)`` for ``obj_ids``, in the order they were given.
+
+        A repeated id is returned once; ``missing`` lists the ids not stored.
+        """
+        obj_ids = list(dict.fromkeys(obj_ids))
+        items = [self._storage[obj_id] for obj_id in obj_ids if obj_id in self._storage]
+        return items, [obj_id for obj_id in obj_ids if obj_id not in self._storage]
+
     def get_all(self):
         return list(self._storage.values())
 
+    def get_page(self, limit=None, cursor=None):
+        """Return ``(items, next_cursor)`` ordered by ``(created_at, id)``."""
+        limit = min(limit or DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT)
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        start = bisect_right(self._order, decode_cursor(cursor)) if cursor else 0
+        keys = self._order[start:start + limit + 1]
+        items = [self._storage[obj_id] for _, obj_id in keys[:limit]]
+        if len(keys) <= limit:
+            return items, None
+        return items, encode_cursor(*keys[limit - 1])
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
@@ -46,7 +88,9 @@ class InMemoryRepository(Repository):
 
     def delete(self, obj_id):
         if obj_id in self._storage:
-            del self._storage[obj_id]
+            obj = self._storage.pop(obj_id)
+            index = bisect_right(self._order, (obj.created_at, obj.id)) - 1
+            del self._order[index]
             return True
         return False
 
@@ -56,4 +100,102 @@ class InMemoryRepository(Repository):
     def get_by_email(self, email):
         return self.get_by_attribute('email', email)
     
-    
\ No newline at end of file
+    
+
+class PlaceRepository(InMemoryRepository):
+    """In-memory places with a grid index for geo searches.
+
+    The world is cut into ``GRID_CELL_DEGREES`` square cells, each holding
+    the ids of the places inside it, so a search only looks at the cells
+    its bounding box overlaps instead of every place.
+    """
+    GRID_CELL_DEGREES = 1.0
+
+    def __init__(self):
+        super().__init__()
+        self._grid = defaultdict(set)
+        self._cells = {}  # place id -> its grid cell
+
+    def _cell(self, latitude, longitude):
+        size = self.GRID_CELL_DEGREES
+        return math.floor(latitude / size), math.floor(longitude / size)
+
+    def _index(self, obj):
+        cell = self._cell(obj.latitude, obj.longitude)
+        old = self._cells.get(obj.id)
+        if old == cell:
+            return
+        if old is not None:
+            self._unindex(obj.id)
+        self._grid[cell].add(obj.id)
+        self._cells[obj.id] = cell
+
+    def _unindex(self, obj_id):
+        cell = self._cells.pop(obj_id, None)
+        if cell is not None:
+            self._grid[cell].discard(obj_id)
+            if not self._grid[cell]:
+                del self._grid[cell]
+
+    def add(self, obj):
+        super().add(obj)
+        self._index(obj)
+
+    def update(self, obj_id, data):
+        super().update(obj_id, data)
+        obj = self.get(obj_id)
+        if obj:
+            self._index(obj)
+
+    def delete(self, obj_id):
+        self._unindex(obj_id)
+        return super().delete(obj_id)
+
+    def search(self, latitude=None, longitude=None, radius_km=None, bbox=None, limit=None, cursor=None):
+        """Return ``(items, next_cursor)`` of the places near a point or in a box.
+
+        Either ``radius_km`` around ``(latitude, longitude)`` or a ``bbox``
+        (``(min_lat, min_lon, max_lat, max_lon)``), or both. Items are
+        ``(place, distance_km)`` pairs ordered by ``(distance, id)`` from the
+        point, or from the centre of the box when no point is given.
+        """
+        limit = min(limit or DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT)
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        if radius_km is not None:
+            circle = geo.bbox_around(latitude, longitude, radius_km)
+            bbox = circle if bbox is None else (
+                max(bbox[0], circle[0]), max(bbox[1], circle[1]),
+                min(bbox[2], circle[2]), min(bbox[3], circle[3]))
+            if bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+                return [], None
+        if latitude is None or longitude is None:
+            latitude, longitude = geo.bbox_center(bbox)
+        after = decode_distance_cursor(cursor) if cursor else None
+
+        min_row, min_col = self._cell(bbox[0], bbox[1])
+        max_row, max_col = self._cell(bbox[2], bbox[3])
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self._grid):
+            cells = [cell for cell in self._grid
+                     if min_row <= cell[0] <= max_row and min_col <= cell[1] <= max_col]
+        else:
+            cells = [(row, col) for row in range(min_row, max_row + 1)
+                     for col in range(min_col, max_col + 1) if (row, col) in self._grid]
+
+        matches = []
+        for cell in cells:
+            for obj_id in self._grid[cell]:
+                place = self._storage[obj_id]
+                if not geo.in_bbox(place.latitude, place.longitude, bbox):
+                    continue
+                distance = geo.haversine_km(latitude, longitude, place.latitude, place.longitude)
+                if radius_km is not None and distance > radius_km:
+                    continue
+                if after is None or (distance, obj_id) > after:
+                    matches.append((distance, obj_id))
+        page = heapq.nsmallest(limit + 1, matches)
+
+        items = [(self._storage[obj_id], distance) for distance, obj_id in page[:limit]]
+        if len(page) <= limit:
+            return items, None
+        return items, encode_distance_cursor(*page[limit - 1])
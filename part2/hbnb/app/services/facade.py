@@ -1,4 +1,4 @@
-from app.persistence.repository import InMemoryRepository
+from app.persistence.repository import InMemoryRepository, PlaceRepository
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
@@ -7,7 +7,7 @@ from app.models.review import Review
 class HBnBFacade:
     def __init__(self):
         self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
+        self.place_repo = PlaceRepository()
         self.review_repo = InMemoryRepository()
         self.amenity_repo = InMemoryRepository()
 
@@ -26,6 +26,12 @@ class HBnBFacade:
     def get_all_users(self):
         return self.user_repo.get_all()
 
+    def get_users_by_ids(self, user_ids):
+        return self.user_repo.get_many(user_ids)
+
+    def get_users_page(self, limit=None, cursor=None):
+        return self.user_repo.get_page(limit, cursor)
+
     def update_user(self, user_id, user_data):
         user = self.get_user(user_id)
         if not user:
@@ -45,6 +51,12 @@ class HBnBFacade:
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    def get_amenities_by_ids(self, amenity_ids):
+        return self.amenity_repo.get_many(amenity_ids)
+
+    def get_amenities_page(self, limit=None, cursor=None):
+        return self.amenity_repo.get_page(limit, cursor)
+
     def update_amenity(self, amenity_id, amenity_data):
         amenity = self.get_amenity(amenity_id)
         if not amenity:
@@ -99,6 +111,34 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_by_ids(self, place_ids):
+        """
+        Retrieves places by ID, in that order, and the IDs that matched none
+        """
+        return self.place_repo.get_many(place_ids)
+
+    def get_places_page(self, limit=None, cursor=None):
+        """
+        Retrieves one page of places and the cursor of the next one
+        """
+        return self.place_repo.get_page(limit, cursor)
+
+    def search_places(self, latitude=None, longitude=None, radius_km=None, bbox=None,
+                      limit=None, cursor=None):
+        """
+        Retrieves one page of ``(place, distance_km)`` near a point or in a box, nearest first
+        """
+        if bbox is None and radius_km is None:
+            raise ValueError("Give lat, lon and radius_km, or bbox")
+        if radius_km is not None:
+            if latitude is None or longitude is None:
+                raise ValueError("radius_km needs lat and lon")
+            if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+                raise ValueError("lat must be between -90 and 90, lon between -180 and 180")
+            if radius_km <= 0:
+                raise ValueError("radius_km must be greater than 0")
+        return self.place_repo.search(latitude, longitude, radius_km, bbox, limit, cursor)
+
     def update_place(self, place_id, place_data):
         """
         Updates a place after validating related data
@@ -188,6 +228,8 @@ class HBnBFacade:
         # Create and save review
         review = Review(**review_data)
         self.review_repo.add(review)
+        place.reviews.append(review.id)
+        place.add_rating(review.rating)
         return review
 
     def get_review(self, review_id):
@@ -202,6 +244,12 @@ class HBnBFacade:
         """
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, limit=None, cursor=None):
+        """
+        Retrieves one page of reviews and the cursor of the next one
+        """
+        return self.review_repo.get_page(limit, cursor)
+
     def get_reviews_by_place(self, place_id):
         """
         Retrieves all reviews for a specific place
@@ -211,9 +259,7 @@ class HBnBFacade:
         if not place:
             return None
         
-        # Filter reviews by place_id
-        all_reviews = self.get_all_reviews()
-        return [review for review in all_reviews if review.place_id == place_id]
+        return [self.get_review(review_id) for review_id in place.reviews]
 
     def update_review(self, review_id, review_data):
         """
@@ -235,8 +281,15 @@ class HBnBFacade:
             if not place:
                 raise ValueError(f"Place with ID {review_data.get('place_id')} does not exist")
         
-        # Update review
+        # Update review, moving its rating between the place aggregates
+        old_place, old_rating = self.get_place(review.place_id), review.rating
         self.review_repo.update(review_id, review_data)
+        if old_place:
+            old_place.reviews.remove(review_id)
+            old_place.remove_rating(old_rating)
+        new_place = self.get_place(review.place_id)
+        new_place.reviews.append(review_id)
+        new_place.add_rating(review.rating)
         return self.get_review(review_id)
 
     def delete_review(self, review_id):
@@ -248,8 +301,27 @@ class HBnBFacade:
             return False
         
         self.review_repo.delete(review_id)
+        place = self.get_place(review.place_id)
+        if place:
+            place.reviews.remove(review_id)
+            place.remove_rating(review.rating)
         return True
 
+    def repair_place_ratings(self):
+        """
+        Recomputes every place's review list and rating aggregates from the reviews
+        """
+        places = self.get_all_places()
+        for place in places:
+            place.reviews = []
+            place.reset_ratings()
+        for review in self.get_all_reviews():
+            place = self.get_place(review.place_id)
+            if place:
+                place.reviews.append(review.id)
+                place.add_rating(review.rating)
+        return len(places)
+
     # Update the get_place_with_details method to include reviews
     def get_place_with_details(self, place_id):
         """Get a place with owner, amenities and reviews details"""
@@ -303,6 +375,9 @@ class HBnBFacade:
             'owner': owner_details,
             'amenities': amenity_details,
             'reviews': review_details,
+            'review_count': place.review_count,
+            'average_rating': place.average_rating,
+            'rating_histogram': place.rating_histogram,
             'created_at': place.created_at if isinstance(place.created_at, str) else place.created_at.isoformat() if isinstance(place.created_at, datetime) else str(place.created_at),
             'updated_at': place.updated_at if isinstance(place.updated_at, str) else place.updated_at.isoformat() if isinstance(place.updated_at, datetime) else str(place.updated_at)
         }
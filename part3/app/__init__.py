@@ -1,12 +1,20 @@
 from flask import Flask
 from flask_restx import Api
 from app.extensions import db, jwt, bcrypt  # ✅ Import propre
+from app.persistence.pool_metrics import init_pool_metrics
+from app.persistence.unit_of_work import init_unit_of_work
+from app.commands import init_commands
+from app.api.compression import init_compression
+from app.api.conditional import init_conditional_get
+from app.api.representations import init_representations
+from app.api.serializers import compile_models
 
 from .api.v1.users import api as users_ns
 from .api.v1.amenities import api as amenities_ns
 from .api.v1.places import api as places_ns
 from .api.v1.reviews import api as reviews_ns
 from .api.v1.auth import api as auth_ns
+from .api.v1.admin import api as admin_ns
 
 def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
@@ -16,6 +24,11 @@ def create_app(config_class="config.DevelopmentConfig"):
     db.init_app(app)
     jwt.init_app(app)
     bcrypt.init_app(app)  # ✅ Ajout de bcrypt
+    init_pool_metrics(app, db)
+    init_unit_of_work(app)
+    init_commands(app)
+    init_compression(app)
+    init_conditional_get(app)
 
     # Init API
     api = Api(
@@ -25,12 +38,15 @@ def create_app(config_class="config.DevelopmentConfig"):
         description='HBNB Application API',
         doc='/api/v1/'
     )
+    init_representations(app, api)
 
     # Register namespaces
-    api.add_namespace(users_ns)
-    api.add_namespace(amenities_ns)
-    api.add_namespace(places_ns)
-    api.add_namespace(reviews_ns)
-    api.add_namespace(auth_ns)
+    api.add_namespace(users_ns, path='/api/v1/users')
+    api.add_namespace(amenities_ns, path='/api/v1/amenities')
+    api.add_namespace(places_ns, path='/api/v1/places')
+    api.add_namespace(reviews_ns, path='/api/v1/reviews')
+    api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(admin_ns, path='/api/v1/admin')
+    compile_models(api)
 
     return app
@@ -0,0 +1,91 @@
+"""Batch writes: many creates, updates and deletes in one request.
+
+``POST /api/v1/<namespace>/batch`` takes ``{"create": [...], "update":
+[{"id": ..., ...}], "delete": [ids]}``, up to ``BATCH_MAX_SIZE`` items in
+all. Creates go through the facade's bulk ``create_*`` methods, which
+validate every row before inserting the valid ones in chunks. The whole
+batch is one transaction with a SAVEPOINT per item, so an item that
+fails is undone and reported without taking the others down. The
+response lists a status per item, in request order within each list.
+"""
+from flask import current_app
+from flask_restx import abort, fields
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import HTTPException
+from app.services import facade
+
+def batch_model(api, item_model):
+    """Swagger model of a batch request on ``item_model`` objects."""
+    return api.model(f'{item_model.name}Batch', {
+        'create': fields.List(fields.Nested(item_model), description='Objects to create'),
+        'update': fields.List(fields.Raw, description='Objects holding an id and the fields to change'),
+        'delete': fields.List(fields.String, description='Ids of the objects to delete')
+    })
+
+def run_batch(payload, create=None, update=None, delete=None, updatable=()):
+    """Apply a batch request with a namespace's handlers and return the response body.
+
+    ``create(rows)`` returns a ``{'created': [...], 'errors': [...]}``
+    result like the facade's bulk methods. ``update(obj_id, data)`` and
+    ``delete(obj_id)`` write one item, and refuse it with ``abort()``,
+    whose status and message become the item's. ``updatable`` lists the
+    fields an update may change.
+    """
+    if not isinstance(payload, dict):
+        abort(400, "A batch must be an object with create, update and/or delete lists")
+    items = {}
+    for op, handler in (('create', create), ('update', update), ('delete', delete)):
+        items[op] = payload.get(op) or []
+        if not isinstance(items[op], list):
+            abort(400, f"{op} must be a list")
+        if items[op] and handler is None:
+            abort(400, f"{op} is not supported in this batch")
+    if not all(isinstance(item, dict) for item in items['create'] + items['update']):
+        abort(400, "Items to create or update must be objects")
+    size = sum(len(op_items) for op_items in items.values())
+    max_size = current_app.config.get('BATCH_MAX_SIZE', 100)
+    if not size:
+        abort(400, "The batch is empty")
+    if size > max_size:
+        abort(413, f"A batch holds at most {max_size} items")
+
+    results = {'create': [], 'update': [], 'delete': []}
+    with facade.transaction():
+        if items['create']:
+            results['create'] = _created(items['create'], create(items['create']))
+        for index, item in enumerate(items['update']):
+            data = {key: value for key, value in item.items() if key != 'id'}
+            unknown = set(data) - set(updatable)
+            if unknown:
+                error = f"Cannot update {', '.join(sorted(unknown))}"
+                results['update'].append({'index': index, 'status': 400, 'error': error})
+            else:
+                obj_id = item.get('id')
+                results['update'].append(_apply(index, 200, obj_id, lambda: update(obj_id, data)))
+        for index, obj_id in enumerate(items['delete']):
+            results['delete'].append(_apply(index, 204, obj_id, lambda: delete(obj_id)))
+    return results
+
+def _created(rows, result):
+    """Per-row statuses from a bulk create result."""
+    errors = {error['index']: error['error'] for error in result['errors']}
+    created = iter(result['created'])
+    return [{'index': index, 'status': 400, 'error': errors[index]} if index in errors
+            else {'index': index, 'status': 201, 'id': next(created).id}
+            for index in range(len(rows))]
+
+def _apply(index, status, obj_id, write):
+    """Run one item's ``write`` in its own savepoint and return its status."""
+    if not isinstance(obj_id, str) or not obj_id:
+        return {'index': index, 'status': 400, 'error': "Each item needs an id"}
+    try:
+        with facade.transaction():
+            write()
+    except HTTPException as e:
+        message = (getattr(e, 'data', None) or {}).get('message', e.description)
+        return {'index': index, 'status': e.code, 'error': message}
+    except (ValueError, TypeError) as e:
+        return {'index': index, 'status': 400, 'error': str(e)}
+    except SQLAlchemyError as e:
+        return {'index': index, 'status': 409, 'error': str(getattr(e, 'orig', e))}
+    return {'index': index, 'status': status, 'id': obj_id}
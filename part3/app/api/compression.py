@@ -0,0 +1,131 @@
+"""Negotiated response compression (brotli, gzip, deflate).
+
+Bodies are compressed in the coding the client prefers among those it
+accepts, brotli only when the ``brotli`` package is installed. Buffered
+responses below ``COMPRESS_MIN_SIZE`` go out as they are; streamed
+responses are compressed chunk by chunk, flushed every
+``COMPRESS_STREAM_FLUSH_SIZE`` bytes so rows keep reaching the client as
+they are produced. Compressed buffered bodies are kept in an LRU cache
+keyed by a hash of the uncompressed body, so a hot page is compressed
+once rather than on every request.
+
+A compressed body gets its own strong ETag, the original one suffixed
+with the coding (``"abc-gzip"``); the suffix is stripped from
+``If-None-Match`` before the views see it, so revalidation works for
+every representation.
+"""
+import hashlib
+import re
+import zlib
+from flask import current_app, g, request
+from app.persistence.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # optional: brotli is offered only when installed
+    brotli = None
+
+COMPRESSIBLE = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+ETAG_CODING = re.compile(r'-(br|gzip|deflate)"')
+
+def _compressor(coding):
+    """Return a fresh ``(compress, flush, finish)`` triple for ``coding``."""
+    config = current_app.config
+    if coding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        return compressor.process, compressor.flush, compressor.finish
+    # wbits 31 writes a gzip container, 15 the zlib one HTTP calls deflate
+    compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31 if coding == 'gzip' else 15)
+    return (compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+            lambda: compressor.flush(zlib.Z_FINISH))
+
+def _compress(coding, body):
+    compress, _, finish = _compressor(coding)
+    return compress(body) + finish()
+
+def _stream(coding, chunks, flush_size):
+    """Compress an iterable of chunks, flushing every ``flush_size`` input bytes."""
+    compress, flush, finish = _compressor(coding)
+    pending = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            out = compress(chunk)
+            pending += len(chunk)
+            if pending >= flush_size:
+                out += flush()
+                pending = 0
+            if out:
+                yield out
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+def negotiate():
+    """Return the coding to answer this request with, or None."""
+    codings = ['br', 'gzip', 'deflate'] if brotli is not None else ['gzip', 'deflate']
+    return request.accept_encodings.best_match(codings)
+
+def init_compression(app):
+    """Compress API responses according to ``Accept-Encoding``.
+
+    Must be called before ``init_conditional_get``: Flask runs
+    ``after_request`` hooks in reverse order, and compression has to see
+    the final ETag and status.
+    """
+    app.extensions['compression_cache'] = LRUCache(app.config['COMPRESS_CACHE_SIZE'],
+                                                   app.config['COMPRESS_CACHE_TTL'])
+
+    @app.before_request
+    def _strip_etag_coding():
+        if_none_match = request.environ.get('HTTP_IF_NONE_MATCH', '')
+        match = ETAG_CODING.search(if_none_match)
+        if match:
+            g.etag_coding = match.group(1)
+            request.environ['HTTP_IF_NONE_MATCH'] = ETAG_CODING.sub('"', if_none_match)
+
+    @app.after_request
+    def _compress_response(response):
+        if not app.config['COMPRESS_ENABLED'] or not request.path.startswith('/api/'):
+            return response
+        if response.status_code == 304:
+            # Answer with the ETag of the representation being revalidated
+            coding = g.get('etag_coding')
+            if coding and response.headers.get('ETag'):
+                response.headers['ETag'] = response.headers['ETag'][:-1] + f'-{coding}"'
+            return response
+        if (request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 206)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or 'no-transform' in response.headers.get('Cache-Control', '')
+                or not (response.mimetype or '').startswith(COMPRESSIBLE)):
+            return response
+        response.vary.add('Accept-Encoding')
+        coding = negotiate()
+        if coding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _stream(coding, response.response, app.config['COMPRESS_STREAM_FLUSH_SIZE'])
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < app.config['COMPRESS_MIN_SIZE']:
+                return response
+            cache = app.extensions['compression_cache']
+            key = (hashlib.sha1(body).digest(), coding)
+            compressed = cache.get(key)
+            if compressed is None:
+                compressed = _compress(coding, body)
+                cache.set(key, compressed)
+            response.set_data(compressed)
+        response.headers['Content-Encoding'] = coding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{coding}', weak)
+        return response
+
+def compression_stats():
+    """Counters of the compressed-body cache, for the admin stats endpoint."""
+    return current_app.extensions['compression_cache'].stats()
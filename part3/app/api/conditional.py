@@ -0,0 +1,78 @@
+"""Conditional GET: ETag and Last-Modified validators, answered with 304s.
+
+Every successful GET under ``/api/`` gets a strong ETag hashed from its
+body, so an unchanged payload is never sent twice. Detail views add
+``Last-Modified`` from the ``updated_at`` of what they return
+(``last_modified``). List views use ``collection_validators``, which
+derive the ETag from the change counters of the tables they read and
+answer a matching revalidation before running the list query.
+"""
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import Response, request
+from flask_restx.utils import unpack
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+from app.services import facade
+
+def init_conditional_get(app):
+    """Add validators to API GET responses and turn matching requests into 304s."""
+    @app.after_request
+    def _conditional_get(response):
+        if (request.method not in ('GET', 'HEAD') or response.status_code != 200
+                or not request.path.startswith('/api/')):
+            return response
+        # Clients may keep a copy, but must revalidate it before each use
+        response.headers.setdefault('Cache-Control', 'no-cache')
+        # make_conditional() would buffer a generator to set Content-Length;
+        # streamed lists already answered any revalidation in collection_validators
+        if response.is_streamed:
+            return response
+        if 'ETag' not in response.headers:
+            response.add_etag()
+        return response.make_conditional(request)
+
+def last_modified(view):
+    """Send ``Last-Modified`` from the ``updated_at`` of the object a detail view returns.
+
+    Goes below ``marshal_with``, so it sees the object rather than its JSON.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        data, code, headers = unpack(view(*args, **kwargs))
+        updated_at = data.get('updated_at') if isinstance(data, dict) else getattr(data, 'updated_at', None)
+        if isinstance(updated_at, str):
+            updated_at = datetime.fromisoformat(updated_at)
+        if code == 200 and isinstance(updated_at, datetime):
+            headers = {**headers, 'Last-Modified': http_date(updated_at)}
+        return data, code, headers
+    return wrapper
+
+def collection_validators(*tables):
+    """Validate a list view against the change counters of ``tables``.
+
+    The ETag covers the counters and the query string, so revalidating a
+    list costs one lookup in ``table_versions`` and no serialization.
+    Goes above ``marshal_list_with`` and ``streamable``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version, modified = facade.get_collection_version(tables)
+            query = '&'.join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+            etag = hashlib.sha1(f"{request.path}?{query}|{version}".encode('utf-8')).hexdigest()
+            headers = {'ETag': quote_etag(etag)}
+            if modified is not None:
+                headers['Last-Modified'] = http_date(modified)
+            if not is_resource_modified(request.environ, etag=etag, last_modified=modified):
+                return Response(status=304, headers=headers)
+
+            response = view(*args, **kwargs)
+            if isinstance(response, Response):
+                if response.status_code == 200:
+                    response.headers.update(headers)
+                return response
+            data, code, view_headers = unpack(response)
+            return data, code, {**view_headers, **headers} if code == 200 else view_headers
+        return wrapper
+    return decorator
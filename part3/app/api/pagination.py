@@ -0,0 +1,57 @@
+"""Query-string handling shared by the paginated list endpoints."""
+from flask import current_app, request
+from flask_restx import abort
+
+PAGINATION_PARAMS = {
+    'limit': 'Maximum number of items to return (capped by the server)',
+    'cursor': 'Opaque cursor taken from the X-Next-Cursor header of the previous page'
+}
+
+def page_args():
+    """Read ``limit`` and ``cursor`` from the query string."""
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            abort(400, "Limit must be a positive integer")
+    return {'limit': limit, 'cursor': request.args.get('cursor')}
+
+IDS_PARAMS = {
+    'ids': 'Comma-separated ids to fetch instead of a page, returned in that order '
+           '(ids matching nothing are listed in the X-Missing-Ids header)'
+}
+
+def ids_arg():
+    """Read ``ids`` from the query string: a list of ids, or None without one.
+
+    At most ``PAGE_MAX_LIMIT`` ids, and only alongside ``fields``: paging,
+    filters and sorts don't apply to a fetch by ids.
+    """
+    value = request.args.get('ids')
+    if value is None:
+        return None
+    ids = [obj_id.strip() for obj_id in value.split(',') if obj_id.strip()]
+    max_ids = current_app.config.get('PAGE_MAX_LIMIT', 200)
+    if not ids:
+        abort(400, "ids must list at least one id")
+    if len(ids) > max_ids:
+        abort(400, f"ids must list at most {max_ids} ids")
+    if set(request.args) - {'ids', 'fields'}:
+        abort(400, "ids cannot be combined with paging, filters or a sort")
+    return ids
+
+def missing_headers(missing):
+    """Response headers listing the requested ids that matched nothing."""
+    return {'X-Missing-Ids': ','.join(missing)} if missing else {}
+
+def page_headers(next_cursor):
+    """Response headers advertising the next page, if there is one."""
+    return {'X-Next-Cursor': next_cursor} if next_cursor else {}
+
+def get_page(fetch, **kwargs):
+    """Call a facade ``*_page`` method with the request's paging arguments."""
+    try:
+        return fetch(**page_args(), **kwargs)
+    except ValueError as e:
+        abort(400, str(e))
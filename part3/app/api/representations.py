@@ -0,0 +1,65 @@
+"""JSON representation of API responses, with a pluggable encoder.
+
+``JSON_ENCODER`` picks the encoder: ``orjson`` (a C encoder several times
+faster than the stdlib on large lists), ``json`` (the stdlib), or ``auto``
+for orjson when it is installed and the stdlib otherwise. Both write
+``datetime``, ``date`` and ``UUID`` values natively, so response models
+use ``DateTime`` below and hand datetimes straight to the encoder instead
+of formatting each one in Python first. Both write compact UTF-8 JSON
+and format datetimes the same way (``isoformat()``).
+"""
+import json
+from datetime import date, datetime, time
+from uuid import UUID
+from flask import current_app, make_response
+from flask_restx import fields
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used instead
+    orjson = None
+
+ENCODERS = ('auto', 'orjson', 'json')
+
+class DateTime(fields.DateTime):
+    """ISO 8601 ``fields.DateTime`` that leaves datetimes for the encoder to write."""
+    def format(self, value):
+        if isinstance(value, datetime) and self.dt_format == 'iso8601':
+            return value
+        return super().format(value)
+
+def _default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def make_dumps(name='auto', indent=False):
+    """Return a function encoding a value to JSON bytes with encoder ``name``."""
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON encoder {name!r}; expected one of {', '.join(ENCODERS)}")
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_ENCODER is 'orjson' but the orjson package is not installed")
+
+    if name != 'json' and orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return lambda value: orjson.dumps(value, default=_default, option=option)
+    separators = (',', ': ') if indent else (',', ':')
+    return lambda value: json.dumps(value, default=_default, ensure_ascii=False, separators=separators,
+                                    indent=2 if indent else None).encode('utf-8')
+
+def dumps(value):
+    """Encode ``value`` with the current app's JSON encoder."""
+    return current_app.extensions['json_dumps'](value)
+
+def output_json(data, code, headers=None):
+    """flask-restx representation for application/json using ``dumps``."""
+    response = make_response(dumps(data) + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
+
+def init_representations(app, api):
+    """Serve ``api``'s JSON responses with the encoder chosen by ``JSON_ENCODER``."""
+    app.extensions['json_dumps'] = make_dumps(app.config['JSON_ENCODER'], indent=app.debug)
+    api.representation('application/json')(output_json)
@@ -0,0 +1,29 @@
+"""``?fields=`` sparse fieldsets, shared by the read endpoints.
+
+``fields=id,title,price`` trims a response to those keys. The views also
+hand the names down to the repositories, which then load only the
+columns behind them, so a list of titles never reads a description.
+"""
+from flask import request
+from flask_restx import abort
+
+FIELDS_PARAMS = {
+    'fields': 'Comma-separated fields to return (default all of them)'
+}
+
+def requested_fields(allowed):
+    """Return the ``fields`` asked for, in ``allowed`` order, or None for all.
+
+    ``allowed`` is a response model or a sequence of field names; an
+    unknown or empty list of names is a 400.
+    """
+    value = request.args.get('fields')
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    if not names:
+        abort(400, "fields must name at least one field")
+    unknown = names.difference(allowed)
+    if unknown:
+        abort(400, f"Unknown fields: {', '.join(sorted(unknown))}; expected some of: {', '.join(allowed)}")
+    return tuple(name for name in allowed if name in names)
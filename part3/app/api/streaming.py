@@ -0,0 +1,64 @@
+"""Streamed list responses, serialized row by row."""
+from functools import wraps
+from flask import Response, request, stream_with_context
+from flask_restx import abort
+from app.api.representations import dumps
+from app.api.serializers import compile_model
+from app.api.sparse import requested_fields
+
+NDJSON = 'application/x-ndjson'
+
+STREAM_PARAMS = {
+    'stream': 'Set to true to receive the full list as a chunked JSON array '
+              '(send "Accept: application/x-ndjson" for one object per line)'
+}
+
+def stream_mode():
+    """Return 'ndjson', 'json' or None depending on what the client asked for."""
+    if 'ids' in request.args:
+        # A fetch by ids is one bounded list, served by the view itself
+        return None
+    if request.accept_mimetypes.best == NDJSON:
+        return 'ndjson'
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return 'json'
+    return None
+
+def stream_response(items, model, mode):
+    """Build a chunked response that serializes ``items`` one at a time."""
+    serialize = compile_model(model, requested_fields(model))
+
+    def generate_ndjson():
+        for item in items:
+            yield dumps(serialize(item)) + b'\n'
+
+    def generate_array():
+        yield b'['
+        for index, item in enumerate(items):
+            yield (b',' if index else b'') + dumps(serialize(item))
+        yield b']'
+
+    if mode == 'ndjson':
+        return Response(stream_with_context(generate_ndjson()), mimetype=NDJSON)
+    return Response(stream_with_context(generate_array()), mimetype='application/json')
+
+def streamable(model, iter_items):
+    """Serve a list endpoint as a stream when the client asks for one.
+
+    ``iter_items`` is called lazily and must return an iterable (ideally a
+    server-side cursor); otherwise the decorated view runs unchanged. A
+    ValueError from ``iter_items`` (bad query arguments) is a 400.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            mode = stream_mode()
+            if mode is None:
+                return view(*args, **kwargs)
+            try:
+                items = iter_items()
+            except ValueError as e:
+                abort(400, str(e))
+            return stream_response(items, model, mode)
+        return wrapper
+    return decorator
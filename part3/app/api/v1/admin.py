@@ -0,0 +1,24 @@
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.compression import compression_stats
+from app.services import facade
+from app.persistence.pool_metrics import pool_stats
+
+api = Namespace('admin', description='Administration and monitoring')
+
+@api.route('/stats')
+class Stats(Resource):
+    @api.response(200, 'Runtime statistics retrieved successfully')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Get cache and connection pool statistics (Admin only)"""
+        current_user = get_jwt_identity()
+        if not current_user.get("is_admin"):
+            return {'message': "Admin privileges required"}, 403
+
+        return {
+            'entity_cache': facade.get_cache_stats(),
+            'compression_cache': compression_stats(),
+            'pools': pool_stats()
+        }, 200
@@ -1,6 +1,13 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.api.batch import batch_model, run_batch
+from app.api.conditional import collection_validators, last_modified
+from app.api.representations import DateTime
+from app.api.pagination import (IDS_PARAMS, PAGINATION_PARAMS, get_page, ids_arg, missing_headers,
+                                page_headers)
+from app.api.serializers import serialize_list_with, serialize_with
+from app.api.sparse import FIELDS_PARAMS, requested_fields
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -13,50 +20,64 @@ amenity_model = api.model('Amenity', {
 amenity_response_model = api.model('AmenityResponse', {
     'id': fields.String(description='Unique identifier for the amenity'),
     'name': fields.String(description='Name of the amenity'),
-    'created_at': fields.DateTime(description='Timestamp when the amenity was created'),
-    'updated_at': fields.DateTime(description='Timestamp when the amenity was last updated'),
-    'places': fields.List(fields.String(description='Place IDs with this amenity'))
+    'created_at': DateTime(description='Timestamp when the amenity was created'),
+    'updated_at': DateTime(description='Timestamp when the amenity was last updated')
 })
 
+amenity_batch_model = batch_model(api, amenity_model)
+
 @api.route('/')
 class AmenityList(Resource):
     @api.expect(amenity_model)
     @api.response(201, 'Amenity successfully created')
     @api.response(400, 'Invalid input data')
+    @serialize_with(amenity_response_model, code=201)
     @jwt_required()  # ✅ Seuls les admins peuvent ajouter une commodité
     def post(self):
         """Register a new amenity (Admin only)"""
         current_user = get_jwt_identity()
         if not current_user.get("is_admin"):
-            return {'message': "Admin privileges required"}, 403
+            api.abort(403, "Admin privileges required")
 
         data = api.payload
         try:
-            amenity = facade.create_amenity(data)
-            return amenity, 201
+            return facade.create_amenity(data), 201
         except ValueError as e:
-            return {'message': str(e)}, 400
+            api.abort(400, str(e))
 
-    @api.response(200, 'List of amenities retrieved successfully')
+    @collection_validators('amenities')
+    @api.doc(params={**PAGINATION_PARAMS, **FIELDS_PARAMS, **IDS_PARAMS})
+    @serialize_list_with(amenity_response_model)
     def get(self):
-        """Retrieve a list of all amenities (Public access)"""
-        amenities = facade.get_all_amenities()
-        return amenities, 200
+        """Retrieve a page of amenities, or amenities by ids (Public access)"""
+        fields = requested_fields(amenity_response_model)
+        ids = ids_arg()
+        if ids is not None:
+            amenities, missing = facade.get_amenities_by_ids(ids, fields=fields)
+            headers = missing_headers(missing)
+        else:
+            amenities, next_cursor = get_page(facade.get_amenities_page, fields=fields)
+            headers = page_headers(next_cursor)
+        return amenities, 200, headers
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
-    @api.response(200, 'Amenity details retrieved successfully')
+    @api.doc(params=FIELDS_PARAMS)
+    @serialize_with(amenity_response_model, description='Amenity details retrieved successfully')
     @api.response(404, 'Amenity not found')
+    @last_modified
     def get(self, amenity_id):
         """Get amenity details by ID (Public access)"""
         try:
-            amenity = facade.get_amenity(amenity_id)
-            return amenity, 200
+            amenity = facade.get_amenity(amenity_id, fields=requested_fields(amenity_response_model))
         except ValueError:
-            return {'message': 'Amenity not found'}, 404
+            amenity = None
+        if amenity is None:
+            api.abort(404, 'Amenity not found')
+        return amenity, 200
 
     @api.expect(amenity_model)
-    @api.response(200, 'Amenity updated successfully')
+    @serialize_with(amenity_response_model, description='Amenity updated successfully')
     @api.response(404, 'Amenity not found')
     @api.response(400, 'Invalid input data')
     @jwt_required()  # ✅ Seuls les admins peuvent modifier une commodité
@@ -64,13 +85,35 @@ class AmenityResource(Resource):
         """Update an amenity (Admin only)"""
         current_user = get_jwt_identity()
         if not current_user.get("is_admin"):
-            return {'message': "Admin privileges required"}, 403
+            api.abort(403, "Admin privileges required")
 
         data = api.payload
         try:
             amenity = facade.update_amenity(amenity_id, data)
-            return amenity, 200
         except ValueError as e:
-            if str(e) == "Amenity not found":
-                return {'message': str(e)}, 404
-            return {'message': str(e)}, 400
+            api.abort(404 if str(e) == "Amenity not found" else 400, str(e))
+        if amenity is None:
+            api.abort(404, 'Amenity not found')
+        return amenity, 200
+
+@api.route('/batch')
+class AmenityBatch(Resource):
+    @api.expect(amenity_batch_model)
+    @api.response(200, 'Status of each item')
+    @api.response(413, 'Too many items')
+    @jwt_required()
+    def post(self):
+        """Create, update and delete many amenities in one transaction (Admin only)"""
+        if not get_jwt_identity().get("is_admin"):
+            return {'message': "Admin privileges required"}, 403
+
+        def update(amenity_id, data):
+            if facade.update_amenity(amenity_id, data) is None:
+                api.abort(404, f"Amenity {amenity_id} not found")
+
+        def delete(amenity_id):
+            if facade.get_amenity(amenity_id) is None:
+                api.abort(404, f"Amenity {amenity_id} not found")
+            facade.delete_amenity(amenity_id)
+
+        return run_batch(api.payload, facade.create_amenities, update, delete, ('name',)), 200
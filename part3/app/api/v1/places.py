@@ -1,6 +1,16 @@
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.api.batch import batch_model, run_batch
+from app.api.conditional import collection_validators, last_modified
+from app.api.representations import DateTime
+from app.api.serializers import serialize_list_with, serialize_with
+from app.api.pagination import (IDS_PARAMS, PAGINATION_PARAMS, get_page, ids_arg, missing_headers,
+                                page_headers)
+from app.api.sparse import FIELDS_PARAMS, requested_fields
+from app.persistence.geo import parse_bbox
+from app.api.streaming import STREAM_PARAMS, streamable
 
 api = Namespace('places', description='Places management')
 
@@ -44,21 +54,102 @@ place_response_model = api.model('PlaceResponse', {
     'longitude': fields.Float(description='Place longitude'),
     'owner': fields.Nested(user_model, description='Place owner'),
     'amenities': fields.List(fields.Nested(amenity_model), description='Available amenities'),
-    'created_at': fields.DateTime(description='Creation date'),
-    'updated_at': fields.DateTime(description='Last update date')
+    'review_count': fields.Integer(description='Number of reviews'),
+    'average_rating': fields.Float(description='Mean rating, null without reviews'),
+    'rating_histogram': fields.Raw(description='Number of reviews per rating, 1 to 5'),
+    'created_at': DateTime(description='Creation date'),
+    'updated_at': DateTime(description='Last update date')
 })
 
+place_search_model = api.clone('PlaceSearchResult', place_response_model, {
+    'distance_km': fields.Float(description='Distance from lat/lon, or from the bbox centre (geo searches only)')
+})
+
+place_batch_model = batch_model(api, place_model)
+
+# Fields a batch update may change
+GEO_PARAMS = ('lat', 'lon', 'radius_km', 'bbox')
+
+SEARCH_PARAMS = {
+    'q': 'Words to find in titles and descriptions (prefixes match), most relevant first',
+    'lat': 'Latitude of the search centre',
+    'lon': 'Longitude of the search centre',
+    'radius_km': 'Search radius in kilometres (needs lat and lon)',
+    'bbox': 'Bounding box min_lon,min_lat,max_lon,max_lat',
+    **PAGINATION_PARAMS,
+    **FIELDS_PARAMS
+}
+
+def search_args():
+    """Read the geo search arguments from the query string."""
+    args = {}
+    for name, key in (('lat', 'latitude'), ('lon', 'longitude'), ('radius_km', 'radius_km')):
+        value = request.args.get(name)
+        if value is not None:
+            try:
+                args[key] = float(value)
+            except ValueError:
+                api.abort(400, f"{name} must be a number")
+    max_radius = current_app.config.get('GEO_MAX_RADIUS_KM', 500)
+    if args.get('radius_km', 0) > max_radius:
+        api.abort(400, f"radius_km must be at most {max_radius}")
+    if request.args.get('bbox') is not None:
+        try:
+            args['bbox'] = parse_bbox(request.args['bbox'])
+        except ValueError as e:
+            api.abort(400, str(e))
+    return args
+
+LIST_PARAMS = {
+    'price_min': 'Lowest price per night',
+    'price_max': 'Highest price per night',
+    'owner_id': 'Only the places of this owner',
+    'amenities': 'Comma-separated amenity ids; only places offering all of them',
+    'sort': 'Comma-separated sort fields among price, created_at and updated_at, '
+            'prefixed with - for descending (default created_at)'
+}
+
+def list_args():
+    """Read the list filters and sort into ``find()`` arguments."""
+    where = {}
+    for name, key in (('price_min', 'price__gte'), ('price_max', 'price__lte')):
+        value = request.args.get(name)
+        if value is not None:
+            try:
+                where[key] = float(value)
+            except ValueError:
+                api.abort(400, f"{name} must be a number")
+    if request.args.get('owner_id'):
+        where['owner_id'] = request.args['owner_id']
+    sort = request.args.get('sort')
+    amenities = [amenity_id.strip() for amenity_id in request.args.get('amenities', '').split(',')
+                 if amenity_id.strip()]
+    return {'where': where, 'order_by': [field.strip() for field in sort.split(',')] if sort else None,
+            'amenities': amenities}
+
+# Reads are served from the place_summaries read model, which already holds
+# the owner, amenity names and rating stats: one range read per page.
 @api.route('/')
 class PlaceList(Resource):
-    @api.doc('list_places')
-    @api.marshal_list_with(place_response_model, mask=False)
+    @collection_validators('place_summaries')
+    @streamable(place_response_model, lambda: facade.iter_place_summaries(
+        **list_args(), fields=requested_fields(place_response_model)))
+    @api.doc('list_places', params={**LIST_PARAMS, **PAGINATION_PARAMS, **STREAM_PARAMS, **FIELDS_PARAMS,
+                                    **IDS_PARAMS})
+    @serialize_list_with(place_response_model)
     def get(self):
-        """Get list of all places"""
-        return facade.get_places()
+        """Get a page of places, optionally filtered by price, owner and amenities and sorted, or places by ids"""
+        fields = requested_fields(place_response_model)
+        ids = ids_arg()
+        if ids is not None:
+            places, missing = facade.get_place_summaries_by_ids(ids, fields=fields)
+            return places, 200, missing_headers(missing)
+        places, next_cursor = get_page(facade.find_place_summaries, **list_args(), fields=fields)
+        return places, 200, page_headers(next_cursor)
 
     @api.doc('create_place')
     @api.expect(place_model)
-    @api.marshal_with(place_response_model, code=201, mask=False)
+    @serialize_with(place_response_model, code=201)
     @jwt_required()
     def post(self):
         """Create a new place"""
@@ -70,22 +161,40 @@ class PlaceList(Resource):
         except ValueError as e:
             api.abort(400, str(e))
 
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc('search_places', params=SEARCH_PARAMS)
+    @serialize_list_with(place_search_model)
+    @api.response(400, 'Invalid search arguments')
+    def get(self):
+        """Get a page of places matching q, or within radius_km of lat/lon or inside bbox"""
+        query = request.args.get('q')
+        fields = requested_fields(place_search_model)
+        if query is None:
+            places, next_cursor = get_page(facade.search_places, **search_args(), fields=fields)
+        elif any(name in request.args for name in GEO_PARAMS):
+            api.abort(400, "q cannot be combined with lat, lon, radius_km or bbox")
+        else:
+            places, next_cursor = get_page(facade.search_places_text, query=query, fields=fields)
+        return places, 200, page_headers(next_cursor)
+
 @api.route('/<string:place_id>')
 @api.param('place_id', 'Unique identifier for the place')
 class PlaceResource(Resource):
-    @api.doc('get_place')
-    @api.marshal_with(place_response_model, mask=False)
+    @api.doc('get_place', params=FIELDS_PARAMS)
+    @serialize_with(place_response_model)
     @api.response(404, 'Place not found')
+    @last_modified
     def get(self, place_id):
         """Get place details by ID"""
-        place = facade.get_place(place_id)
+        place = facade.get_place_summary(place_id, fields=requested_fields(place_response_model))
         if place is None:
             api.abort(404, f"Place {place_id} not found")
         return place
 
     @api.doc('update_place')
     @api.expect(place_model)
-    @api.marshal_with(place_response_model, mask=False)
+    @serialize_with(place_response_model)
     @jwt_required()
     def put(self, place_id):
         """Update a place (Admins can modify any place)"""
@@ -98,7 +207,7 @@ class PlaceResource(Resource):
             api.abort(404, f"Place {place_id} not found")
 
         # Admins can modify any place, users only their own
-        if not is_admin and place["owner"]["id"] != user_id:
+        if not is_admin and place.user_id != user_id:
             api.abort(403, "Unauthorized action")
 
         try:
@@ -119,8 +228,39 @@ class PlaceResource(Resource):
             api.abort(404, f"Place {place_id} not found")
 
         # Admins can delete any place, users only their own
-        if not is_admin and place["owner"]["id"] != user_id:
+        if not is_admin and place.user_id != user_id:
             api.abort(403, "Unauthorized action")
 
         facade.delete_place(place_id)
         return {"message": "Place deleted successfully"}, 200
+
+@api.route('/batch')
+class PlaceBatch(Resource):
+    @api.doc('batch_places')
+    @api.expect(place_batch_model)
+    @api.response(200, 'Status of each item')
+    @api.response(413, 'Too many items')
+    @jwt_required()
+    def post(self):
+        """Create, update and delete many places in one transaction (Admins can modify any place)"""
+        current_user = get_jwt_identity()
+
+        def create(rows):
+            return facade.create_places([dict(row, owner_id=current_user["id"]) for row in rows])
+
+        def check_owner(place_id):
+            place = facade.get_place(place_id)
+            if place is None:
+                api.abort(404, f"Place {place_id} not found")
+            if not current_user.get("is_admin", False) and place.user_id != current_user["id"]:
+                api.abort(403, "Unauthorized action")
+
+        def update(place_id, data):
+            check_owner(place_id)
+            facade.update_place(place_id, data)
+
+        def delete(place_id):
+            check_owner(place_id)
+            facade.delete_place(place_id)
+
+        return run_batch(api.payload, create, update, delete, facade.PLACE_UPDATABLE), 200
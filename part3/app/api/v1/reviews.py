@@ -1,6 +1,12 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.api.batch import batch_model, run_batch
+from app.api.conditional import collection_validators, last_modified
+from app.api.pagination import PAGINATION_PARAMS, get_page, page_headers
+from app.api.representations import DateTime
+from app.api.serializers import serialize_list_with, serialize_with
+from app.api.sparse import FIELDS_PARAMS, requested_fields
 
 api = Namespace('reviews', description='Review operations')
 
@@ -17,14 +23,19 @@ review_output_model = api.model('ReviewOutput', {
     'text': fields.String(description='Text of the review'),
     'rating': fields.Integer(description='Rating of the place (1-5)'),
     'user_id': fields.String(description='ID of the user'),
-    'place_id': fields.String(description='ID of the place')
+    'place_id': fields.String(description='ID of the place'),
+    'created_at': DateTime(description='Timestamp when the review was created'),
+    'updated_at': DateTime(description='Timestamp when the review was last updated')
 })
 
+review_batch_model = batch_model(api, review_model)
+
 @api.route('/')
 class ReviewList(Resource):
     @api.expect(review_model)
     @api.response(201, 'Review successfully created')
     @api.response(400, 'Invalid input data')
+    @serialize_with(review_output_model, code=201)
     @jwt_required()
     def post(self):
         """Register a new review"""
@@ -34,40 +45,41 @@ class ReviewList(Resource):
 
             # Prevent owners from reviewing their own places
             place = facade.get_place(review_data["place_id"])
-            if place["owner"]["id"] == current_user["id"]:
-                return {'message': "You cannot review your own place."}, 400
-
-            # Prevent duplicate reviews from the same user
-            existing_review = facade.get_review_by_user_and_place(current_user["id"], review_data["place_id"])
-            if existing_review:
-                return {'message': "You have already reviewed this place."}, 400
+            if place is None:
+                api.abort(400, "Place not found.")
+            if place.user_id == current_user["id"]:
+                api.abort(400, "You cannot review your own place.")
 
+            # Duplicate reviews are rejected by the insert itself (unique_review)
             review_data["user_id"] = current_user["id"]
-            review = facade.create_review(review_data)
-            return review, 201
+            return facade.create_review(review_data), 201
         except ValueError as e:
-            return {'message': str(e)}, 400
+            api.abort(400, str(e))
 
-    @api.response(200, 'List of reviews retrieved successfully')
+    @collection_validators('reviews')
+    @api.doc(params={**PAGINATION_PARAMS, **FIELDS_PARAMS})
+    @serialize_list_with(review_output_model, description='List of reviews retrieved successfully')
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return reviews, 200
+        """Retrieve a page of reviews"""
+        reviews, next_cursor = get_page(facade.get_reviews_page, fields=requested_fields(review_output_model))
+        return reviews, 200, page_headers(next_cursor)
 
 @api.route('/<string:review_id>')
 @api.param('review_id', 'The review identifier')
 class ReviewResource(Resource):
-    @api.response(200, 'Review details retrieved successfully')
+    @api.doc(params=FIELDS_PARAMS)
+    @serialize_with(review_output_model, description='Review details retrieved successfully')
     @api.response(404, 'Review not found')
+    @last_modified
     def get(self, review_id):
         """Get review details by ID"""
-        review = facade.get_review(review_id)
+        review = facade.get_review(review_id, fields=requested_fields(review_output_model))
         if review is None:
             api.abort(404, f"Review with ID {review_id} not found")
         return review, 200
 
     @api.expect(review_model)
-    @api.response(200, 'Review updated successfully')
+    @serialize_with(review_output_model, description='Review updated successfully')
     @api.response(404, 'Review not found')
     @api.response(400, 'Invalid input data')
     @jwt_required()
@@ -82,12 +94,14 @@ class ReviewResource(Resource):
             api.abort(404, f"Review with ID {review_id} not found")
 
         # Admins can modify any review, users only their own
-        if not is_admin and review["user_id"] != user_id:
-            return {'message': "Unauthorized action"}, 403
+        if not is_admin and review.user_id != user_id:
+            api.abort(403, "Unauthorized action")
 
         review_data = api.payload
-        result = facade.update_review(review_id, review_data)
-        return result, 200
+        try:
+            return facade.update_review(review_id, review_data), 200
+        except ValueError as e:
+            api.abort(400, str(e))
 
     @api.response(200, 'Review deleted successfully')
     @api.response(404, 'Review not found')
@@ -103,8 +117,39 @@ class ReviewResource(Resource):
             api.abort(404, f"Review with ID {review_id} not found")
 
         # Admins can delete any review, users only their own
-        if not is_admin and review["user_id"] != user_id:
+        if not is_admin and review.user_id != user_id:
             return {'message': "Unauthorized action"}, 403
 
         facade.delete_review(review_id)
         return {'message': 'Review deleted successfully'}, 200
+
+@api.route('/batch')
+class ReviewBatch(Resource):
+    @api.expect(review_batch_model)
+    @api.response(200, 'Status of each item')
+    @api.response(413, 'Too many items')
+    @jwt_required()
+    def post(self):
+        """Create, update and delete many reviews in one transaction (Admins can modify any review)"""
+        current_user = get_jwt_identity()
+
+        def create(rows):
+            return facade.create_reviews([dict(row, user_id=current_user["id"]) for row in rows],
+                                         allow_own_places=False)
+
+        def check_author(review_id):
+            review = facade.get_review(review_id)
+            if review is None:
+                api.abort(404, f"Review with ID {review_id} not found")
+            if not current_user.get("is_admin", False) and review.user_id != current_user["id"]:
+                api.abort(403, "Unauthorized action")
+
+        def update(review_id, data):
+            check_author(review_id)
+            facade.update_review(review_id, data)
+
+        def delete(review_id):
+            check_author(review_id)
+            facade.delete_review(review_id)
+
+        return run_batch(api.payload, create, update, delete, ('text', 'rating')), 200
@@ -1,6 +1,13 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.api.batch import batch_model, run_batch
+from app.api.conditional import collection_validators, last_modified
+from app.api.representations import DateTime
+from app.api.serializers import serialize_list_with, serialize_with
+from app.api.pagination import (IDS_PARAMS, PAGINATION_PARAMS, get_page, ids_arg, missing_headers,
+                                page_headers)
+from app.api.sparse import FIELDS_PARAMS, requested_fields
 from werkzeug.exceptions import BadRequest
 
 api = Namespace('users', description='User operations')
@@ -20,21 +27,33 @@ user_response_model = api.model('UserResponse', {
     'last_name': fields.String(description='Last name of the user'),
     'email': fields.String(description='Email of the user'),
     'is_admin': fields.Boolean(description='Admin status'),
-    'created_at': fields.DateTime(description='Timestamp of user creation'),
-    'updated_at': fields.DateTime(description='Timestamp of last update')
+    'created_at': DateTime(description='Timestamp of user creation'),
+    'updated_at': DateTime(description='Timestamp of last update')
 })
 
+user_batch_model = batch_model(api, user_model)
+
+# Fields a batch update may change; passwords only change through PUT
+USER_UPDATABLE = ('first_name', 'last_name', 'email', 'is_admin')
+
 @api.route('/')
 class UserList(Resource):
-    @api.doc('list_users')
-    @api.marshal_list_with(user_response_model, mask=False)
+    @collection_validators('users')
+    @api.doc('list_users', params={**PAGINATION_PARAMS, **FIELDS_PARAMS, **IDS_PARAMS})
+    @serialize_list_with(user_response_model)
     def get(self):
-        """List all users"""
-        return facade.get_users()
+        """List a page of users, or users by ids"""
+        fields = requested_fields(user_response_model)
+        ids = ids_arg()
+        if ids is not None:
+            users, missing = facade.get_users_by_ids(ids, fields=fields)
+            return users, 200, missing_headers(missing)
+        users, next_cursor = get_page(facade.get_users_page, fields=fields)
+        return users, 200, page_headers(next_cursor)
 
     @api.doc('create_user')
     @api.expect(user_model)
-    @api.marshal_with(user_response_model, code=201, mask=False)
+    @serialize_with(user_response_model, code=201)
     @api.response(400, 'Validation Error')
     @jwt_required()  # ✅ Uniquement les admins peuvent créer un utilisateur
     def post(self):
@@ -43,13 +62,8 @@ class UserList(Resource):
         if not current_user.get("is_admin"):
             return {'message': "Admin privileges required"}, 403
 
-        data = api.payload
-
-        if 'password' not in data or not data['password'].strip():
-            api.abort(400, "Password is required.")
-
         try:
-            user = facade.create_user(data)
+            user = facade.create_user(api.payload)
             return user, 201
         except ValueError as e:
             api.abort(400, str(e))
@@ -58,18 +72,19 @@ class UserList(Resource):
 @api.param('user_id', 'The user identifier')
 @api.response(404, 'User not found')
 class User(Resource):
-    @api.doc('get_user')
-    @api.marshal_with(user_response_model, mask=False)
+    @api.doc('get_user', params=FIELDS_PARAMS)
+    @serialize_with(user_response_model)
+    @last_modified
     def get(self, user_id):
         """Get a user by ID."""
-        user = facade.get_user(user_id)
+        user = facade.get_user(user_id, fields=requested_fields(user_response_model))
         if not user:
             api.abort(404, f"User {user_id} not found")
         return user
 
     @api.doc('update_user')
     @api.expect(user_model)
-    @api.marshal_with(user_response_model, mask=False)
+    @serialize_with(user_response_model)
     @api.response(400, 'Validation Error')
     @jwt_required()
     def put(self, user_id):
@@ -94,3 +109,26 @@ class User(Resource):
             return user
         except ValueError as e:
             api.abort(400, str(e))
+
+@api.route('/batch')
+class UserBatch(Resource):
+    @api.doc('batch_users')
+    @api.expect(user_batch_model)
+    @api.response(200, 'Status of each item')
+    @api.response(413, 'Too many items')
+    @jwt_required()
+    def post(self):
+        """Create, update and delete many users in one transaction (Admin only)"""
+        if not get_jwt_identity().get("is_admin"):
+            return {'message': "Admin privileges required"}, 403
+
+        def update(user_id, data):
+            if facade.update_user(user_id, data) is None:
+                api.abort(404, f"User {user_id} not found")
+
+        def delete(user_id):
+            if facade.get_user(user_id) is None:
+                api.abort(404, f"User {user_id} not found")
+            facade.delete_user(user_id)
+
+        return run_batch(api.payload, facade.create_users, update, delete, USER_UPDATABLE), 200
@@ -0,0 +1,124 @@
+"""ASGI serving mode: public v1 reads on the event loop, Flask for the rest.
+
+GET requests on the list and detail routes of the users, places,
+amenities and reviews namespaces are answered by ``AsyncFacade`` without
+holding a thread, so one process can keep hundreds of them in flight.
+Everything else (writes, auth, filtered or streamed lists, Swagger) is
+handed to the regular Flask app through asgiref's WSGI adapter, so
+behaviour is the same as under a WSGI server. Responses served here carry
+an ETag hashed from their body and answer a matching ``If-None-Match``
+with a 304.
+"""
+import hashlib
+import re
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.http import parse_etags, quote_etag
+from app import create_app
+from app.extensions import db
+from app.api.streaming import NDJSON
+from app.api.v1.places import place_response_model
+from app.api.v1.users import user_response_model
+from app.api.serializers import compile_model
+from app.persistence.async_repository import create_async_session_factory
+from app.services.async_facade import AsyncFacade
+
+# /places/search is a distinct Flask route, not a place id
+ROUTE = re.compile(r'^/api/v1/(users|places|amenities|reviews)/(?!search$)([^/]*)$')
+
+class AsyncReadApp:
+    """ASGI application serving v1 reads with ``facade`` and delegating the rest."""
+    def __init__(self, flask_app, facade):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.facade = facade
+        self.dumps = flask_app.extensions['json_dumps']
+        # namespace: (fetch a page, fetch one, serialize, not-found message)
+        self.routes = {
+            'users': (facade.get_users_page, facade.get_user,
+                      compile_model(user_response_model), "User {} not found"),
+            'places': (facade.get_place_summaries_page, facade.get_place_summary,
+                       compile_model(place_response_model), "Place {} not found"),
+            'amenities': (facade.get_amenities_page, facade.get_amenity,
+                          lambda amenity: amenity.to_dict(), "Amenity {} not found"),
+            'reviews': (facade.get_reviews_page, facade.get_review,
+                        lambda review: review.to_dict(), "Review with ID {} not found")
+        }
+
+    async def __call__(self, scope, receive, send):
+        match = ROUTE.match(scope.get('path', '')) if scope['type'] == 'http' else None
+        if (match is None or scope['method'] != 'GET' or _wants_stream(scope)
+                or not _plain_page(scope)):
+            return await self.wsgi(scope, receive, send)
+
+        fetch_page, fetch_one, serialize, not_found = self.routes[match.group(1)]
+        obj_id = match.group(2)
+        if obj_id:
+            obj = await fetch_one(obj_id)
+            if obj is None:
+                return await _send_json(send, 404, self.dumps({'message': not_found.format(obj_id)}))
+            return await _send_json(send, 200, self.dumps(serialize(obj)), scope=scope)
+
+        try:
+            items, next_cursor = await fetch_page(**_page_args(scope))
+        except ValueError as e:
+            return await _send_json(send, 400, self.dumps({'message': str(e)}))
+        headers = [(b'x-next-cursor', next_cursor.encode('ascii'))] if next_cursor else []
+        return await _send_json(send, 200, self.dumps([serialize(item) for item in items]), headers, scope=scope)
+
+def _page_args(scope):
+    """Read ``limit`` and ``cursor`` from the query string, like ``page_args()``."""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    limit = query.get('limit', [None])[0]
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("Limit must be a positive integer")
+    return {'limit': limit, 'cursor': query.get('cursor', [None])[0]}
+
+def _plain_page(scope):
+    """Filters, a sort or ``?fields=`` (lists and details) are served by the Flask views."""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    return set(query) <= {'limit', 'cursor'}
+
+def _wants_stream(scope):
+    """Streamed lists stay on the Flask side, which owns ``streamable``."""
+    accept = dict(scope.get('headers', [])).get(b'accept', b'')
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    return NDJSON.encode('ascii') in accept or query.get('stream', [''])[0].lower() in ('1', 'true', 'yes')
+
+async def _send_json(send, status, body, headers=(), scope=None):
+    """Send an encoded JSON ``body``; with ``scope``, validate it against ``If-None-Match``."""
+    headers = [*headers]
+    if scope is not None and status == 200:
+        etag = hashlib.sha1(body).hexdigest()
+        headers += [(b'etag', quote_etag(etag).encode('ascii')), (b'cache-control', b'no-cache')]
+        if_none_match = dict(scope.get('headers', [])).get(b'if-none-match')
+        if if_none_match and parse_etags(if_none_match.decode('latin-1')).contains_weak(etag):
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            return await send({'type': 'http.response.body', 'body': b''})
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode('ascii')), *headers]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+def create_asgi_app(config_class="config.DevelopmentConfig"):
+    """Build the Flask app and wrap it in an ``AsyncReadApp``."""
+    flask_app = create_app(config_class)
+    config = flask_app.config
+    with flask_app.app_context():
+        # db.engine.url has Flask-SQLAlchemy's instance-path fix-ups applied
+        uri = config.get('SQLALCHEMY_ASYNC_DATABASE_URI') or db.engine.url
+    session_factory = create_async_session_factory(
+        uri, **config.get('SQLALCHEMY_ASYNC_ENGINE_OPTIONS', config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    )
+    facade = AsyncFacade(
+        session_factory,
+        page_default_limit=config.get('PAGE_DEFAULT_LIMIT', 50),
+        page_max_limit=config.get('PAGE_MAX_LIMIT', 200)
+    )
+    return AsyncReadApp(flask_app, facade)
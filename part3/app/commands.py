@@ -0,0 +1,23 @@
+"""Maintenance commands, run with ``flask --app run <command>``."""
+import click
+from app.services import facade
+
+def init_commands(app):
+    """Register the maintenance commands on ``app.cli``."""
+    @app.cli.command('repair-ratings')
+    def repair_ratings():
+        """Recompute every place's review count and rating histogram."""
+        count = facade.repair_place_ratings()
+        click.echo(f"Recomputed ratings of {count} places")
+
+    @app.cli.command('rebuild-place-summaries')
+    def rebuild_place_summaries():
+        """Recompute the place_summaries read model from the source tables."""
+        count = facade.rebuild_place_summaries()
+        click.echo(f"Rebuilt summaries of {count} places")
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index():
+        """Create and refill the full-text index of places (SQLite; no-op on MySQL)."""
+        facade.rebuild_search_index()
+        click.echo("Rebuilt the place search index")
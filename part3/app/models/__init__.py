@@ -3,6 +3,8 @@ from .user import User
 from .place import Place
 from .review import Review
 from .amenity import Amenity
+from .place_summary import PlaceSummary
+from .table_version import TableVersion
 from .base_model import BaseModel
 
 def init_app(app):
@@ -1,32 +1,31 @@
-from sqlalchemy import Table, ForeignKey
 from sqlalchemy.orm import relationship
 from app.extensions import db
+from app.validation import STRING, Rule, Schema
 from .base_model import BaseModel
+from .place import place_amenity
 
-place_amenity = Table(
-    'place_amenity',
-    db.Model.metadata,
-    db.Column('place_id', db.String(36), ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), ForeignKey('amenities.id'), primary_key=True),
-    extend_existing=True  # ✅ Ajout magique
-)
+NAME_MESSAGE = "Amenity name must be between 1 and 50 characters"
 
 class Amenity(BaseModel):
     __tablename__ = 'amenities'
 
     name = db.Column(db.String(50), nullable=False)
 
-    places = relationship('Place', secondary=place_amenity, backref='amenities', lazy='subquery')
+    places = relationship('Place', secondary=place_amenity, back_populates='amenities', lazy='select')
+
+    SCHEMA = Schema('Amenity', {
+        'name': Rule(STRING, "Amenity name", max_length=50, messages={'empty': NAME_MESSAGE,
+                                                                     'length': NAME_MESSAGE})
+    })
 
     def __init__(self, name: str, **kwargs):
         super().__init__(**kwargs)
-        self.validate_name(name)
+        self.SCHEMA.validate({'name': name})
         self.name = name
 
-    @staticmethod
-    def validate_name(name: str):
-        if not name or len(name) > 50:
-            raise ValueError("Amenity name must be between 1 and 50 characters")
+    @classmethod
+    def validate_name(cls, name: str):
+        cls.SCHEMA.check('name', name)
 
     def to_dict(self):
         amenity_dict = super().to_dict()
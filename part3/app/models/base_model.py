@@ -1,6 +1,9 @@
 from uuid import uuid4
 from datetime import datetime
+from sqlalchemy import Index
+from sqlalchemy.orm import declared_attr
 from app import db
+from app.persistence.unit_of_work import commit
 
 class BaseModel(db.Model):
     """Base class for all models using SQLAlchemy"""
@@ -8,17 +11,25 @@ class BaseModel(db.Model):
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid4()))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Model-specific indexes and constraints, merged into __table_args__
+    _table_args = ()
+
+    @declared_attr
+    def __table_args__(cls):
+        """Index the (created_at, id) keyset used to paginate every table"""
+        return (Index(f'ix_{cls.__tablename__}_created_at_id', 'created_at', 'id'),) + tuple(cls._table_args)
 
     def save(self):
         """Save or update the instance in the database"""
         db.session.add(self)
-        db.session.commit()
+        commit()
 
     def delete(self):
         """Delete the instance from the database"""
         db.session.delete(self)
-        db.session.commit()
+        commit()
 
     def update(self, **kwargs):
         """Update model attributes dynamically from keyword arguments"""
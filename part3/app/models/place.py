@@ -1,7 +1,9 @@
 from app import db
 from .base_model import BaseModel
-from sqlalchemy import ForeignKey, Table
-from sqlalchemy.orm import relationship
+from app.persistence import text_search
+from app.validation import NUMBER, STRING, Rule, Schema
+from sqlalchemy import ForeignKey, Index, Table
+from sqlalchemy.orm import backref, deferred, relationship, synonym
 
 # Association table for the many-to-many relationship between Place and Amenity
 place_amenity = Table('place_amenity', db.Model.metadata,
@@ -13,39 +15,57 @@ class Place(BaseModel):
     """Class representing a rental place"""
 
     __tablename__ = 'places'
+    _table_args = (Index('ix_places_latitude_longitude', 'latitude', 'longitude'),)
 
     title = db.Column(db.String(100), nullable=False)
-    description = db.Column(db.Text, nullable=True)
-    price = db.Column(db.Float, nullable=False, default=0.0)
-    latitude = db.Column(db.Float, nullable=False, default=0.0)
-    longitude = db.Column(db.Float, nullable=False, default=0.0)
+    # Free text, deferred: only the reads serving descriptions load it
+    description = deferred(db.Column(db.Text, nullable=True))
+    # Stored under their public names; the validating properties below map onto them
+    _price = db.Column('price', db.Float, nullable=False, default=0.0, index=True)
+    _latitude = db.Column('latitude', db.Float, nullable=False, default=0.0)
+    _longitude = db.Column('longitude', db.Float, nullable=False, default=0.0)
 
     # Relationships
-    user_id = db.Column(db.String(36), ForeignKey('users.id'), nullable=False)
-    reviews = relationship('Review', backref='place', lazy=True)
-    amenities = relationship('Amenity', secondary=place_amenity, backref='places', lazy='subquery')
+    user_id = db.Column(db.String(36), ForeignKey('users.id'), nullable=False, index=True)
+    # Plain lazy loading by default; endpoints pick eager strategies per query
+    owner = relationship('User', backref=backref('places', lazy='select'), lazy='select')
+    reviews = relationship('Review', backref='place', lazy='select')
+    amenities = relationship('Amenity', secondary=place_amenity, back_populates='places', lazy='select')
+
+    # Rating aggregates, kept in step with the reviews by the facade so list
+    # pages can show ratings without touching the reviews table
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
+
+    SCHEMA = Schema('Place', {
+        'title': Rule(STRING, "Title", max_length=100),
+        'price': Rule(NUMBER, "Price", minimum=0, messages={'range': "Price cannot be negative"}),
+        'latitude': Rule(NUMBER, "Latitude", minimum=-90, maximum=90),
+        'longitude': Rule(NUMBER, "Longitude", minimum=-180, maximum=180)
+    })
 
     def __init__(self, title, description="", price=0.0, latitude=0.0, longitude=0.0, **kwargs):
         """Initialize a new Place"""
         super().__init__(**kwargs)
 
-        # Validate required fields
-        self.validate_title(title)
-
-        # Set properties
+        # Every field is checked here once; the setters below only check updates
+        values = self.SCHEMA.validate({'title': title, 'price': price,
+                                       'latitude': latitude, 'longitude': longitude})
         self.title = title
         self.description = description
-        self.price = price  # Will use the setter with validation
-        self.latitude = latitude
-        self.longitude = longitude
+        self._price = values['price']
+        self._latitude = values['latitude']
+        self._longitude = values['longitude']
 
-    @staticmethod
-    def validate_title(title):
+    @classmethod
+    def validate_title(cls, title):
         """Validate place title"""
-        if not title:
-            raise ValueError("Title cannot be empty")
-        if len(title) > 100:
-            raise ValueError("Title must be 100 characters or less")
+        cls.SCHEMA.check('title', title)
 
     @property
     def price(self):
@@ -55,11 +75,9 @@ class Place(BaseModel):
     @price.setter
     def price(self, value):
         """Set price with validation"""
-        if not isinstance(value, (int, float)):
-            raise ValueError("Price must be a number")
-        if value < 0:
-            raise ValueError("Price cannot be negative")
-        self._price = float(value)
+        self._price = self.SCHEMA.check('price', value)
+
+    price = synonym('_price', descriptor=price)
 
     @property
     def latitude(self):
@@ -69,11 +87,9 @@ class Place(BaseModel):
     @latitude.setter
     def latitude(self, value):
         """Set latitude with validation"""
-        if not isinstance(value, (int, float)):
-            raise ValueError("Latitude must be a number")
-        if not -90 <= float(value) <= 90:
-            raise ValueError("Latitude must be between -90 and 90")
-        self._latitude = float(value)
+        self._latitude = self.SCHEMA.check('latitude', value)
+
+    latitude = synonym('_latitude', descriptor=latitude)
 
     @property
     def longitude(self):
@@ -83,11 +99,19 @@ class Place(BaseModel):
     @longitude.setter
     def longitude(self, value):
         """Set longitude with validation"""
-        if not isinstance(value, (int, float)):
-            raise ValueError("Longitude must be a number")
-        if not -180 <= float(value) <= 180:
-            raise ValueError("Longitude must be between -180 and 180")
-        self._longitude = float(value)
+        self._longitude = self.SCHEMA.check('longitude', value)
+
+    longitude = synonym('_longitude', descriptor=longitude)
+
+    @property
+    def average_rating(self):
+        """Mean rating, or None when the place has no reviews"""
+        return self.rating_sum / self.review_count if self.review_count else None
+
+    @property
+    def rating_histogram(self):
+        """Number of reviews per rating, from 1 to 5"""
+        return {rating: getattr(self, f'rating_{rating}') or 0 for rating in range(1, 6)}
 
     def to_dict(self):
         """Convert place to dictionary"""
@@ -97,6 +121,11 @@ class Place(BaseModel):
             'description': self.description,
             'price': self.price,
             'latitude': self.latitude,
-            'longitude': self.longitude
+            'longitude': self.longitude,
+            'review_count': self.review_count or 0,
+            'average_rating': self.average_rating
         })
         return place_dict
+
+# FTS5 table and triggers on SQLite, FULLTEXT index on MySQL
+text_search.install(Place.__table__)
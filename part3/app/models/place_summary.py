@@ -0,0 +1,101 @@
+from datetime import datetime
+from app import db
+from sqlalchemy import Index
+from sqlalchemy.orm import deferred
+from .base_model import BaseModel
+from app.persistence.geo import geohash_encode, unit_vector
+
+class PlaceSummary(BaseModel):
+    """Denormalized read model of a place, as served by the place endpoints.
+
+    One row per place, sharing its id and timestamps, with the owner,
+    amenity names and rating stats copied in so a list page is one range
+    read and a detail view one row. Rows are rewritten by the facade
+    whenever a place, its owner, its amenities or its reviews change, and
+    can be rebuilt with ``flask --app run rebuild-place-summaries``.
+    """
+
+    __tablename__ = 'place_summaries'
+    # Serves price filters and the keyset of lists sorted by price
+    _table_args = (Index('ix_place_summaries_price_id', 'price', 'id'),)
+
+    title = db.Column(db.String(100), nullable=False)
+    # Deferred like Place.description; whole-row reads undefer it
+    description = deferred(db.Column(db.Text, nullable=True))
+    price = db.Column(db.Float, nullable=False, default=0.0)
+    latitude = db.Column(db.Float, nullable=False, default=0.0)
+    longitude = db.Column(db.Float, nullable=False, default=0.0)
+    # Geohash of (latitude, longitude): geo searches read prefix ranges of this index
+    geohash = db.Column(db.String(12), nullable=False, default='', index=True)
+    # The same point on the unit sphere: searches sort by the chord to it in SQL
+    unit_x = db.Column(db.Float, nullable=False, default=0.0)
+    unit_y = db.Column(db.Float, nullable=False, default=0.0)
+    unit_z = db.Column(db.Float, nullable=False, default=0.0)
+
+    owner_id = db.Column(db.String(36), nullable=False, index=True)
+    owner_first_name = db.Column(db.String(50), nullable=True)
+    owner_last_name = db.Column(db.String(50), nullable=True)
+    owner_email = db.Column(db.String(120), nullable=True)
+
+    # [{'id': ..., 'name': ...}] and {rating: count}
+    amenities = db.Column(db.JSON, nullable=False, default=list)
+    rating_histogram = db.Column(db.JSON, nullable=False, default=dict)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    average_rating = db.Column(db.Float, nullable=True)
+
+    @property
+    def owner(self):
+        """Owner fields in the shape of the nested place owner"""
+        return {
+            'id': self.owner_id,
+            'first_name': self.owner_first_name,
+            'last_name': self.owner_last_name,
+            'email': self.owner_email
+        }
+
+    @staticmethod
+    def row_for(place):
+        """Build the summary row of a place with its owner and amenities loaded"""
+        owner = place.owner
+        unit_x, unit_y, unit_z = unit_vector(place.latitude, place.longitude)
+        return {
+            'id': place.id,
+            'created_at': place.created_at,
+            # When this representation last changed: a renamed owner or
+            # amenity, or a new review, rewrites the summary but not the place
+            'updated_at': datetime.utcnow(),
+            'title': place.title,
+            'description': place.description,
+            'price': place.price,
+            'latitude': place.latitude,
+            'longitude': place.longitude,
+            'geohash': geohash_encode(place.latitude, place.longitude),
+            'unit_x': unit_x,
+            'unit_y': unit_y,
+            'unit_z': unit_z,
+            'owner_id': place.user_id,
+            'owner_first_name': owner.first_name if owner else None,
+            'owner_last_name': owner.last_name if owner else None,
+            'owner_email': owner.email if owner else None,
+            'amenities': [{'id': amenity.id, 'name': amenity.name} for amenity in place.amenities],
+            'rating_histogram': place.rating_histogram,
+            'review_count': place.review_count or 0,
+            'average_rating': place.average_rating
+        }
+
+    def to_dict(self):
+        """Convert the summary to the place dictionary it stands for"""
+        summary_dict = super().to_dict()
+        summary_dict.update({
+            'title': self.title,
+            'description': self.description,
+            'price': self.price,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'owner': self.owner,
+            'amenities': self.amenities,
+            'review_count': self.review_count,
+            'average_rating': self.average_rating,
+            'rating_histogram': self.rating_histogram
+        })
+        return summary_dict
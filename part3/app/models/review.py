@@ -1,42 +1,52 @@
 from app import db
 from .base_model import BaseModel
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy.orm import deferred
+from app.validation import INTEGER, STRING, Rule, Schema
+
+RATING_MESSAGE = "Rating must be an integer between 1 and 5"
 
 class Review(BaseModel):
     """Class representing a review"""
 
     __tablename__ = 'reviews'
+    # One review per user and place; also serves lookups by user_id
+    _table_args = (UniqueConstraint('user_id', 'place_id', name='unique_review'),)
 
-    text = db.Column(db.Text, nullable=False)
+    # Deferred: relationship loads of reviews rarely need the text
+    text = deferred(db.Column(db.Text, nullable=False))
     rating = db.Column(db.Integer, nullable=False)
 
     # Relationships
     user_id = db.Column(db.String(36), ForeignKey('users.id'), nullable=False)
-    place_id = db.Column(db.String(36), ForeignKey('places.id'), nullable=False)
+    place_id = db.Column(db.String(36), ForeignKey('places.id'), nullable=False, index=True)
+
+    SCHEMA = Schema('Review', {
+        'text': Rule(STRING, "Review content", strip=True),
+        'rating': Rule(INTEGER, "Rating", minimum=1, maximum=5, messages={'type': RATING_MESSAGE,
+                                                                         'range': RATING_MESSAGE})
+    })
 
     def __init__(self, text, rating, user_id, place_id, **kwargs):
         """Initialize a new review"""
         super().__init__(**kwargs)
 
-        self.validate_text(text)
-        self.validate_rating(rating)
+        self.SCHEMA.validate({'text': text, 'rating': rating})
 
         self.text = text
         self.rating = rating
         self.user_id = user_id
         self.place_id = place_id
 
-    @staticmethod
-    def validate_text(text):
+    @classmethod
+    def validate_text(cls, text):
         """Validate review content"""
-        if not text or not text.strip():
-            raise ValueError("Review content cannot be empty")
+        cls.SCHEMA.check('text', text)
 
-    @staticmethod
-    def validate_rating(rating):
+    @classmethod
+    def validate_rating(cls, rating):
         """Validate rating"""
-        if not isinstance(rating, int) or not 1 <= rating <= 5:
-            raise ValueError("Rating must be an integer between 1 and 5")
+        cls.SCHEMA.check('rating', rating)
 
     def to_dict(self):
         """Convert review to dictionary"""
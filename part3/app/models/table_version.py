@@ -0,0 +1,15 @@
+from datetime import datetime
+from app import db
+
+class TableVersion(db.Model):
+    """Change counter of a table, bumped once by every transaction writing to it.
+
+    Read by the list endpoints to build collection ETags without running
+    the list query; see ``app.persistence.versions``.
+    """
+
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
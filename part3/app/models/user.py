@@ -1,6 +1,6 @@
 from app.extensions import db, bcrypt
+from app.validation import STRING, Rule, Schema
 from .base_model import BaseModel
-import re
 
 class User(BaseModel):
     """Represents a user in the system with SQLAlchemy integration."""
@@ -12,13 +12,19 @@ class User(BaseModel):
     password = db.Column(db.String(128), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
 
-    def __init__(self, first_name, last_name, email, password, is_admin=False, **kwargs):
+    SCHEMA = Schema('User', {
+        'first_name': Rule(STRING, "First name", strip=True, max_length=50),
+        'last_name': Rule(STRING, "Last name", strip=True, max_length=50),
+        'email': Rule(STRING, "Email", strip=True, pattern=r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'),
+        'password': Rule(STRING, "Password", strip=True, messages={'empty': "Password is required."})
+    })
+
+    def __init__(self, first_name=None, last_name=None, email=None, password=None, is_admin=False, **kwargs):
         super().__init__(**kwargs)
 
-        self.validate_first_name(first_name)
-        self.validate_last_name(last_name)
-        self.validate_email(email)
-        self.validate_password(password)
+        # Missing fields fail validation with their own message, not a TypeError
+        self.SCHEMA.validate({'first_name': first_name, 'last_name': last_name,
+                              'email': email, 'password': password})
 
         self.first_name = first_name
         self.last_name = last_name
@@ -44,29 +50,18 @@ class User(BaseModel):
         })
         return user_dict
 
-    @staticmethod
-    def validate_first_name(first_name):
-        if not first_name or first_name.strip() == "":
-            raise ValueError("First name cannot be empty")
-        if len(first_name) > 50:
-            raise ValueError("First name must be 50 characters or less")
+    @classmethod
+    def validate_first_name(cls, first_name):
+        cls.SCHEMA.check('first_name', first_name)
 
-    @staticmethod
-    def validate_last_name(last_name):
-        if not last_name or last_name.strip() == "":
-            raise ValueError("Last name cannot be empty")
-        if len(last_name) > 50:
-            raise ValueError("Last name must be 50 characters or less")
+    @classmethod
+    def validate_last_name(cls, last_name):
+        cls.SCHEMA.check('last_name', last_name)
 
-    @staticmethod
-    def validate_email(email):
-        if not email or email.strip() == "":
-            raise ValueError("Email cannot be empty")
-        email_pattern = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-        if not re.match(email_pattern, email):
-            raise ValueError("Invalid email format")
+    @classmethod
+    def validate_email(cls, email):
+        cls.SCHEMA.check('email', email)
 
-    @staticmethod
-    def validate_password(password):
-        if not password or password.strip() == "":
-            raise ValueError("Password cannot be empty")
+    @classmethod
+    def validate_password(cls, password):
+        cls.SCHEMA.check('password', password)
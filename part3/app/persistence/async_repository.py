@@ -0,0 +1,109 @@
+"""asyncio counterpart of the SQLAlchemy repositories.
+
+Built on SQLAlchemy's ``AsyncSession`` so an ASGI worker can keep many
+queries in flight instead of blocking a thread per round trip. Needs the
+``sqlalchemy[asyncio]`` extra and an async driver: ``aiosqlite`` for SQLite
+and ``aiomysql`` for MySQL.
+"""
+from sqlalchemy import and_, or_, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.persistence.pagination import encode_cursor, decode_cursor
+from app.persistence.repository import column_options, loader_options
+
+# Async driver to use for each database backend
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+aiomysql',
+    'mariadb': 'mysql+aiomysql'
+}
+
+def async_database_uri(uri):
+    """Rewrite a sync database URI to use the matching async driver."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def create_async_session_factory(uri, **engine_options):
+    """Return an ``async_sessionmaker`` bound to the async twin of ``uri``."""
+    engine = create_async_engine(async_database_uri(uri), **engine_options)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+class AsyncSQLAlchemyRepository:
+    """``SQLAlchemyRepository`` on ``AsyncSession``: the same calls, awaited.
+
+    Each call runs in its own short session and returns detached instances,
+    so relationships needed afterwards must be requested up front with
+    ``load``; touching an unloaded one raises instead of doing blocking I/O.
+    """
+    def __init__(self, model, session_factory, page_default_limit=50, page_max_limit=200):
+        self.model = model
+        self.session_factory = session_factory
+        self.page_default_limit = page_default_limit
+        self.page_max_limit = page_max_limit
+
+    async def add(self, obj):
+        async with self.session_factory() as session:
+            session.add(obj)
+            await session.commit()
+        return obj
+
+    async def get(self, obj_id, load=None):
+        async with self.session_factory() as session:
+            return await session.get(self.model, obj_id, options=self._options(load))
+
+    async def get_all(self, load=None):
+        return await self._scalars(select(self.model).options(*self._options(load)))
+
+    async def get_page(self, limit=None, cursor=None, load=None):
+        """Return ``(items, next_cursor)``, paginated like ``SQLAlchemyRepository.get_page``."""
+        limit = self._page_limit(limit)
+        stmt = select(self.model).options(*self._options(load))
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            stmt = stmt.where(or_(
+                self.model.created_at > created_at,
+                and_(self.model.created_at == created_at, self.model.id > last_id)
+            ))
+        items = await self._scalars(stmt.order_by(self.model.created_at, self.model.id).limit(limit + 1))
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(items[-1].created_at, items[-1].id)
+
+    async def update(self, obj_id, data):
+        async with self.session_factory() as session:
+            obj = await session.get(self.model, obj_id)
+            if obj:
+                for key, value in data.items():
+                    setattr(obj, key, value)
+                await session.commit()
+            return obj
+
+    async def delete(self, obj_id):
+        async with self.session_factory() as session:
+            obj = await session.get(self.model, obj_id)
+            if obj:
+                await session.delete(obj)
+                await session.commit()
+
+    async def get_by_attribute(self, attr_name, attr_value):
+        items = await self._scalars(select(self.model).filter_by(**{attr_name: attr_value}).limit(1))
+        return items[0] if items else None
+
+    def _options(self, load):
+        # Whole rows: a deferred column left unloaded could not be fetched later
+        return [*loader_options(self.model, load), *column_options(self.model, None)]
+
+    async def _scalars(self, stmt):
+        async with self.session_factory() as session:
+            return (await session.scalars(stmt)).unique().all()
+
+    def _page_limit(self, limit):
+        if limit is None:
+            return self.page_default_limit
+        if limit < 1:
+            raise ValueError("Limit must be a positive integer")
+        return min(limit, self.page_max_limit)
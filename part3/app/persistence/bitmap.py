@@ -0,0 +1,135 @@
+"""Compressed bitmaps and the amenity index built on them.
+
+``Bitmap`` follows the layout of roaring bitmaps: values are split on
+their high 16 bits into chunks, and only non-empty chunks are stored, each
+as a Python int used as a 65536-bit set. An AND only visits the chunks
+both sides have and intersects each with one C-level ``&``, so it costs
+little however many places match.
+"""
+import threading
+import time
+
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+class Bitmap:
+    """Set of non-negative ints stored as 2**16-wide chunks of bits."""
+    __slots__ = ('_chunks',)
+
+    def __init__(self, values=()):
+        self._chunks = {}
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        high = value >> CHUNK_BITS
+        self._chunks[high] = self._chunks.get(high, 0) | (1 << (value & CHUNK_MASK))
+
+    def discard(self, value):
+        high = value >> CHUNK_BITS
+        bits = self._chunks.get(high, 0) & ~(1 << (value & CHUNK_MASK))
+        if bits:
+            self._chunks[high] = bits
+        else:
+            self._chunks.pop(high, None)
+
+    def __contains__(self, value):
+        return bool(self._chunks.get(value >> CHUNK_BITS, 0) >> (value & CHUNK_MASK) & 1)
+
+    def __and__(self, other):
+        result = Bitmap()
+        for high in self._chunks.keys() & other._chunks.keys():
+            bits = self._chunks[high] & other._chunks[high]
+            if bits:
+                result._chunks[high] = bits
+        return result
+
+    def __len__(self):
+        return sum(bits.bit_count() for bits in self._chunks.values())
+
+    def __iter__(self):
+        """Yield the values in ascending order."""
+        for high in sorted(self._chunks):
+            bits, base = self._chunks[high], high << CHUNK_BITS
+            while bits:
+                low = bits & -bits
+                yield base | (low.bit_length() - 1)
+                bits ^= low
+
+class AmenityBitmapIndex:
+    """Which places offer which amenity, as one ``Bitmap`` per amenity.
+
+    Places are numbered with dense ordinals in the order they are indexed;
+    ``places_with_all`` ANDs the bitmaps of the requested amenities and
+    maps the surviving ordinals back to place ids. The index lives in the
+    process, like the entity cache: writes made here update it at once,
+    and ``age()`` lets the owner rebuild it to pick up other processes'.
+    """
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ordinals = {}   # place id -> ordinal
+        self._place_ids = []  # ordinal -> place id, None once deleted
+        self._bitmaps = {}    # amenity id -> Bitmap of ordinals
+        self.built_at = clock()
+
+    @classmethod
+    def build(cls, pairs, clock=time.monotonic):
+        """Build an index from ``(place_id, amenity_id)`` pairs."""
+        index = cls(clock)
+        for place_id, amenity_id in pairs:
+            index._bitmap(amenity_id).add(index._ordinal(place_id))
+        return index
+
+    def age(self):
+        """Seconds since the index was built."""
+        return self._clock() - self.built_at
+
+    def set_place(self, place_id, amenity_ids):
+        """Record that ``place_id`` offers exactly ``amenity_ids``."""
+        amenity_ids = set(amenity_ids)
+        with self._lock:
+            ordinal = self._ordinal(place_id)
+            for amenity_id, bitmap in self._bitmaps.items():
+                if amenity_id not in amenity_ids:
+                    bitmap.discard(ordinal)
+            for amenity_id in amenity_ids:
+                self._bitmap(amenity_id).add(ordinal)
+
+    def remove_place(self, place_id):
+        """Forget a deleted place; its ordinal is not reused until a rebuild."""
+        with self._lock:
+            ordinal = self._ordinals.pop(place_id, None)
+            if ordinal is None:
+                return
+            self._place_ids[ordinal] = None
+            for bitmap in self._bitmaps.values():
+                bitmap.discard(ordinal)
+
+    def places_with_all(self, amenity_ids):
+        """Return the set of ids of the places offering every one of ``amenity_ids``."""
+        with self._lock:
+            bitmaps = sorted((self._bitmaps.get(amenity_id, Bitmap()) for amenity_id in set(amenity_ids)),
+                             key=len)
+            if not bitmaps:
+                return set()
+            # Smallest first, so every AND works on the shortest operand
+            result = bitmaps[0]
+            for bitmap in bitmaps[1:]:
+                if not result:
+                    break
+                result = result & bitmap
+            return {self._place_ids[ordinal] for ordinal in result} - {None}
+
+    def _ordinal(self, place_id):
+        ordinal = self._ordinals.get(place_id)
+        if ordinal is None:
+            ordinal = self._ordinals[place_id] = len(self._place_ids)
+            self._place_ids.append(place_id)
+        return ordinal
+
+    def _bitmap(self, amenity_id):
+        bitmap = self._bitmaps.get(amenity_id)
+        if bitmap is None:
+            bitmap = self._bitmaps[amenity_id] = Bitmap()
+        return bitmap
@@ -0,0 +1,142 @@
+"""Geohash cells and distances for the place search.
+
+A geohash interleaves longitude and latitude bits into a base-32 string,
+so places sharing a prefix sit in the same cell and a prefix is a plain
+range on an indexed string column. A search covers its bounding box with
+a handful of cells, reads those ranges, then filters and sorts the
+candidates by the chord between their point on the unit sphere and the
+search point's: it orders like great-circle distance but is plain
+arithmetic, so the database does the sorting and paging.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+# Upper bound on the number of cells (index ranges) one search may read
+MAX_COVER_CELLS = 32
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a point."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+def cell_size(precision):
+    """Return ``(height, width)`` in degrees of a geohash cell."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def cover(bbox):
+    """Return the geohash prefixes of the cells covering ``bbox``.
+
+    ``bbox`` is ``(min_lat, min_lon, max_lat, max_lon)``. The longest
+    precision that needs at most ``MAX_COVER_CELLS`` cells is used.
+    """
+    min_lat, min_lon, max_lat, max_lon = bbox
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        cols = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * cols <= MAX_COVER_CELLS:
+            break
+    cells = set()
+    for row in range(rows):
+        lat = min(min_lat + row * height, max_lat)
+        for col in range(cols):
+            lon = min(min_lon + col * width, max_lon)
+            cells.add(geohash_encode(lat, lon, precision))
+        cells.add(geohash_encode(lat, max_lon, precision))
+    for col in range(cols):
+        cells.add(geohash_encode(max_lat, min(min_lon + col * width, max_lon), precision))
+    cells.add(geohash_encode(max_lat, max_lon, precision))
+    return sorted(cells)
+
+def prefix_range(prefix):
+    """Return ``(low, high)`` so that ``low <= geohash < high`` matches ``prefix``."""
+    head = prefix.rstrip('z')
+    if not head:
+        return prefix, '~'  # sorts after every base-32 character
+    return prefix, head[:-1] + BASE32[BASE32.index(head[-1]) + 1]
+
+def cover_ranges(bbox):
+    """Return the ``(low, high)`` geohash ranges covering ``bbox``.
+
+    Adjacent cells are merged, so neighbouring prefixes cost one range scan.
+    """
+    ranges = []
+    for prefix in cover(bbox):
+        low, high = prefix_range(prefix)
+        if ranges and ranges[-1][1] == low:
+            ranges[-1] = (ranges[-1][0], high)
+        else:
+            ranges.append((low, high))
+    return ranges
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def unit_vector(latitude, longitude):
+    """Point ``(x, y, z)`` on the unit sphere of a latitude/longitude."""
+    phi, lam = math.radians(latitude), math.radians(longitude)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+def chord2_for_km(distance_km):
+    """Squared chord between two unit-sphere points ``distance_km`` apart."""
+    angle = min(distance_km / EARTH_RADIUS_KM, math.pi)
+    return (2 * math.sin(angle / 2)) ** 2
+
+def km_for_chord2(chord2):
+    """Great-circle distance in kilometres of a squared unit-sphere chord."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(max(chord2, 0.0)) / 2))
+
+def bbox_around(latitude, longitude, radius_km):
+    """Bounding box ``(min_lat, min_lon, max_lat, max_lon)`` of a circle.
+
+    Clamped to the valid coordinate ranges; circles crossing the poles or
+    the antimeridian are truncated there.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    d_lon = 180.0 if cos_lat < 1e-9 else min(180.0, d_lat / cos_lat)
+    return (max(-90.0, latitude - d_lat), max(-180.0, longitude - d_lon),
+            min(90.0, latitude + d_lat), min(180.0, longitude + d_lon))
+
+def in_bbox(latitude, longitude, bbox):
+    """Whether a point lies inside ``bbox`` (edges included)."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    return min_lat <= latitude <= max_lat and min_lon <= longitude <= max_lon
+
+def parse_bbox(value):
+    """Parse ``min_lon,min_lat,max_lon,max_lat`` (GeoJSON order) into a bbox tuple."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(','))
+    except (AttributeError, ValueError):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat within valid coordinates")
+    return min_lat, min_lon, max_lat, max_lon
+
+def bbox_center(bbox):
+    """Centre ``(latitude, longitude)`` of a bbox, the origin of bbox-only searches."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
@@ -0,0 +1,62 @@
+"""Opaque cursors for keyset pagination over ``(created_at, id)``."""
+import base64
+import json
+from datetime import datetime
+
+def encode_cursor(created_at, obj_id):
+    """Encode the sort key of the last row of a page into an opaque string."""
+    raw = json.dumps([created_at.isoformat(), obj_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(cursor):
+    """Decode a cursor back into ``(created_at, id)``; raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        created_at, obj_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(obj_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+def encode_rank_cursor(rank, obj_id):
+    """Encode the ``(rank, id)`` sort key of a page ordered by a computed float.
+
+    Used by searches, where ``rank`` is a squared chord (see ``geo``) or a
+    relevance score.
+    """
+    raw = json.dumps([rank, obj_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_rank_cursor(cursor):
+    """Decode a rank cursor into ``(rank, id)``; raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        rank, obj_id = json.loads(raw)
+        return float(rank), str(obj_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+def encode_keyset_cursor(values, sort):
+    """Encode the sort key values of the last row of a ``find()`` page.
+
+    ``sort`` names the ordering the page used (e.g. ``"-price,id"``); it is
+    stored in the cursor so the cursor cannot be replayed under another sort.
+    """
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps([sort, *values]).encode('utf-8')).decode('ascii')
+
+def decode_keyset_cursor(cursor, types, sort):
+    """Decode a ``find()`` cursor into values of the given Python ``types``.
+
+    Raises ValueError if the cursor is invalid or was issued for another sort.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(types) + 1:
+            raise ValueError
+        issued_for, *values = values
+        if issued_for != sort:
+            raise ValueError
+        return [datetime.fromisoformat(value) if kind is datetime else kind(value)
+                for value, kind in zip(values, types)]
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
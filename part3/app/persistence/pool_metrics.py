@@ -0,0 +1,109 @@
+"""Connection pool instrumentation, collected through pool event listeners."""
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+class PoolMetrics:
+    """Counters for one engine's pool: checkouts, waits, overflow, errors."""
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def instrument(self):
+        """Attach the listeners and time checkouts on the engine's pool."""
+        pool = self.engine.pool
+        event.listen(pool, 'checkout', self._on_checkout)
+        event.listen(pool, 'checkin', self._on_checkin)
+        event.listen(pool, 'connect', self._on_connect)
+        event.listen(pool, 'invalidate', self._on_invalidate)
+        # dispose() swaps in a fresh pool: listeners follow it, the timer does not
+        event.listen(self.engine, 'engine_disposed', lambda engine: self._time_checkouts(engine.pool))
+        self._time_checkouts(pool)
+        return self
+
+    def _time_checkouts(self, pool):
+        """Wrap ``pool.connect`` to measure how long callers wait for a connection."""
+        connect = pool.connect
+
+        def timed_connect():
+            start = time.perf_counter()
+            try:
+                return connect()
+            except PoolTimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                raise
+            finally:
+                self._record_wait(time.perf_counter() - start)
+
+        pool.connect = timed_connect
+
+    def _record_wait(self, seconds):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def _on_checkout(self, dbapi_conn, record, proxy):
+        overflow = getattr(self.engine.pool, 'overflow', lambda: 0)()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            if overflow > 0:
+                self.overflow_checkouts += 1
+
+    def _on_checkin(self, dbapi_conn, record):
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def _on_connect(self, dbapi_conn, record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_conn, record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self):
+        """Return the counters plus the pool's own status line."""
+        with self._lock:
+            return {
+                'pool': self.engine.pool.status(),
+                'checkouts': self.checkouts,
+                'in_use': self.in_use,
+                'peak_in_use': self.peak_in_use,
+                'overflow_checkouts': self.overflow_checkouts,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'checkout_wait_avg_ms': round(1000 * self.wait_total / self.wait_count, 3) if self.wait_count else 0.0,
+                'checkout_wait_max_ms': round(1000 * self.wait_max, 3)
+            }
+
+def init_pool_metrics(app, db):
+    """Instrument every engine (primary and binds) of ``app``."""
+    if not app.config.get('POOL_METRICS_ENABLED', True):
+        return
+    with app.app_context():
+        app.extensions['pool_metrics'] = {
+            key or 'default': PoolMetrics(engine).instrument()
+            for key, engine in db.engines.items()
+        }
+
+def pool_stats():
+    """Return the pool counters of the current app, keyed by bind."""
+    metrics = current_app.extensions.get('pool_metrics', {})
+    return {key: value.stats() for key, value in metrics.items()}
@@ -1,10 +1,51 @@
+import operator
 from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import uuid4
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy import and_, bindparam, delete, func, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
+from sqlalchemy.orm import (joinedload, lazyload, load_only, make_transient_to_detached, noload,
+                            raiseload, selectinload, subqueryload, undefer)
 from app.extensions import db  # Import SQLAlchemy instance from the app
+from app.persistence import geo, text_search
+from app.persistence.bitmap import AmenityBitmapIndex
+from app.persistence.cache import LRUCache
+from app.persistence.pagination import (encode_cursor, decode_cursor,
+                                        encode_keyset_cursor, decode_keyset_cursor,
+                                        encode_rank_cursor, decode_rank_cursor)
+from app.persistence.routing import ReplicaRouter, use_bind
+from app.persistence.unit_of_work import commit, in_unit_of_work, transaction
+from app.persistence.versions import read_versions
 from app.models.user import User
-from app.models.place import Place
+from app.models.place import Place, place_amenity
+from app.models.place_summary import PlaceSummary
 from app.models.review import Review
 from app.models.amenity import Amenity
+from app.models.table_version import TableVersion
+
+# Relationship loading strategies callers can ask for, by name
+LOADERS = {
+    'select': lazyload,
+    'joined': joinedload,
+    'selectin': selectinload,
+    'subquery': subqueryload,
+    'noload': noload,
+    'raise': raiseload
+}
+
+# Comparisons accepted by find(), as the ``__op`` suffix of a where key
+OPERATORS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'in': lambda column, values: column.in_(values)
+}
 
 class Repository(ABC):
     """Abstract base class defining the interface for data persistence operations."""
@@ -12,14 +53,30 @@ class Repository(ABC):
     def add(self, obj):
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        pass
+
     @abstractmethod
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_page(self, limit=None, cursor=None):
+        pass
+
+    @abstractmethod
+    def find(self, where=None, order_by=None, limit=None, cursor=None):
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -34,35 +91,510 @@ class Repository(ABC):
 
 class SQLAlchemyRepository(Repository):
     """SQLAlchemy-based implementation of the Repository interface."""
+    # Columns find() may filter and sort on: indexed and never NULL, so
+    # every predicate and keyset can use an index
+    QUERY_FIELDS = ('id', 'created_at', 'updated_at')
+    # Columns behind each public field that is not a column of the same
+    # name, for the ``fields`` projections of the read methods
+    PROJECTIONS = {}
+
     def __init__(self, model):
         self.model = model
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        commit()
 
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def add_many(self, objs, chunk_size=None):
+        """Insert objects in chunks, committing once per chunk.
 
-    def get_all(self):
-        return self.model.query.all()
+        Returns a list of ``(index, error)`` tuples for the objects that could
+        not be written. A chunk that fails is rolled back and retried row by
+        row, so one bad row does not take its neighbours down with it. Inside
+        a unit of work each chunk is a SAVEPOINT instead of a commit.
+        """
+        chunk_size = chunk_size or _bulk_chunk_size()
+        errors = []
+        for start in range(0, len(objs), chunk_size):
+            chunk = objs[start:start + chunk_size]
+            try:
+                with transaction():
+                    db.session.add_all(chunk)
+            except SQLAlchemyError:
+                errors.extend(self._add_one_by_one(chunk, start))
+        return errors
+
+    def _add_one_by_one(self, objs, offset):
+        """Fallback for a failed chunk: insert each object on its own."""
+        errors = []
+        for index, obj in enumerate(objs, start=offset):
+            try:
+                with transaction():
+                    db.session.add(obj)
+            except SQLAlchemyError as e:
+                errors.append((index, str(getattr(e, 'orig', e))))
+        return errors
+
+    def bulk_upsert(self, rows, chunk_size=None):
+        """Insert or update plain dict rows with Core ``insert()`` statements.
+
+        Rows skip the ORM entirely (no model validation), so callers are
+        expected to validate them first. Every row in a call must carry the
+        same keys; existing rows matched on the primary key are updated.
+        Dialects without an upsert statement get ``_upsert_rows`` instead.
+        """
+        if not rows:
+            return 0
+        chunk_size = chunk_size or _bulk_chunk_size()
+        table = self.model.__table__
+        stmt = _upsert_statement(table, rows[0].keys())
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            if stmt is None:
+                _upsert_rows(table, chunk)
+                continue
+            db.session.execute(stmt, chunk)
+            commit()
+        for row in rows:
+            self._invalidate(row.get('id'))
+        return len(rows)
+
+    def add_unless_exists(self, obj):
+        """Insert ``obj`` in one statement unless it clashes with a unique key.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING (SQLite) or INSERT IGNORE
+        (MySQL) so no lookup is needed first; other dialects try a plain
+        INSERT in a savepoint (``_insert_unless_exists``). Returns ``obj``,
+        now attached to the session, or None when an equal row already exists.
+        """
+        now = datetime.utcnow()
+        obj.id = obj.id or str(uuid4())
+        obj.created_at = obj.created_at or now
+        obj.updated_at = obj.updated_at or now
+        values = {
+            column.name: getattr(obj, attr.key)
+            for attr in self.model.__mapper__.column_attrs
+            for column in attr.columns
+        }
+        stmt = _insert_ignore_statement(self.model.__table__)
+        if stmt is None:
+            if not _insert_unless_exists(self.model.__table__, values):
+                return None
+        else:
+            result = db.session.execute(stmt, values)
+            commit()
+            if result.rowcount == 0:
+                return None
+        make_transient_to_detached(obj)
+        db.session.add(obj)
+        return obj
+
+    def get(self, obj_id, load=None, fields=None):
+        """Return the object with id ``obj_id``, or None.
+
+        ``fields`` limits the columns loaded to those behind these public
+        fields (see ``_column_options``); by default the whole row is
+        loaded, deferred columns included.
+        """
+        if load or fields is not None:
+            # Cached instances carry no eager loads and hold whole rows, so
+            # explicit strategies and projections skip the cache
+            # A detail read keeps updated_at, which Last-Modified is sent from
+            options = [*self._loader_options(load), *self._column_options(fields, ('updated_at',))]
+            return self._read(lambda: db.session.get(self.model, obj_id, options=options))
+
+        options = self._column_options(None)
+        cache = self._cache()
+        if cache is None:
+            return self._read(lambda: db.session.get(self.model, obj_id, options=options))
+
+        obj = _attach(cache.get(obj_id))
+        if obj is None:
+            obj = self._read(lambda: db.session.get(self.model, obj_id, options=options))
+            if obj is not None and _cacheable():
+                cache.set(obj_id, obj)
+        return obj
+
+    def get_many(self, obj_ids, load=None, fields=None):
+        """Return ``(items, missing)`` for ``obj_ids``, in the order they were given.
+
+        Ids already in the entity cache are served from it; the others are
+        read with ``id IN (...)`` queries of at most ``GET_MANY_CHUNK_SIZE``
+        ids each. A repeated id is returned once, and ``missing`` lists the
+        ids that matched no row. ``load`` and ``fields`` are as for ``get``
+        (and, like there, skip the cache).
+        """
+        obj_ids = list(dict.fromkeys(obj_ids))
+        cache = self._cache() if not load and fields is None else None
+        found = {}
+        if cache is not None:
+            for obj_id in obj_ids:
+                obj = _attach(cache.get(obj_id))
+                if obj is not None:
+                    found[obj_id] = obj
+
+        wanted = [obj_id for obj_id in obj_ids if obj_id not in found]
+        options = [*self._loader_options(load), *self._column_options(fields, ('updated_at',))]
+        chunk_size = current_app.config.get('GET_MANY_CHUNK_SIZE', 500)
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start:start + chunk_size]
+            query = self.model.query.options(*options).filter(self.model.id.in_(chunk))
+            for obj in self._read(query.all):
+                found[obj.id] = obj
+                if cache is not None and _cacheable():
+                    cache.set(obj.id, obj)
+        items = [found[obj_id] for obj_id in obj_ids if obj_id in found]
+        return items, [obj_id for obj_id in obj_ids if obj_id not in found]
+
+    def get_existing(self, obj_ids):
+        """Return a ``{id: obj}`` dict for the ids that exist, in one query."""
+        obj_ids = set(obj_ids)
+        if not obj_ids:
+            return {}
+        objs = self._read(self.model.query.filter(self.model.id.in_(obj_ids)).all)
+        return {obj.id: obj for obj in objs}
+
+    def get_all(self, load=None):
+        return self._read(self.model.query.options(*self._loader_options(load)).all)
+
+    def get_page(self, limit=None, cursor=None, load=None, fields=None):
+        """Return ``(items, next_cursor)`` ordered by ``(created_at, id)``.
+
+        Pages are fetched with a keyset predicate on the ``(created_at, id)``
+        index instead of an OFFSET, so every page costs the same whatever its
+        position. ``next_cursor`` is None on the last page. ``fields`` is as
+        for ``get``.
+        """
+        limit = _page_limit(limit)
+        query = self.model.query.options(*self._loader_options(load),
+                                         *self._column_options(fields, ('created_at',)))
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                self.model.created_at > created_at,
+                and_(self.model.created_at == created_at, self.model.id > last_id)
+            ))
+        items = self._read(query.order_by(self.model.created_at, self.model.id).limit(limit + 1).all)
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(items[-1].created_at, items[-1].id)
+
+    def find(self, where=None, order_by=None, limit=None, cursor=None, load=None, fields=None):
+        """Return ``(items, next_cursor)`` for the rows matching ``where``.
+
+        ``where`` maps ``field`` or ``field__op`` (eq, ne, lt, lte, gt, gte,
+        in) to a value, all ANDed. ``order_by`` lists fields, ``-`` prefixed
+        for descending, and defaults to ``created_at``; the id breaks ties.
+        Pages use a keyset on those columns, like ``get_page``. Fields
+        outside ``QUERY_FIELDS`` and unknown operators raise ValueError.
+        ``fields`` is as for ``get``.
+        """
+        limit = _page_limit(limit)
+        keys = self._sort_keys(order_by)
+        query = self._find_query(where, keys, load, fields)
+        if cursor:
+            query = query.filter(_keyset_after(keys, _decode_keyset(cursor, keys)))
+        items = self._read(query.limit(limit + 1).all)
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, _encode_keyset(items[-1], keys)
+
+    def iter_all(self, batch_size=None, load=None, where=None, order_by=None, fields=None):
+        """Iterate over every row (matching ``where``) without loading the whole table.
+
+        Rows are fetched ``STREAM_BATCH_SIZE`` at a time through a server-side
+        cursor (``yield_per``), so memory stays flat however big the table is.
+        Collections in ``load`` must use a yield_per compatible strategy
+        ('selectin', not 'joined' or 'subquery'). ``where``, ``order_by`` and
+        ``fields`` are as for ``find``.
+        """
+        batch_size = batch_size or current_app.config.get('STREAM_BATCH_SIZE', 500)
+        query = self._find_query(where, self._sort_keys(order_by), load, fields)
+        # iter() executes the statement, so the cursor is opened on the replica
+        return self._read(lambda: iter(query.yield_per(batch_size)))
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            commit()
+            self._invalidate(obj_id)
         return obj
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            commit()
+            self._invalidate(obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+        cache = self._cache()
+        if cache is None:
+            return self._read(self.model.query.filter_by(**{attr_name: attr_value}).first)
+
+        # Attribute lookups only cache the id; the entity itself goes through
+        # get(), and a stale mapping (attribute changed, row deleted) is a miss.
+        key = (attr_name, attr_value)
+        obj_id = cache.get(key)
+        if obj_id is not None:
+            obj = self.get(obj_id)
+            if obj is not None and getattr(obj, attr_name) == attr_value:
+                return obj
+            cache.pop(key)
+
+        obj = self._read(self.model.query.filter_by(**{attr_name: attr_value}).first)
+        if obj is not None and _cacheable():
+            cache.set(key, obj.id)
+            cache.set(obj.id, obj)
+        return obj
+
+    def _loader_options(self, load):
+        return loader_options(self.model, load)
+
+    def _column_options(self, fields, keys=()):
+        return column_options(self.model, fields, keys, self.PROJECTIONS)
+
+    def _field(self, name):
+        """Column attribute of a whitelisted field; raises ValueError otherwise."""
+        if name not in self.QUERY_FIELDS:
+            raise ValueError(f"Unknown field '{name}', expected one of: {', '.join(self.QUERY_FIELDS)}")
+        return getattr(self.model, name)
+
+    def _sort_keys(self, order_by):
+        """``(name, attribute, descending)`` sort keys, ending with the id."""
+        keys = []
+        for name in order_by or ('created_at',):
+            descending = name.startswith('-')
+            keys.append((name.lstrip('-'), self._field(name.lstrip('-')), descending))
+        # The tie-breaker follows the last key, so one index scan direction serves the sort
+        keys.append(('id', self.model.id, keys[-1][2]))
+        return keys
+
+    def _find_query(self, where, keys, load, fields=None):
+        query = self.model.query.options(*self._loader_options(load),
+                                         *self._column_options(fields, [name for name, _, _ in keys]))
+        for key, value in (where or {}).items():
+            name, _, op = key.partition('__')
+            if op and op not in OPERATORS:
+                raise ValueError(f"Unknown operator '{op}', expected one of: {', '.join(OPERATORS)}")
+            query = query.filter(OPERATORS[op or 'eq'](self._field(name), value))
+        return query.order_by(*(attr.desc() if descending else attr for _, attr, descending in keys))
+
+    def _read(self, fetch):
+        """Run ``fetch`` on a read replica when possible, else on the primary.
+
+        Reads stay on the primary once the session has written, so a request
+        always sees its own writes. A replica that fails to answer is marked
+        down and the read is retried on the primary.
+        """
+        router = _replica_router()
+        if router is None or db.session().pinned_to_primary:
+            return fetch()
+        key = router.choose()
+        if key is None:
+            return fetch()
+        try:
+            with use_bind(key):
+                return fetch()
+        except OperationalError:
+            db.session.rollback()
+            router.mark_down(key)
+            return fetch()
+
+    # --- ENTITY CACHE ---
+    def _cache(self):
+        """Return this model's cache for the current app, or None if disabled."""
+        config = current_app.config
+        if not config.get('ENTITY_CACHE_ENABLED', True):
+            return None
+        caches = current_app.extensions.setdefault('entity_cache', {})
+        cache = caches.get(self.model.__name__)
+        if cache is None:
+            cache = caches.setdefault(self.model.__name__, LRUCache(
+                maxsize=config.get('ENTITY_CACHE_SIZE', 1024),
+                ttl=config.get('ENTITY_CACHE_TTL', 60)
+            ))
+        return cache
+
+    def _invalidate(self, obj_id):
+        cache = self._cache()
+        if cache is not None and obj_id is not None:
+            cache.pop(obj_id)
+
+    def cache_stats(self):
+        """Return the cache counters for this model, or None if disabled."""
+        cache = self._cache()
+        return cache.stats() if cache is not None else None
+
+def loader_options(model, load):
+    """Turn ``{'relationship': 'strategy'}`` into SQLAlchemy loader options."""
+    options = []
+    for name, strategy in (load or {}).items():
+        relationship = model.__mapper__.relationships.get(name)
+        if relationship is None or strategy not in LOADERS:
+            raise ValueError(f"Cannot load {model.__name__}.{name} with '{strategy}'")
+        options.append(LOADERS[strategy](relationship.class_attribute))
+    return options
+
+def column_options(model, fields, keys=(), projections=None):
+    """Column loading options for a read serving the public ``fields``.
+
+    None loads whole rows, columns deferred on the mapper included.
+    Otherwise only the id, the sort ``keys`` and the columns behind
+    ``fields`` are loaded: ``projections`` maps a field to its columns
+    when they are named differently, and names matching no column
+    (relationships, computed values) are ignored.
+    """
+    columns = model.__mapper__.column_attrs
+    if fields is None:
+        return [undefer(attr.class_attribute) for attr in columns if attr.deferred]
+    names = {'id'}
+    for name in (*fields, *keys):
+        names.update((projections or {}).get(name, (name,)))
+    return [load_only(*(attr.class_attribute for attr in columns if attr.key in names))]
+
+def _attach(obj):
+    """Bring a cached instance into the current session without a query.
+
+    Instances whose attributes were expired by a commit elsewhere are
+    treated as misses, since using them would hit the database anyway.
+    """
+    if obj is None:
+        return None
+    if obj in db.session:
+        return obj
+    if inspect(obj).expired_attributes:
+        return None
+    return db.session.merge(obj, load=False)
+
+def _cacheable():
+    """False while a unit of work holds uncommitted writes that could be rolled back."""
+    return not (in_unit_of_work() and db.session().pinned_to_primary)
+
+def _replica_router():
+    """Return the app's replica router, or None when no replica is configured."""
+    config = current_app.config
+    if not config.get('SQLALCHEMY_READ_REPLICAS'):
+        return None
+    router = current_app.extensions.get('replica_router')
+    if router is None:
+        router = current_app.extensions.setdefault('replica_router', ReplicaRouter(
+            config['SQLALCHEMY_READ_REPLICAS'],
+            retry_interval=config.get('REPLICA_RETRY_INTERVAL', 30)
+        ))
+    return router
+
+def _bulk_chunk_size():
+    """Rows per batch for bulk writes, from ``BULK_CHUNK_SIZE``."""
+    return current_app.config.get('BULK_CHUNK_SIZE', 1000)
+
+def _with_amenities(fields):
+    """``fields`` plus the stored amenities the amenity filters check."""
+    return None if fields is None else (*fields, 'amenities')
+
+def _offers_all(summary, amenity_ids):
+    return amenity_ids <= {amenity['id'] for amenity in summary.amenities}
+
+def _keyset_after(keys, values):
+    """Condition selecting the rows that sort after ``values`` on ``keys``.
+
+    Expanded to ``a > x OR (a = x AND b > y) ...`` rather than a row-value
+    comparison, since the directions of the keys may differ.
+    """
+    clauses = []
+    for index, ((_, attr, descending), value) in enumerate(zip(keys, values)):
+        ties = [key[1] == prior for key, prior in zip(keys[:index], values[:index])]
+        clauses.append(and_(*ties, attr < value if descending else attr > value))
+    return or_(*clauses)
+
+def _sort_spec(keys):
+    """The ``order_by`` spelling of sort ``keys``, e.g. ``"-price,-id"``."""
+    return ','.join(f"{'-' if descending else ''}{name}" for name, _, descending in keys)
+
+def _encode_keyset(row, keys):
+    """Cursor after ``row`` for a page sorted by ``keys``."""
+    return encode_keyset_cursor([getattr(row, name) for name, _, _ in keys], _sort_spec(keys))
+
+def _decode_keyset(cursor, keys):
+    """Keyset values of a cursor; raises ValueError if it was issued for another sort."""
+    return decode_keyset_cursor(cursor, [attr.type.python_type for _, attr, _ in keys], _sort_spec(keys))
+
+def _page_limit(limit):
+    """Clamp a requested page size to ``PAGE_DEFAULT_LIMIT``/``PAGE_MAX_LIMIT``."""
+    if limit is None:
+        return current_app.config.get('PAGE_DEFAULT_LIMIT', 50)
+    if limit < 1:
+        raise ValueError("Limit must be a positive integer")
+    return min(limit, current_app.config.get('PAGE_MAX_LIMIT', 200))
+
+def _insert_ignore_statement(table):
+    """Build a dialect-specific insert that silently skips duplicate rows.
+
+    Returns None on dialects without one; see ``_insert_unless_exists``.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect in ('mysql', 'mariadb'):
+        return mysql.insert(table).prefix_with('IGNORE')
+    return None
+
+def _insert_unless_exists(table, values):
+    """Portable insert-ignore: a plain INSERT in a savepoint.
+
+    A clash with any unique key only rolls back the savepoint. Returns
+    whether the row was inserted.
+    """
+    try:
+        with transaction():
+            db.session.execute(table.insert(), values)
+    except IntegrityError:
+        return False
+    return True
+
+def _upsert_statement(table, keys):
+    """Build a dialect-specific "insert or update on primary key" statement.
+
+    Returns None on dialects without one; see ``_upsert_rows``.
+    """
+    dialect = db.session.get_bind().dialect.name
+    updatable = [key for key in keys if key not in ('id', 'created_at')]
+    if dialect == 'sqlite':
+        stmt = sqlite.insert(table)
+        if not updatable:
+            return stmt.on_conflict_do_nothing(index_elements=['id'])
+        return stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={key: stmt.excluded[key] for key in updatable}
+        )
+    if dialect in ('mysql', 'mariadb'):
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(
+            {key: stmt.inserted[key] for key in updatable or ['id']}
+        )
+    return None
+
+def _upsert_rows(table, rows):
+    """Portable upsert on the primary key: SELECT the ids, then INSERT and UPDATE.
+
+    Runs in a savepoint, so a row inserted concurrently between the
+    SELECT and the INSERT fails this chunk alone, with an IntegrityError.
+    """
+    updatable = [key for key in rows[0] if key not in ('id', 'created_at')]
+    with transaction():
+        existing = set(db.session.scalars(
+            select(table.c.id).where(table.c.id.in_([row['id'] for row in rows]))))
+        new = [row for row in rows if row['id'] not in existing]
+        if new:
+            db.session.execute(table.insert(), new)
+        changed = [{'row_id': row['id'], **{key: row[key] for key in updatable}}
+                   for row in rows if row['id'] in existing]
+        if changed and updatable:
+            db.session.execute(table.update().where(table.c.id == bindparam('row_id')), changed)
 
 # --- SPECIFIC REPOSITORIES ---
 class UserRepository(SQLAlchemyRepository):
@@ -72,19 +604,311 @@ class UserRepository(SQLAlchemyRepository):
 
     def get_user_by_email(self, email):
         """Retrieve a user by email."""
-        return self.model.query.filter_by(email=email).first()
+        return self.get_by_attribute('email', email)
 
 class PlaceRepository(SQLAlchemyRepository):
     """Repository for Place-specific operations."""
+    QUERY_FIELDS = ('id', 'created_at', 'updated_at', 'price', 'user_id')
+    PROJECTIONS = {'price': ('_price',), 'latitude': ('_latitude',), 'longitude': ('_longitude',)}
+
     def __init__(self):
         super().__init__(Place)
 
+    def ids_owned_by(self, user_id):
+        """IDs of the places owned by ``user_id``, through ``ix_places_user_id``."""
+        return db.session.scalars(select(Place.id).where(Place.user_id == user_id)).all()
+
+    def adjust_ratings(self, place_id, added=(), removed=()):
+        """Fold added/removed review ratings into a place's aggregates.
+
+        The increments are computed by the database in a single UPDATE
+        (``review_count = review_count + 1``...), so concurrent reviews of
+        the same place never overwrite each other's counts.
+        """
+        added, removed = list(added), list(removed)
+        values = {
+            'review_count': Place.review_count + (len(added) - len(removed)),
+            'rating_sum': Place.rating_sum + (sum(added) - sum(removed))
+        }
+        for rating in set(added) | set(removed):
+            column = getattr(Place, f'rating_{rating}')
+            values[f'rating_{rating}'] = column + (added.count(rating) - removed.count(rating))
+        db.session.execute(update(Place).where(Place.id == place_id).values(values))
+        commit()
+        self._invalidate(place_id)
+
+    def recompute_ratings(self):
+        """Rebuild every place's rating aggregates from the reviews table.
+
+        One UPDATE with correlated subqueries on ``ix_reviews_place_id``;
+        returns the number of places rewritten.
+        """
+        places, reviews = Place.__table__, Review.__table__
+
+        def aggregate(expression, *criteria):
+            return select(func.coalesce(expression, 0)).where(
+                reviews.c.place_id == places.c.id, *criteria).scalar_subquery()
+
+        values = {
+            'review_count': aggregate(func.count()),
+            'rating_sum': aggregate(func.sum(reviews.c.rating)),
+            **{f'rating_{rating}': aggregate(func.count(), reviews.c.rating == rating)
+               for rating in range(1, 6)}
+        }
+        result = db.session.execute(places.update().values(values))
+        commit()
+        # The UPDATE bypassed the ORM: drop in-memory and cached copies
+        for obj in list(db.session.identity_map.values()):
+            if isinstance(obj, Place):
+                db.session.expire(obj)
+        cache = self._cache()
+        if cache is not None:
+            cache.clear()
+        return result.rowcount
+
+    def rebuild_search_index(self):
+        """Refill the full-text index of place titles and descriptions."""
+        text_search.rebuild(db.session)
+        commit()
+
+class PlaceSummaryRepository(SQLAlchemyRepository):
+    """Repository for the ``place_summaries`` read model."""
+    QUERY_FIELDS = ('id', 'created_at', 'updated_at', 'price', 'owner_id')
+    # What a summary row needs from the source tables: the owner in the same
+    # query, amenities in one SELECT ... IN, never the reviews (the rating
+    # columns already carry them, so loading one raises)
+    SOURCE_LOAD = {'owner': 'joined', 'amenities': 'selectin', 'reviews': 'raise'}
+    PROJECTIONS = {'owner': ('owner_id', 'owner_first_name', 'owner_last_name', 'owner_email')}
+
+    def __init__(self):
+        super().__init__(PlaceSummary)
+
+    def refresh(self, place_ids):
+        """Rewrite the summaries of ``place_ids`` from the source tables.
+
+        Places that no longer exist lose their summary. Called by the facade
+        inside the same transaction as the write that changed the place.
+        """
+        place_ids = set(place_ids)
+        if not place_ids:
+            return
+        places = db.session.scalars(
+            select(Place).where(Place.id.in_(place_ids))
+            .options(*loader_options(Place, self.SOURCE_LOAD), undefer(Place.description))
+            .execution_options(populate_existing=True)
+        ).unique().all()
+        self.bulk_upsert([PlaceSummary.row_for(place) for place in places])
+        gone = place_ids - {place.id for place in places}
+        index = current_app.extensions.get('amenity_index')
+        if index is not None:
+            for place in places:
+                index.set_place(place.id, [amenity.id for amenity in place.amenities])
+            for place_id in gone:
+                index.remove_place(place_id)
+        if gone:
+            db.session.execute(delete(PlaceSummary).where(PlaceSummary.id.in_(gone)))
+            commit()
+            for place_id in gone:
+                self._invalidate(place_id)
+
+    def refresh_owner(self, user_id):
+        """Rewrite the summaries of every place owned by ``user_id``."""
+        self.refresh(db.session.scalars(select(Place.id).where(Place.user_id == user_id)))
+
+    def refresh_amenity(self, amenity_id):
+        """Rewrite the summaries of every place offering ``amenity_id``."""
+        self.refresh(self.place_ids_with_amenity(amenity_id))
+
+    @staticmethod
+    def place_ids_with_amenity(amenity_id):
+        return db.session.scalars(
+            select(place_amenity.c.place_id).where(place_amenity.c.amenity_id == amenity_id)).all()
+
+    def amenity_index(self):
+        """The app's amenity bitmap index, (re)built when missing or older than ``AMENITY_INDEX_TTL``."""
+        index = current_app.extensions.get('amenity_index')
+        if index is None or index.age() > current_app.config.get('AMENITY_INDEX_TTL', 300):
+            # Indexed in creation order, so neighbouring places share bitmap chunks
+            pairs = self._read(lambda: db.session.execute(
+                select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+                .join(Place, Place.id == place_amenity.c.place_id)
+                .order_by(Place.created_at, Place.id)
+            ).all())
+            index = current_app.extensions['amenity_index'] = AmenityBitmapIndex.build(pairs)
+        return index
+
+    def find_with_amenities(self, amenity_ids, where=None, order_by=None, limit=None, cursor=None,
+                            fields=None):
+        """``find()`` restricted to the places offering every one of ``amenity_ids``.
+
+        The amenity bitmaps are ANDed in memory. A small result is pushed
+        into the query as ``id IN (...)``; a large one is applied while
+        walking the sorted rows in batches, which then rarely skip any.
+        Rows are checked against their stored amenities too, so a stale
+        index can miss a place but never return a wrong one (which is why
+        a ``fields`` projection always loads them).
+        """
+        limit = _page_limit(limit)
+        wanted = set(amenity_ids)
+        candidates = self.amenity_index().places_with_all(wanted)
+        if not candidates:
+            return [], None
+        where = dict(where or {})
+        if len(candidates) <= current_app.config.get('AMENITY_FILTER_MAX_IDS', 900):
+            where['id__in'] = sorted(candidates)
+        keys = self._sort_keys(order_by)
+        query = self._find_query(where, keys, None, _with_amenities(fields))
+        values = _decode_keyset(cursor, keys) if cursor else None
+        batch_size = current_app.config.get('PAGE_MAX_LIMIT', 200)
+
+        items = []
+        while len(items) <= limit:
+            batch_query = query.filter(_keyset_after(keys, values)) if values else query
+            batch = self._read(batch_query.limit(batch_size).all)
+            items.extend(row for row in batch if row.id in candidates and _offers_all(row, wanted))
+            if len(batch) < batch_size:
+                break
+            values = [getattr(batch[-1], name) for name, _, _ in keys]
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, _encode_keyset(items[-1], keys)
+
+    def iter_with_amenities(self, amenity_ids, where=None, order_by=None, fields=None):
+        """``iter_all()`` restricted to the places offering every one of ``amenity_ids``."""
+        wanted = set(amenity_ids)
+        candidates = self.amenity_index().places_with_all(wanted)
+        if not candidates:
+            return iter(())
+        rows = self.iter_all(where=where, order_by=order_by, fields=_with_amenities(fields))
+        return (row for row in rows if row.id in candidates and _offers_all(row, wanted))
+
+    def search(self, latitude=None, longitude=None, radius_km=None, bbox=None, limit=None, cursor=None,
+               fields=None):
+        """Return ``(items, next_cursor)`` of the places near a point or in a box.
+
+        Either ``radius_km`` around ``(latitude, longitude)`` or a ``bbox``
+        (``(min_lat, min_lon, max_lat, max_lon)``), or both. The box is
+        covered with geohash cells, read as a few ranges of the geohash
+        index, and the database keeps and orders the candidates by
+        ``(chord, id)``: the chord from the point, or from the centre of the
+        box when no point is given, to each place on the unit sphere, which
+        orders like great-circle distance. Only ``limit + 1`` rows come
+        back, and the cursor is a predicate on that order. Each item gets a
+        ``distance_km`` attribute. ``fields`` is as for ``get``.
+        """
+        limit = _page_limit(limit)
+        if radius_km is not None:
+            circle = geo.bbox_around(latitude, longitude, radius_km)
+            bbox = circle if bbox is None else (
+                max(bbox[0], circle[0]), max(bbox[1], circle[1]),
+                min(bbox[2], circle[2]), min(bbox[3], circle[3]))
+            if bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+                return [], None
+        if latitude is None or longitude is None:
+            latitude, longitude = geo.bbox_center(bbox)
+
+        model = self.model
+        x, y, z = geo.unit_vector(latitude, longitude)
+        chord2 = ((model.unit_x - x) * (model.unit_x - x) + (model.unit_y - y) * (model.unit_y - y)
+                  + (model.unit_z - z) * (model.unit_z - z))
+        min_lat, min_lon, max_lat, max_lon = bbox
+        stmt = select(model, chord2.label('chord2')).options(*self._column_options(fields)).where(
+            or_(*(and_(model.geohash >= low, model.geohash < high) for low, high in geo.cover_ranges(bbox))),
+            model.latitude.between(min_lat, max_lat),
+            model.longitude.between(min_lon, max_lon)
+        )
+        if radius_km is not None:
+            stmt = stmt.where(chord2 <= geo.chord2_for_km(radius_km))
+        if cursor:
+            rank, last_id = decode_rank_cursor(cursor)
+            stmt = stmt.where(or_(chord2 > rank, and_(chord2 == rank, model.id > last_id)))
+        stmt = stmt.order_by(chord2, model.id).limit(limit + 1)
+        rows = self._read(lambda: db.session.execute(stmt).all())
+
+        items = []
+        for summary, rank in rows[:limit]:
+            summary.distance_km = round(geo.km_for_chord2(rank), 3)
+            items.append(summary)
+        if len(rows) <= limit:
+            return items, None
+        summary, rank = rows[limit - 1]
+        return items, encode_rank_cursor(rank, summary.id)
+
+    def search_text(self, query, limit=None, cursor=None, fields=None):
+        """Return ``(items, next_cursor)`` of the places matching ``query``.
+
+        Every word must match the title or description, as a prefix. Items
+        are ordered by relevance (BM25 on SQLite, weighting the title above
+        the description) then id, and paged with a keyset on that order.
+        ``fields`` is as for ``get``.
+        """
+        limit = _page_limit(limit)
+        dialect = db.session.get_bind().dialect.name
+        hits = text_search.ranked_place_ids(dialect, Place.__table__, query).subquery()
+        model = self.model
+        stmt = (select(model, hits.c.score).join(hits, hits.c.id == model.id)
+                .options(*self._column_options(fields)))
+        if cursor:
+            score, last_id = decode_rank_cursor(cursor)
+            stmt = stmt.where(or_(hits.c.score > score, and_(hits.c.score == score, model.id > last_id)))
+        stmt = stmt.order_by(hits.c.score, model.id).limit(limit + 1)
+        rows = self._read(lambda: db.session.execute(stmt).all())
+        items = [summary for summary, _ in rows[:limit]]
+        if len(rows) <= limit:
+            return items, None
+        summary, score = rows[limit - 1]
+        return items, encode_rank_cursor(score, summary.id)
+
+    def rebuild(self, chunk_size=None):
+        """Recompute every summary and drop orphans; returns the row count."""
+        chunk_size = chunk_size or _bulk_chunk_size()
+        place_ids = db.session.scalars(select(Place.id).order_by(Place.created_at, Place.id)).all()
+        for start in range(0, len(place_ids), chunk_size):
+            self.refresh(place_ids[start:start + chunk_size])
+            db.session.expunge_all()
+        db.session.execute(delete(PlaceSummary).where(PlaceSummary.id.not_in(select(Place.id))))
+        commit()
+        current_app.extensions.pop('amenity_index', None)
+        cache = self._cache()
+        if cache is not None:
+            cache.clear()
+        return len(place_ids)
+
 class ReviewRepository(SQLAlchemyRepository):
     """Repository for Review-specific operations."""
     def __init__(self):
         super().__init__(Review)
 
+    def find_by_user_and_place(self, user_id, place_id):
+        """Retrieve a user's review of a place through the unique_review index."""
+        return self.model.query.filter_by(user_id=user_id, place_id=place_id).first()
+
+    def delete_by_user_or_places(self, user_id, place_ids=()):
+        """Delete the reviews written by ``user_id`` or about ``place_ids``.
+
+        Returns ``(place_id, rating)`` for each deleted review, so the caller
+        can take the ratings out of the places that remain.
+        """
+        reviews = self.model.query.filter(
+            or_(Review.user_id == user_id, Review.place_id.in_(place_ids))).all()
+        for review in reviews:
+            db.session.delete(review)
+        commit()
+        for review in reviews:
+            self._invalidate(review.id)
+        return [(review.place_id, review.rating) for review in reviews]
+
 class AmenityRepository(SQLAlchemyRepository):
     """Repository for Amenity-specific operations."""
     def __init__(self):
         super().__init__(Amenity)
+
+class TableVersionRepository(SQLAlchemyRepository):
+    """Repository for the per-table change counters."""
+    def __init__(self):
+        super().__init__(TableVersion)
+
+    def collection_version(self, tables):
+        """Return ``(version, last_modified)`` of the rows of ``tables``; see ``read_versions``."""
+        return self._read(lambda: read_versions(db.session, tables))
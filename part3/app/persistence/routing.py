@@ -0,0 +1,84 @@
+"""Read-replica routing for the SQLAlchemy session.
+
+Replicas are ordinary ``SQLALCHEMY_BINDS`` entries listed in
+``SQLALCHEMY_READ_REPLICAS``. Repository reads run inside ``use_bind()``
+so the session sends them to a replica; everything else, and every read
+made after the session has written something, goes to the primary.
+"""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+_read_bind = ContextVar('read_bind', default=None)
+
+class RoutingSession(Session):
+    """Session that sends statements to the bind selected by ``use_bind()``."""
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        key = _read_bind.get()
+        if bind is None and key is not None:
+            return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    @property
+    def pinned_to_primary(self):
+        """True once this session has written, so reads see its own writes."""
+        return bool(self.info.get('wrote') or self.new or self.dirty or self.deleted)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _pin_after_flush(session, flush_context):
+    session.info['wrote'] = True
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _pin_after_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+@contextmanager
+def use_bind(key):
+    """Route the session's statements to bind ``key`` inside the block."""
+    token = _read_bind.set(key)
+    try:
+        yield
+    finally:
+        _read_bind.reset(token)
+
+class ReplicaRouter:
+    """Round-robin over read replicas, skipping those that recently failed.
+
+    Health is checked passively: a replica that raises a connection error
+    is marked down and skipped for ``retry_interval`` seconds, after which
+    it is tried again.
+    """
+    def __init__(self, bind_keys, retry_interval=30, clock=time.monotonic):
+        self.bind_keys = list(bind_keys)
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """Return the next healthy replica bind key, or None for the primary."""
+        now = self._clock()
+        for _ in range(len(self.bind_keys)):
+            key = self.bind_keys[next(self._counter) % len(self.bind_keys)]
+            if self._down_until.get(key, 0) <= now:
+                return key
+        return None
+
+    def mark_down(self, key):
+        """Take ``key`` out of rotation for ``retry_interval`` seconds."""
+        with self._lock:
+            self._down_until[key] = self._clock() + self.retry_interval
+
+    def stats(self):
+        """Return the replicas and the ones currently out of rotation."""
+        now = self._clock()
+        return {
+            'replicas': self.bind_keys,
+            'down': [key for key, until in self._down_until.items() if until > now]
+        }
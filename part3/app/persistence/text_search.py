@@ -0,0 +1,86 @@
+"""Full-text search over place titles and descriptions.
+
+SQLite indexes ``places`` in an FTS5 table, ``places_fts``, that reads its
+text from ``places`` (external content) and is kept in step by triggers,
+so every write to a place, ORM or Core, updates the index in the same
+transaction. MySQL uses a FULLTEXT index on ``places(title, description)``,
+which InnoDB maintains by itself. Both rank with BM25-style relevance and
+match every word of the query as a prefix.
+"""
+import re
+from sqlalchemy import DDL, column, event, func, literal_column, select, table, text
+from sqlalchemy.dialects.mysql import match
+
+# Words of a query; everything else (operators, quotes) is dropped, so user
+# input can never change the shape of the MATCH expression
+WORD = re.compile(r'\w+')
+MAX_TERMS = 8
+# bm25() column weights: a hit in the title counts for ten in the description
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5("
+    "title, description, content='places', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS places_fts_insert AFTER INSERT ON places BEGIN "
+    "INSERT INTO places_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS places_fts_delete AFTER DELETE ON places BEGIN "
+    "INSERT INTO places_fts(places_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS places_fts_update AFTER UPDATE OF title, description ON places BEGIN "
+    "INSERT INTO places_fts(places_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO places_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+)
+SQLITE_DROP = "DROP TABLE IF EXISTS places_fts"
+MYSQL_CREATE = "CREATE FULLTEXT INDEX ix_places_fulltext ON places (title, description)"
+
+def install(places):
+    """Create (and drop) the full-text index along with the ``places`` table."""
+    for statement in SQLITE_CREATE:
+        event.listen(places, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(places, 'after_create', DDL(MYSQL_CREATE).execute_if(dialect='mysql'))
+    event.listen(places, 'before_drop', DDL(SQLITE_DROP).execute_if(dialect='sqlite'))
+
+def rebuild(session):
+    """Create the SQLite index if missing and refill it from ``places``.
+
+    Needed once on databases created before the index existed, and after a
+    VACUUM, which may renumber the rowids the index points at. MySQL keeps
+    its FULLTEXT index current on its own, so this is a no-op there.
+    """
+    if session.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in SQLITE_CREATE:
+        session.execute(text(statement))
+    session.execute(text("INSERT INTO places_fts(places_fts) VALUES ('rebuild')"))
+
+def terms(query):
+    """Split a user query into at most ``MAX_TERMS`` lower-case words."""
+    words = WORD.findall((query or '').lower())
+    if not words:
+        raise ValueError("Search query must contain at least one word")
+    return words[:MAX_TERMS]
+
+def ranked_place_ids(dialect, places, query):
+    """Select ``(id, score)`` of the places matching every word of ``query``.
+
+    Lower scores rank first on both backends.
+    """
+    words = terms(query)
+    if dialect == 'sqlite':
+        fts = table('places_fts', column('rowid'))
+        score = func.bm25(literal_column('places_fts'), TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+        return (select(places.c.id, score.label('score'))
+                .select_from(fts)
+                .join(places, literal_column('places.rowid') == fts.c.rowid)
+                .where(literal_column('places_fts').op('MATCH')(' '.join(f'"{word}"*' for word in words))))
+    if dialect == 'mysql':
+        relevance = match(places.c.title, places.c.description,
+                          against=' '.join(f'+{word}*' for word in words)).in_boolean_mode()
+        return select(places.c.id, (-relevance).label('score')).where(relevance > 0)
+    raise NotImplementedError(f"Full-text search is not supported on {dialect}")
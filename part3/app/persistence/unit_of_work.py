@@ -0,0 +1,78 @@
+"""Unit of work: stage repository writes and commit them once.
+
+Outside a unit of work every repository write commits on its own, as
+before. Inside ``transaction()`` (or a whole request, when
+``UNIT_OF_WORK_PER_REQUEST`` is on) writes are only flushed and the
+commit happens once at the end; nested blocks become SAVEPOINTs.
+"""
+from contextlib import contextmanager
+from flask import current_app
+from app.extensions import db
+
+def commit():
+    """Commit the session, or just flush it while a unit of work is open."""
+    session = db.session()
+    if session.info.get('uow_depth'):
+        session.flush()
+    else:
+        session.commit()
+
+def in_unit_of_work():
+    """True while writes are being staged rather than committed."""
+    return bool(db.session().info.get('uow_depth'))
+
+@contextmanager
+def transaction():
+    """Group the writes made in the block into one commit.
+
+    The outermost block commits on success and rolls everything back on
+    error. Nested blocks run in a SAVEPOINT, so a failing inner block only
+    undoes its own writes before re-raising.
+    """
+    session = db.session()
+    depth = session.info.get('uow_depth', 0)
+    session.info['uow_depth'] = depth + 1
+    savepoint = session.begin_nested() if depth else None
+    try:
+        yield session
+        if savepoint is not None:
+            savepoint.commit()
+        else:
+            session.commit()
+    except Exception:
+        if savepoint is not None:
+            savepoint.rollback()
+        else:
+            session.rollback()
+        raise
+    finally:
+        session.info['uow_depth'] = depth
+
+def init_unit_of_work(app):
+    """Open a unit of work around every request when the config asks for it."""
+    if not app.config.get('UNIT_OF_WORK_PER_REQUEST', False):
+        return
+
+    @app.before_request
+    def _begin_unit_of_work():
+        db.session().info['uow_depth'] = 1
+
+    @app.after_request
+    def _commit_unit_of_work(response):
+        session = db.session()
+        if session.info.get('uow_depth'):
+            session.info['uow_depth'] = 0
+            if response.status_code < 400:
+                session.commit()
+            else:
+                session.rollback()
+        return response
+
+    @app.teardown_request
+    def _rollback_unit_of_work(exc):
+        # Only reached with an open unit of work when the view raised
+        session = db.session()
+        if session.info.get('uow_depth'):
+            session.info['uow_depth'] = 0
+            session.rollback()
+            current_app.logger.debug("Unit of work rolled back: %s", exc)
@@ -0,0 +1,102 @@
+"""Per-table change counters behind the collection ETags.
+
+Every transaction that writes to a table bumps that table's row in
+``table_versions`` once, when the outermost transaction commits, inside
+that same transaction: a list's counters change exactly when its rows
+may have. Writes are noticed both in ORM flushes and in Core
+INSERT/UPDATE/DELETE statements run through a session (bulk upserts,
+rating increments). The listeners sit on ``Session`` itself so the
+async stack's sessions are covered too.
+
+A write that is rolled back may still bump its tables at the session's
+next commit; that only costs clients one needless re-download.
+"""
+from datetime import datetime
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+from app.models.table_version import TableVersion
+
+TOUCHED = 'touched_tables'
+
+def _touch(session, table):
+    if table is not None and table.name != TableVersion.__tablename__:
+        session.info.setdefault(TOUCHED, set()).add(table.name)
+
+@event.listens_for(Session, 'after_flush')
+def _record_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _touch(session, getattr(type(obj), '__table__', None))
+
+@event.listens_for(Session, 'do_orm_execute')
+def _record_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _touch(orm_execute_state.session, getattr(orm_execute_state.statement, 'table', None))
+
+@event.listens_for(Session, 'before_commit')
+def _bump_versions(session):
+    # SAVEPOINT commits fire this too; only the outermost commit counts
+    if session.in_nested_transaction():
+        return
+    session.flush()
+    tables = session.info.pop(TOUCHED, None)
+    if not tables:
+        return
+    now = datetime.utcnow()
+    # Sorted, so concurrent writers lock the counter rows in the same order
+    names = sorted(tables)
+    stmt = _bump_statement(session.get_bind().dialect.name)
+    if stmt is None:
+        _bump_rows(session, names, now)
+        return
+    session.execute(stmt, [{'name': name, 'version': 1, 'updated_at': now} for name in names])
+
+def _bump_statement(dialect):
+    """INSERT a counter at 1, or add 1 to the existing one.
+
+    Returns None on dialects without an upsert; see ``_bump_rows``.
+    """
+    table = TableVersion.__table__
+    if dialect in ('mysql', 'mariadb'):
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update(version=table.c.version + 1, updated_at=stmt.inserted.updated_at)
+    if dialect == 'sqlite':
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_update(index_elements=['name'], set_={
+            'version': table.c.version + 1, 'updated_at': stmt.excluded.updated_at})
+    return None
+
+def _bump_rows(session, names, now):
+    """Portable bump: add 1 to the counters that exist, INSERT the others at 1.
+
+    Each INSERT runs in a savepoint; a counter created concurrently makes
+    it fail, and the bump is then applied to that row as an UPDATE.
+    """
+    table = TableVersion.__table__
+    bump = (table.update().where(table.c.name == bindparam('counter'))
+            .values(version=table.c.version + 1, updated_at=bindparam('bumped_at')))
+    existing = set(session.scalars(select(table.c.name).where(table.c.name.in_(names)).with_for_update()))
+    for name in names:
+        if name in existing:
+            continue
+        try:
+            with session.begin_nested():
+                session.execute(table.insert(), {'name': name, 'version': 1, 'updated_at': now})
+        except IntegrityError:
+            existing.add(name)
+    if existing:
+        session.execute(bump, [{'counter': name, 'bumped_at': now} for name in names if name in existing])
+
+def read_versions(session, tables):
+    """Return ``(version, last_modified)`` summarizing the counters of ``tables``.
+
+    ``version`` is an opaque string; ``last_modified`` is the time of the
+    latest bump, or None for tables never written since the counters exist.
+    """
+    rows = {row.name: row for row in session.execute(
+        select(TableVersion.name, TableVersion.version, TableVersion.updated_at)
+        .where(TableVersion.name.in_(tables))
+    )}
+    version = ','.join(f"{name}:{rows[name].version if name in rows else 0}" for name in sorted(tables))
+    return version, max((row.updated_at for row in rows.values()), default=None)
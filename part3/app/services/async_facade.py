@@ -0,0 +1,75 @@
+from app.persistence.async_repository import AsyncSQLAlchemyRepository
+from app.models.user import User
+from app.models.place import Place
+from app.models.place_summary import PlaceSummary
+from app.models.amenity import Amenity
+from app.models.review import Review
+
+class AsyncFacade:
+    """Awaitable counterpart of ``Facade`` used by the ASGI entry point.
+
+    Covers the reads and amenity creation; writes that must hash passwords,
+    check other entities or refresh the place summaries stay on ``Facade``.
+    """
+    def __init__(self, session_factory, page_default_limit=50, page_max_limit=200):
+        """Initialize async repositories sharing one session factory."""
+        def repo(model):
+            return AsyncSQLAlchemyRepository(model, session_factory, page_default_limit, page_max_limit)
+
+        self.user_repo = repo(User)
+        self.place_repo = repo(Place)
+        self.review_repo = repo(Review)
+        self.amenity_repo = repo(Amenity)
+        self.place_summary_repo = repo(PlaceSummary)
+
+    # --- USER OPERATIONS ---
+    async def get_user(self, user_id):
+        """Retrieve a user by ID."""
+        return await self.user_repo.get(user_id)
+
+    async def get_user_by_email(self, email):
+        """Retrieve a user by email."""
+        return await self.user_repo.get_by_attribute('email', email)
+
+    async def get_users_page(self, limit=None, cursor=None):
+        """Retrieve one page of users and the cursor of the next one."""
+        return await self.user_repo.get_page(limit, cursor)
+
+    # --- PLACE OPERATIONS ---
+    async def get_place(self, place_id, load=None):
+        """Retrieve a place by ID, eagerly loading the relationships in ``load``."""
+        return await self.place_repo.get(place_id, load=load)
+
+    async def get_places_page(self, limit=None, cursor=None, load=None):
+        """Retrieve one page of places and the cursor of the next one."""
+        return await self.place_repo.get_page(limit, cursor, load=load)
+
+    async def get_place_summary(self, place_id):
+        """Retrieve the denormalized summary of a place (one row)."""
+        return await self.place_summary_repo.get(place_id)
+
+    async def get_place_summaries_page(self, limit=None, cursor=None):
+        """Retrieve one page of place summaries and the cursor of the next one."""
+        return await self.place_summary_repo.get_page(limit, cursor)
+
+    # --- AMENITY OPERATIONS ---
+    async def create_amenity(self, amenity_data):
+        """Create a new amenity."""
+        return await self.amenity_repo.add(Amenity(**amenity_data))
+
+    async def get_amenity(self, amenity_id):
+        """Retrieve an amenity by ID."""
+        return await self.amenity_repo.get(amenity_id)
+
+    async def get_amenities_page(self, limit=None, cursor=None):
+        """Retrieve one page of amenities and the cursor of the next one."""
+        return await self.amenity_repo.get_page(limit, cursor)
+
+    # --- REVIEW OPERATIONS ---
+    async def get_review(self, review_id):
+        """Retrieve a review by ID."""
+        return await self.review_repo.get(review_id)
+
+    async def get_reviews_page(self, limit=None, cursor=None):
+        """Retrieve one page of reviews and the cursor of the next one."""
+        return await self.review_repo.get_page(limit, cursor)
@@ -1,34 +1,43 @@
 from flask_bcrypt import Bcrypt
-from app.persistence.repository import UserRepository, PlaceRepository, ReviewRepository, AmenityRepository
+from app.persistence.repository import (UserRepository, PlaceRepository, PlaceSummaryRepository,
+                                        ReviewRepository, AmenityRepository, TableVersionRepository)
+from app.persistence import unit_of_work
 from app.models.user import User
 from app.models.place import Place
 from app.models.amenity import Amenity
 from app.models.review import Review
 
 class Facade:
+    # Fields update_place accepts, for the place PUT and batch updates
+    PLACE_UPDATABLE = ('title', 'description', 'price', 'latitude', 'longitude', 'amenities')
+
     def __init__(self):
         """Initialize repositories using SQLAlchemy."""
         self.user_repo = UserRepository()  
         self.place_repo = PlaceRepository()  
         self.review_repo = ReviewRepository()  
         self.amenity_repo = AmenityRepository()  
+        self.place_summary_repo = PlaceSummaryRepository()
+        self.table_version_repo = TableVersionRepository()
         self.bcrypt = Bcrypt()
 
+    def transaction(self):
+        """Commit every write made inside the ``with`` block at once.
+
+        Nested blocks become savepoints; see ``app.persistence.unit_of_work``.
+        """
+        return unit_of_work.transaction()
+
     # --- USER OPERATIONS ---
     def create_user(self, user_data):
-        """Create a new user with hashed password."""
-        if 'password' not in user_data or not user_data['password'].strip():
-            raise ValueError("Password is required.")
-        
-        # Hash password before storing
-        user_data['password'] = self.bcrypt.generate_password_hash(user_data['password']).decode('utf-8')
+        """Create a new user; the model validates the fields and hashes the password."""
         user = User(**user_data)
         self.user_repo.add(user)
         return user
 
-    def get_user(self, user_id):
+    def get_user(self, user_id, fields=None):
         """Retrieve a user by ID."""
-        return self.user_repo.get(user_id)
+        return self.user_repo.get(user_id, fields=fields)
     
     def get_user_by_email(self, email):
         """Retrieve a user by email."""
@@ -37,37 +46,220 @@ class Facade:
     def get_users(self):
         """Retrieve all users."""
         return self.user_repo.get_all()
+
+    def get_users_by_ids(self, user_ids, fields=None):
+        """Retrieve users by ID, in that order, and the IDs that matched none."""
+        return self.user_repo.get_many(user_ids, fields=fields)
+
+    def get_users_page(self, limit=None, cursor=None, fields=None):
+        """Retrieve one page of users and the cursor of the next one."""
+        return self.user_repo.get_page(limit, cursor, fields=fields)
     
     def update_user(self, user_id, data):
-        """Update user details."""
-        return self.user_repo.update(user_id, data)
+        """Update user details, and the summaries of the places they own.
+
+        A new ``password`` is hashed like on creation, never stored as given.
+        """
+        User.SCHEMA.validate(data, partial=True)
+        data = dict(data)
+        password = data.pop('password', None)
+        with self.transaction():
+            user = self.user_repo.update(user_id, data)
+            if user is not None:
+                if password is not None:
+                    user.hash_password(password)
+                self.place_summary_repo.refresh_owner(user_id)
+        return user
     
+    def create_users(self, rows):
+        """Validate and insert many users, committing once per chunk."""
+        return self._create_many(self.user_repo, rows, lambda row: User(**row))
+
     def delete_user(self, user_id):
-        """Delete a user."""
-        self.user_repo.delete(user_id)
+        """Delete a user with their places and the reviews they wrote.
+
+        The places they reviewed lose those ratings, and the summaries of
+        every place involved are rewritten in the same transaction.
+        """
+        with self.transaction():
+            owned = set(self.place_repo.ids_owned_by(user_id))
+            removed = {}
+            for place_id, rating in self.review_repo.delete_by_user_or_places(user_id, owned):
+                if place_id not in owned:
+                    removed.setdefault(place_id, []).append(rating)
+            for place_id, ratings in removed.items():
+                self.place_repo.adjust_ratings(place_id, removed=ratings)
+            for place_id in owned:
+                self.place_repo.delete(place_id)
+            self.user_repo.delete(user_id)
+            self.place_summary_repo.refresh(owned | removed.keys())
 
     # --- PLACE OPERATIONS ---
     def create_place(self, place_data):
         """Create a new place."""
-        place = Place(**place_data)
-        self.place_repo.add(place)
+        owner_id = place_data.get('owner_id', place_data.get('user_id'))
+        owners = self.user_repo.get_existing([owner_id] if owner_id else [])
+        amenities = self.amenity_repo.get_existing(place_data.get('amenities') or [])
+        place, place_amenities = self._build_place(place_data, owners, amenities)
+        with self.transaction():
+            self.place_repo.add(place)
+            place.amenities = place_amenities
+            self.place_summary_repo.refresh([place.id])
         return place
+
+    def create_places(self, rows):
+        """Validate and insert many places, committing once per chunk."""
+        owner_ids = [row.get('owner_id', row.get('user_id')) for row in rows]
+        owners = self.user_repo.get_existing(filter(None, owner_ids))
+        amenity_ids = [a_id for row in rows for a_id in row.get('amenities') or []]
+        amenities = self.amenity_repo.get_existing(amenity_ids)
+        place_amenities = {}
+
+        def build(row):
+            place, linked = self._build_place(row, owners, amenities)
+            place_amenities[place] = linked
+            return place
+
+        with self.transaction():
+            result = self._create_many(self.place_repo, rows, build)
+            for place in result['created']:
+                place.amenities = place_amenities[place]
+            self.place_summary_repo.refresh(place.id for place in result['created'])
+        return result
+
+    @staticmethod
+    def _build_place(place_data, owners, amenities):
+        """Build a Place, resolving its owner and amenity IDs.
+
+        Returns the place and its amenities, which the caller links once the
+        place is in the session: a flush that finds a transient place in
+        ``Amenity.places`` warns that the link won't be saved.
+        """
+        data = dict(place_data)
+        owner_id = data.pop('owner_id', None) or data.get('user_id')
+        if owner_id not in owners:
+            raise ValueError(f"Owner with ID {owner_id} does not exist")
+        data['user_id'] = owner_id
+
+        place_amenities = []
+        for amenity_id in data.pop('amenities', None) or []:
+            if amenity_id not in amenities:
+                raise ValueError(f"Amenity with ID {amenity_id} does not exist")
+            place_amenities.append(amenities[amenity_id])
+
+        place = Place(**data)
+        place.amenities = []  # loaded and empty, so linking after the insert needs no SELECT
+        return place, place_amenities
     
-    def get_place(self, place_id):
-        """Retrieve a place by ID."""
-        return self.place_repo.get(place_id)
+    def get_place(self, place_id, load=None):
+        """Retrieve a place by ID.
+
+        ``load`` maps relationship names to loading strategies, e.g.
+        ``{'owner': 'joined', 'amenities': 'selectin', 'reviews': 'raise'}``.
+        """
+        return self.place_repo.get(place_id, load=load)
     
+    def get_places_by_ids(self, place_ids, load=None):
+        """Retrieve places by ID, in that order, and the IDs that matched none."""
+        return self.place_repo.get_many(place_ids, load=load)
+
     def get_places(self):
         """Retrieve all places."""
         return self.place_repo.get_all()
+
+    def get_places_page(self, limit=None, cursor=None, load=None):
+        """Retrieve one page of places and the cursor of the next one."""
+        return self.place_repo.get_page(limit, cursor, load=load)
     
+    def iter_places(self, load=None):
+        """Iterate over every place in batches, for streamed responses."""
+        return self.place_repo.iter_all(load=load)
+
+    def get_place_summary(self, place_id, fields=None):
+        """Retrieve the denormalized summary of a place (one row)."""
+        return self.place_summary_repo.get(place_id, fields=fields)
+
+    def get_place_summaries_by_ids(self, place_ids, fields=None):
+        """Retrieve the summaries of places by ID, in that order, and the IDs that matched none."""
+        return self.place_summary_repo.get_many(place_ids, fields=fields)
+
+    def get_place_summaries_page(self, limit=None, cursor=None, fields=None):
+        """Retrieve one page of place summaries and the cursor of the next one."""
+        return self.place_summary_repo.get_page(limit, cursor, fields=fields)
+
+    def find_place_summaries(self, where=None, order_by=None, limit=None, cursor=None, amenities=None,
+                             fields=None):
+        """Retrieve one page of place summaries matching ``where``, sorted by ``order_by``.
+
+        ``amenities`` keeps only the places offering all of those amenity ids;
+        ``fields`` limits the columns read to those the response shows.
+        """
+        if amenities:
+            return self.place_summary_repo.find_with_amenities(amenities, where, order_by, limit, cursor,
+                                                               fields=fields)
+        return self.place_summary_repo.find(where, order_by, limit, cursor, fields=fields)
+
+    def iter_place_summaries(self, where=None, order_by=None, amenities=None, fields=None):
+        """Iterate over every (matching) place summary in batches, for streamed responses."""
+        if amenities:
+            return self.place_summary_repo.iter_with_amenities(amenities, where, order_by, fields=fields)
+        return self.place_summary_repo.iter_all(where=where, order_by=order_by, fields=fields)
+
+    def search_places(self, latitude=None, longitude=None, radius_km=None, bbox=None,
+                      limit=None, cursor=None, fields=None):
+        """Retrieve one page of place summaries near a point or in a box, nearest first."""
+        if bbox is None and radius_km is None:
+            raise ValueError("Give lat, lon and radius_km, or bbox")
+        if radius_km is not None:
+            if latitude is None or longitude is None:
+                raise ValueError("radius_km needs lat and lon")
+            if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+                raise ValueError("lat must be between -90 and 90, lon between -180 and 180")
+            if radius_km <= 0:
+                raise ValueError("radius_km must be greater than 0")
+        return self.place_summary_repo.search(latitude, longitude, radius_km, bbox, limit, cursor,
+                                              fields=fields)
+
+    def search_places_text(self, query, limit=None, cursor=None, fields=None):
+        """Retrieve one page of place summaries matching ``query``, most relevant first."""
+        return self.place_summary_repo.search_text(query, limit, cursor, fields=fields)
+
+    def rebuild_search_index(self):
+        """Refill the full-text index of place titles and descriptions."""
+        self.place_repo.rebuild_search_index()
+
+    def rebuild_place_summaries(self):
+        """Recompute the summary of every place from the source tables."""
+        return self.place_summary_repo.rebuild()
+
     def update_place(self, place_id, data):
-        """Update a place."""
-        return self.place_repo.update(place_id, data)
+        """Update a place's fields and amenities.
+
+        Keys outside ``PLACE_UPDATABLE`` raise ValueError, so the owner and
+        the rating aggregates can't be written through an update.
+        """
+        unknown = set(data) - set(self.PLACE_UPDATABLE)
+        if unknown:
+            raise ValueError(f"Cannot update {', '.join(sorted(unknown))}")
+        Place.SCHEMA.validate(data, partial=True)
+        data = dict(data)
+        amenity_ids = data.pop('amenities', None)
+        amenities = self.amenity_repo.get_existing(amenity_ids or [])
+        for amenity_id in amenity_ids or []:
+            if amenity_id not in amenities:
+                raise ValueError(f"Amenity with ID {amenity_id} does not exist")
+        with self.transaction():
+            place = self.place_repo.update(place_id, data)
+            if place is not None and amenity_ids is not None:
+                place.amenities = [amenities[amenity_id] for amenity_id in dict.fromkeys(amenity_ids)]
+            self.place_summary_repo.refresh([place_id])
+        return place
     
     def delete_place(self, place_id):
         """Delete a place."""
-        self.place_repo.delete(place_id)
+        with self.transaction():
+            self.place_repo.delete(place_id)
+            self.place_summary_repo.refresh([place_id])
 
     # --- AMENITY OPERATIONS ---
     def create_amenity(self, amenity_data):
@@ -76,41 +268,162 @@ class Facade:
         self.amenity_repo.add(amenity)
         return amenity
     
-    def get_amenity(self, amenity_id):
+    def create_amenities(self, rows):
+        """Validate and insert many amenities, committing once per chunk."""
+        return self._create_many(self.amenity_repo, rows, lambda row: Amenity(**row))
+
+    def get_amenity(self, amenity_id, fields=None):
         """Retrieve an amenity by ID."""
-        return self.amenity_repo.get(amenity_id)
+        return self.amenity_repo.get(amenity_id, fields=fields)
     
     def get_all_amenities(self):
         """Retrieve all amenities."""
         return self.amenity_repo.get_all()
+
+    def get_amenities_by_ids(self, amenity_ids, fields=None):
+        """Retrieve amenities by ID, in that order, and the IDs that matched none."""
+        return self.amenity_repo.get_many(amenity_ids, fields=fields)
+
+    def get_amenities_page(self, limit=None, cursor=None, fields=None):
+        """Retrieve one page of amenities and the cursor of the next one."""
+        return self.amenity_repo.get_page(limit, cursor, fields=fields)
     
     def update_amenity(self, amenity_id, data):
-        """Update an amenity."""
-        return self.amenity_repo.update(amenity_id, data)
+        """Update an amenity, and the summaries of the places offering it."""
+        Amenity.SCHEMA.validate(data, partial=True)
+        with self.transaction():
+            amenity = self.amenity_repo.update(amenity_id, data)
+            if amenity is not None:
+                self.place_summary_repo.refresh_amenity(amenity_id)
+        return amenity
     
     def delete_amenity(self, amenity_id):
-        """Delete an amenity."""
-        self.amenity_repo.delete(amenity_id)
+        """Delete an amenity and drop it from the place summaries."""
+        with self.transaction():
+            place_ids = self.place_summary_repo.place_ids_with_amenity(amenity_id)
+            self.amenity_repo.delete(amenity_id)
+            self.place_summary_repo.refresh(place_ids)
 
     # --- REVIEW OPERATIONS ---
     def create_review(self, review_data):
-        """Create a new review."""
+        """Create a new review; a user can review a place only once."""
         review = Review(**review_data)
-        self.review_repo.add(review)
+        with self.transaction():
+            if self.review_repo.add_unless_exists(review) is None:
+                raise ValueError("You have already reviewed this place.")
+            self.place_repo.adjust_ratings(review.place_id, added=[review.rating])
+            self.place_summary_repo.refresh([review.place_id])
         return review
+
+    def get_review_by_user_and_place(self, user_id, place_id):
+        """Retrieve the review a user left on a place, if any."""
+        return self.review_repo.find_by_user_and_place(user_id, place_id)
     
-    def get_review(self, review_id):
+    def create_reviews(self, rows, allow_own_places=True):
+        """Validate and insert many reviews, committing once per chunk.
+
+        With ``allow_own_places`` False, a review of a place by its own
+        owner is rejected like the API's single review creation does.
+        """
+        users = self.user_repo.get_existing(row.get('user_id') for row in rows)
+        places = self.place_repo.get_existing(row.get('place_id') for row in rows)
+
+        def build(row):
+            if row.get('user_id') not in users:
+                raise ValueError(f"User with ID {row.get('user_id')} does not exist")
+            if row.get('place_id') not in places:
+                raise ValueError(f"Place with ID {row.get('place_id')} does not exist")
+            if not allow_own_places and places[row['place_id']].user_id == row['user_id']:
+                raise ValueError("You cannot review your own place.")
+            return Review(**row)
+
+        with self.transaction():
+            result = self._create_many(self.review_repo, rows, build)
+            ratings = {}
+            for review in result['created']:
+                ratings.setdefault(review.place_id, []).append(review.rating)
+            for place_id, added in ratings.items():
+                self.place_repo.adjust_ratings(place_id, added=added)
+            self.place_summary_repo.refresh(ratings)
+        return result
+
+    def get_review(self, review_id, fields=None):
         """Retrieve a review by ID."""
-        return self.review_repo.get(review_id)
+        return self.review_repo.get(review_id, fields=fields)
     
     def get_all_reviews(self):
         """Retrieve all reviews."""
         return self.review_repo.get_all()
+
+    def get_reviews_page(self, limit=None, cursor=None, fields=None):
+        """Retrieve one page of reviews and the cursor of the next one."""
+        return self.review_repo.get_page(limit, cursor, fields=fields)
     
     def update_review(self, review_id, data):
-        """Update a review."""
-        return self.review_repo.update(review_id, data)
+        """Update a review, moving its rating between the place aggregates."""
+        Review.SCHEMA.validate(data, partial=True)
+        with self.transaction():
+            review = self.review_repo.get(review_id)
+            if review is None:
+                return None
+            old_place_id, old_rating = review.place_id, review.rating
+            review = self.review_repo.update(review_id, data)
+            if (review.place_id, review.rating) != (old_place_id, old_rating):
+                self.place_repo.adjust_ratings(old_place_id, removed=[old_rating])
+                self.place_repo.adjust_ratings(review.place_id, added=[review.rating])
+                self.place_summary_repo.refresh([old_place_id, review.place_id])
+        return review
     
     def delete_review(self, review_id):
-        """Delete a review."""
-        self.review_repo.delete(review_id)
+        """Delete a review and take its rating out of the place aggregates."""
+        with self.transaction():
+            review = self.review_repo.get(review_id)
+            if review is None:
+                return
+            place_id, rating = review.place_id, review.rating
+            self.review_repo.delete(review_id)
+            self.place_repo.adjust_ratings(place_id, removed=[rating])
+            self.place_summary_repo.refresh([place_id])
+
+    def repair_place_ratings(self):
+        """Recompute every place's rating aggregates from its reviews."""
+        with self.transaction():
+            count = self.place_repo.recompute_ratings()
+            self.place_summary_repo.rebuild()
+        return count
+
+    # --- BULK HELPERS ---
+    @staticmethod
+    def _create_many(repo, rows, build):
+        """Build objects from rows and bulk insert the valid ones.
+
+        Returns ``{'created': [...], 'errors': [{'index': i, 'error': msg}]}``
+        where ``index`` points back into ``rows``.
+        """
+        objs, positions, errors = [], [], []
+        for index, row in enumerate(rows):
+            try:
+                objs.append(build(row))
+                positions.append(index)
+            except (ValueError, TypeError) as e:
+                errors.append({'index': index, 'error': str(e)})
+
+        failed = set()
+        for obj_index, message in repo.add_many(objs):
+            failed.add(obj_index)
+            errors.append({'index': positions[obj_index], 'error': message})
+
+        errors.sort(key=lambda error: error['index'])
+        created = [obj for i, obj in enumerate(objs) if i not in failed]
+        return {'created': created, 'errors': errors}
+
+    # --- CONDITIONAL GET ---
+    def get_collection_version(self, tables):
+        """Return ``(version, last_modified)`` of the change counters of ``tables``."""
+        return self.table_version_repo.collection_version(tables)
+
+    # --- MONITORING ---
+    def get_cache_stats(self):
+        """Return entity cache counters per model."""
+        repos = (self.user_repo, self.place_repo, self.review_repo, self.amenity_repo)
+        return {repo.model.__name__: repo.cache_stats() for repo in repos}
@@ -0,0 +1,124 @@
+"""Field validation compiled from declarative rules.
+
+Each model lists the rules of its fields in a ``Schema``. The first time
+it is used, the schema generates the source of one function checking
+every field in turn, with the limits and messages inlined, and compiles
+it; ``validate`` runs that function over a payload and returns the
+cleaned values (numbers as floats). ``check`` runs the compiled check of
+a single field, for the property setters that validate later updates.
+The model constructors validate through their schema once, so an API
+payload has each of its fields checked exactly once on the way in.
+"""
+import math
+import re
+
+STRING, NUMBER, INTEGER = 'string', 'number', 'integer'
+
+class Rule:
+    """Constraints on one field, and the messages reported when they fail.
+
+    ``messages`` overrides the defaults for ``empty``, ``type``,
+    ``length``, ``range`` and ``pattern`` failures.
+    """
+    def __init__(self, kind, label, required=True, nullable=False, strip=False, max_length=None,
+                 minimum=None, maximum=None, pattern=None, messages=None):
+        self.kind = kind
+        self.required = required
+        self.nullable = nullable
+        self.strip = strip
+        self.max_length = max_length
+        self.minimum = minimum
+        self.maximum = maximum
+        self.pattern = re.compile(pattern) if pattern else None
+        if minimum is not None and maximum is not None:
+            out_of_range = f"{label} must be between {minimum} and {maximum}"
+        elif minimum is not None:
+            out_of_range = f"{label} must be at least {minimum}"
+        else:
+            out_of_range = f"{label} must be at most {maximum}"
+        self.messages = {
+            'empty': f"{label} cannot be empty",
+            'type': f"{label} must be a {kind}" if kind != INTEGER else f"{label} must be an integer",
+            'length': f"{label} must be {max_length} characters or less",
+            'range': out_of_range,
+            'pattern': f"Invalid {label.lower()} format",
+            **(messages or {})
+        }
+
+class Schema:
+    """Rules of a model's fields, compiled into one validating function."""
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = rules
+        self._validate = None
+        self._checks = None
+
+    def validate(self, data, partial=False):
+        """Check ``data`` and return its cleaned values.
+
+        Raises ValueError with the first failing field's message. With
+        ``partial``, fields missing from ``data`` are not required.
+        """
+        if self._validate is None:
+            self._compile()
+        return self._validate(data, partial)
+
+    def check(self, name, value):
+        """Check and return the cleaned ``value`` of one field."""
+        if self._checks is None:
+            self._compile()
+        return self._checks[name](value)
+
+    def _compile(self):
+        namespace = {'isinstance': isinstance, 'len': len, 'float': float, 'str': str, 'int': int,
+                     'bool': bool, 'isfinite': math.isfinite, 'ValueError': ValueError}
+        validate = ['def validate(data, partial):', '    out = {}']
+        checks = []
+        for index, (name, rule) in enumerate(self.rules.items()):
+            for key, message in rule.messages.items():
+                namespace[f'm{index}_{key}'] = message
+            if rule.pattern:
+                namespace[f'p{index}'] = rule.pattern
+            body = self._field_source(index, rule)
+            validate += [f'    if {name!r} in data:', f'        v = data[{name!r}]',
+                         *('    ' + line for line in body), f'        out[{name!r}] = v']
+            if rule.required:
+                validate += ['    elif not partial:', f'        raise ValueError(m{index}_empty)']
+            checks += [f'def check_{index}(v):', *body, '    return v']
+        validate.append('    return out')
+        source = '\n'.join(validate + checks)
+        exec(compile(source, f'<validator {self.name}>', 'exec'), namespace)
+        self.source = source
+        self._checks = {name: namespace[f'check_{index}'] for index, name in enumerate(self.rules)}
+        self._validate = namespace['validate']
+
+    @staticmethod
+    def _field_source(index, rule):
+        """Lines checking and cleaning ``v`` against ``rule``, indented for a function body."""
+        lines = []
+        if rule.nullable:
+            lines.append('    if v is not None:')
+        checks = []
+        if rule.kind == STRING:
+            checks += [f'if not v: raise ValueError(m{index}_empty)',
+                       f'if not isinstance(v, str): raise ValueError(m{index}_type)']
+            if rule.strip:
+                checks.append(f'if not v.strip(): raise ValueError(m{index}_empty)')
+            if rule.max_length is not None:
+                checks.append(f'if len(v) > {rule.max_length}: raise ValueError(m{index}_length)')
+            if rule.pattern:
+                checks.append(f'if not p{index}.match(v): raise ValueError(m{index}_pattern)')
+        else:
+            types = 'int' if rule.kind == INTEGER else '(int, float)'
+            checks.append(f'if not isinstance(v, {types}) or isinstance(v, bool): raise ValueError(m{index}_type)')
+            if rule.kind == NUMBER:
+                # NaN fails every comparison and infinities every column; neither is a number here
+                checks.append(f'if isinstance(v, float) and not isfinite(v): raise ValueError(m{index}_type)')
+            if rule.minimum is not None or rule.maximum is not None:
+                low = f'{rule.minimum!r} <= ' if rule.minimum is not None else ''
+                high = f' <= {rule.maximum!r}' if rule.maximum is not None else ''
+                checks.append(f'if not ({low}v{high}): raise ValueError(m{index}_range)')
+            if rule.kind == NUMBER:
+                checks.append('v = float(v)')
+        indent = '        ' if rule.nullable else '    '
+        return lines + [indent + check for check in checks]
@@ -0,0 +1,12 @@
+"""Entry point for serving the application with an ASGI server.
+
+Public GET routes run on the event loop; run it with e.g.
+    uvicorn asgi:app
+"""
+import pymysql
+pymysql.install_as_MySQLdb()
+
+from app.asgi import create_asgi_app
+from config import DevelopmentConfig
+
+app = create_asgi_app(DevelopmentConfig)
@@ -0,0 +1,117 @@
+"""Compare request throughput of the sync and async repository stacks.
+
+Seeds a SQLite file, then fetches random place summaries and pages of
+summaries (what the place endpoints serve), ``--concurrency`` at a time:
+through the sync Facade on a thread pool, and through the AsyncFacade with
+asyncio.gather. Needs the async extras (greenlet, aiosqlite). On MySQL,
+where each round trip waits on the network, pass ``--uri`` to see the
+difference the event loop makes.
+
+Usage (from part3/):
+    python benchmarks/bench_async.py --places 5000 --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.persistence.async_repository import create_async_session_factory  # noqa: E402
+from app.services import facade  # noqa: E402
+from app.services.async_facade import AsyncFacade  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+
+def seed(places, amenities):
+    """Create one owner, some amenities and ``places`` places; return the place ids."""
+    owner = facade.create_user({'first_name': 'Bench', 'last_name': 'Owner',
+                                'email': 'bench@example.com', 'password': 'x'})
+    amenity_ids = [a.id for a in facade.create_amenities(
+        [{'name': f'Amenity {i}'} for i in range(amenities)])['created']]
+    created = facade.create_places([
+        {'title': f'Place {i}', 'owner_id': owner.id, 'price': random.uniform(10, 500),
+         'amenities': random.sample(amenity_ids, 3)}
+        for i in range(places)
+    ])['created']
+    return [place.id for place in created]
+
+
+def run_sync(app, workload, concurrency):
+    """Serve ``workload`` from a thread pool, one app context per call."""
+    def call(item):
+        kind, value = item
+        with app.app_context():
+            if kind == 'detail':
+                facade.get_place_summary(value)
+            else:
+                facade.get_place_summaries_page(limit=value)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, workload))
+    return time.perf_counter() - start
+
+
+async def run_async(async_facade, workload, concurrency):
+    """Serve ``workload`` with at most ``concurrency`` coroutines in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(item):
+        kind, value = item
+        async with semaphore:
+            if kind == 'detail':
+                await async_facade.get_place_summary(value)
+            else:
+                await async_facade.get_place_summaries_page(limit=value)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(item) for item in workload))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=5000)
+    parser.add_argument('--amenities', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--uri', help='database to use instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    uri = args.uri or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_async.db')
+    pool = {'pool_size': args.concurrency, 'max_overflow': 0}
+    config = type('BenchConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': uri,
+        'SQLALCHEMY_ENGINE_OPTIONS': pool,
+        'ENTITY_CACHE_ENABLED': False
+    })
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        place_ids = seed(args.places, args.amenities)
+        url = db.engine.url
+
+    workload = [('detail', random.choice(place_ids)) if random.random() < 0.8 else ('page', 20)
+                for _ in range(args.requests)]
+    async_facade = AsyncFacade(create_async_session_factory(url, **pool))
+
+    sync_time = run_sync(app, workload, args.concurrency)
+    async_time = asyncio.run(run_async(async_facade, workload, args.concurrency))
+
+    print(f"{'stack':<8} {'seconds':>9} {'req/s':>9}")
+    for name, elapsed in (('sync', sync_time), ('async', async_time)):
+        print(f"{name:<8} {elapsed:>9.3f} {args.requests / elapsed:>9.1f}")
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Compare hot lookups with and without the secondary indexes declared on the models.
+
+Seeds a SQLite database from the models' metadata, then times each query
+with the declared indexes and again after dropping them.
+
+Usage (from part3/):
+    python benchmarks/bench_indexes.py --places 20000 --reviews 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from app.extensions import db  # noqa: E402
+import app.models  # noqa: E402,F401  (registers the tables on db.metadata)
+
+QUERIES = {
+    'reviews of a place': "SELECT * FROM reviews WHERE place_id = :place_id",
+    'places of an owner': "SELECT * FROM places WHERE user_id = :user_id",
+    'price range': "SELECT id FROM places WHERE price BETWEEN 100 AND 101",
+    'bounding box': "SELECT id FROM places WHERE latitude BETWEEN 43.0 AND 43.5 "
+                    "AND longitude BETWEEN 5.0 AND 5.5",
+    'recently updated': "SELECT id FROM places WHERE updated_at > :since",
+}
+
+
+def seed(engine, users, places, reviews):
+    """Insert random users, places and reviews with Core executemany."""
+    tables = db.metadata.tables
+    now = datetime.utcnow()
+    user_ids = [str(uuid4()) for _ in range(users)]
+    place_ids = [str(uuid4()) for _ in range(places)]
+    with engine.begin() as conn:
+        conn.execute(tables['users'].insert(), [
+            {'id': user_id, 'first_name': 'U', 'last_name': str(i), 'email': f'user{i}@example.com',
+             'password': 'x', 'is_admin': False, 'created_at': now, 'updated_at': now}
+            for i, user_id in enumerate(user_ids)
+        ])
+        conn.execute(tables['places'].insert(), [
+            {'id': place_id, 'title': f'Place {i}', 'description': 'Lorem ipsum', 'user_id': random.choice(user_ids),
+             'price': random.uniform(10, 500), 'latitude': random.uniform(-90, 90),
+             'longitude': random.uniform(-180, 180), 'created_at': now, 'updated_at': now}
+            for i, place_id in enumerate(place_ids)
+        ])
+        pairs = set()
+        while len(pairs) < reviews:
+            pairs.add((random.choice(user_ids), random.choice(place_ids)))
+        conn.execute(tables['reviews'].insert(), [
+            {'id': str(uuid4()), 'text': 'Nice', 'rating': random.randint(1, 5), 'user_id': user_id,
+             'place_id': place_id, 'created_at': now, 'updated_at': now}
+            for user_id, place_id in pairs
+        ])
+    return user_ids, place_ids
+
+
+def run(engine, params, repeat):
+    """Return ``{name: (ms per query, query plan)}`` for every query."""
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            plan = ' | '.join(row[-1] for row in conn.execute(text('EXPLAIN QUERY PLAN ' + sql), params))
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params).fetchall()
+            results[name] = ((time.perf_counter() - start) * 1000 / repeat, plan)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--places', type=int, default=20000)
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    db.metadata.create_all(engine)
+    user_ids, place_ids = seed(engine, args.users, args.places, args.reviews)
+    params = {'place_id': place_ids[0], 'user_id': user_ids[0], 'since': datetime.utcnow()}
+
+    indexed = run(engine, params, args.repeat)
+    with engine.begin() as conn:
+        for table in ('places', 'reviews'):
+            for index in db.metadata.tables[table].indexes:
+                conn.execute(text(f'DROP INDEX {index.name}'))
+    scanned = run(engine, params, args.repeat)
+
+    print(f"{'query':<20} {'no index (ms)':>14} {'indexed (ms)':>13} {'speedup':>8}")
+    for name in QUERIES:
+        slow, fast = scanned[name][0], indexed[name][0]
+        print(f"{name:<20} {slow:>14.3f} {fast:>13.3f} {slow / fast:>7.1f}x")
+        print(f"    plan: {indexed[name][1]}")
+
+
+if __name__ == '__main__':
+    main()
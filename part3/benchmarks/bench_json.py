@@ -0,0 +1,84 @@
+"""Time serializing a page of place summaries with each JSON encoder.
+
+Builds ``--places`` in-memory summaries shaped like the place list's rows
+(owner, three amenities, rating histogram, timestamps) and times, over
+``--runs`` runs: marshalling them, encoding the marshalled list, and the
+two together. ``restx`` is the previous path: ``fields.DateTime`` formats
+each timestamp and flask-restx's ``output_json`` encodes with the stdlib;
+``json`` and ``orjson`` are the encoders of ``app.api.representations``,
+which receive the datetimes as they are.
+
+Usage (from part3/):
+    python benchmarks/bench_json.py --places 10000
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_restx import fields, marshal  # noqa: E402
+from app.api.representations import make_dumps, orjson  # noqa: E402
+from app.api.v1.places import place_response_model  # noqa: E402
+
+
+def summaries(count):
+    """Return ``count`` objects with the attributes the place list marshals."""
+    now = datetime.utcnow()
+    owner = SimpleNamespace(id=str(uuid4()), first_name='Bench', last_name='Owner', email='bench@example.com')
+    amenities = [SimpleNamespace(id=str(uuid4()), name=name) for name in ('WiFi', 'Pool', 'Air conditioning')]
+    return [SimpleNamespace(
+        id=str(uuid4()), title=f'Place {i}', description='Quiet flat with a sunny terrace near the harbour. ' * 4,
+        price=round(10 + i % 490 + 0.5, 2), latitude=43.29 + i / 1e5, longitude=5.37 - i / 1e5,
+        owner=owner, amenities=amenities, review_count=i % 40, average_rating=3.5 + i % 3 / 2,
+        rating_histogram={'1': 0, '2': 1, '3': 4, '4': 10, '5': i % 25},
+        created_at=now - timedelta(minutes=i), updated_at=now - timedelta(seconds=i)
+    ) for i in range(count)]
+
+
+def timed(function, runs):
+    """Run ``function`` ``runs`` times; return (median ms, p95 ms)."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[max(int(len(samples) * 0.95) - 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    items = summaries(args.places)
+    # The model as it was before, with flask-restx formatting the timestamps
+    restx_model = dict(place_response_model, created_at=fields.DateTime(), updated_at=fields.DateTime())
+    encoders = {'restx': (restx_model, lambda data: json.dumps(data).encode('utf-8')),
+                'json': (place_response_model, make_dumps('json'))}
+    if orjson is not None:
+        encoders['orjson'] = (place_response_model, make_dumps('orjson'))
+    else:
+        print("orjson is not installed; timing the stdlib encoders only")
+
+    print(f"{'encoder':<8} {'step':<8} {'median ms':>10} {'p95 ms':>10} {'bytes':>10}")
+    for name, (model, dumps) in encoders.items():
+        marshalled = marshal(items, model)
+        size = len(dumps(marshalled))
+        for step, function in (('marshal', lambda: marshal(items, model)),
+                               ('encode', lambda: dumps(marshalled)),
+                               ('total', lambda: dumps(marshal(items, model)))):
+            median, p95 = timed(function, args.runs)
+            print(f"{name:<8} {step:<8} {median:>10.2f} {p95:>10.2f} {size:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Time place full-text searches against a LIKE scan of the same columns.
+
+Seeds a SQLite file from the models' metadata (which creates the FTS5
+index and its triggers), then runs each query ``--runs`` times through the
+statement the repository uses and through ``title LIKE '%word%' OR
+description LIKE '%word%'``, and prints median and p95 latencies. Pass
+``--uri`` to run the full-text side against MySQL's FULLTEXT index.
+
+The LIKE scan is unranked and stops at the first ``--limit`` hits, so it is
+only competitive for frequent words; rare words and multi-word queries
+make it read the whole table, while the ranked search reads only the
+posting lists of the query words.
+
+Usage (from part3/):
+    python benchmarks/bench_search.py --places 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, or_, select  # noqa: E402
+from app.extensions import db  # noqa: E402
+import app.models  # noqa: E402,F401  (registers the tables on db.metadata)
+from app.persistence.text_search import ranked_place_ids  # noqa: E402
+
+WORDS = ('harbour loft garden flat mountain chalet seaside villa studio cottage quiet sunny '
+         'terrace pool view central modern rustic cosy spacious bright family historic old town '
+         'beach river lake forest balcony fireplace parking kitchen market station').split()
+# Filler words so that, as in real listings, each query word is rare
+FILLER = [''.join(random.choices('bcdfghklmnprstvz', k=3)) + ''.join(random.choices('aeiou', k=2))
+          for _ in range(5000)]
+VOCABULARY = WORDS + FILLER
+QUERIES = ('harbour', 'sea', 'quiet garden', 'chal', 'historic old town', 'fireplace balcony lake')
+BATCH = 10000
+
+
+def seed(engine, places):
+    """Insert one owner and ``places`` places with random word titles and descriptions."""
+    tables = db.metadata.tables
+    now = datetime.utcnow()
+    owner_id = str(uuid4())
+    with engine.begin() as conn:
+        conn.execute(tables['users'].insert(), {
+            'id': owner_id, 'first_name': 'Bench', 'last_name': 'Owner', 'email': 'bench@example.com',
+            'password': 'x', 'is_admin': False, 'created_at': now, 'updated_at': now})
+    for start in range(0, places, BATCH):
+        with engine.begin() as conn:
+            conn.execute(tables['places'].insert(), [
+                {'id': str(uuid4()), 'title': ' '.join(random.choices(VOCABULARY, k=4)).capitalize(),
+                 'description': ' '.join(random.choices(VOCABULARY, k=40)), 'user_id': owner_id,
+                 'price': 100.0, 'latitude': 0.0, 'longitude': 0.0, 'created_at': now, 'updated_at': now}
+                for _ in range(min(BATCH, places - start))
+            ])
+
+
+def like_scan(places, query):
+    """Baseline without an index: every word as a substring of either column."""
+    return select(places.c.id).where(*(
+        or_(places.c.title.like(f'%{word}%'), places.c.description.like(f'%{word}%'))
+        for word in query.split()
+    ))
+
+
+def timed(conn, statement, runs):
+    """Run ``statement`` ``runs`` times; return (median ms, p95 ms, rows)."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = conn.execute(statement).all()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=20, help='page size of the ranked search')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--uri', help='database to use instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    engine = create_engine(args.uri or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_search.db'))
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    start = time.perf_counter()
+    seed(engine, args.places)
+    print(f"seeded {args.places} places (index maintained by triggers) in {time.perf_counter() - start:.1f}s")
+
+    places = db.metadata.tables['places']
+    print(f"{'query':<24} {'method':<10} {'median ms':>10} {'p95 ms':>10} {'rows':>8}")
+    with engine.connect() as conn:
+        for query in QUERIES:
+            hits = ranked_place_ids(engine.dialect.name, places, query).subquery()
+            ranked = select(hits.c.id).order_by(hits.c.score, hits.c.id).limit(args.limit)
+            for method, statement in (('fulltext', ranked), ('like', like_scan(places, query).limit(args.limit))):
+                median, p95, rows = timed(conn, statement, args.runs)
+                print(f"{query:<24} {method:<10} {median:>10.2f} {p95:>10.2f} {rows:>8}")
+    db.metadata.drop_all(engine)
+
+
+if __name__ == '__main__':
+    main()
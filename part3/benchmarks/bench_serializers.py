@@ -0,0 +1,44 @@
+"""Time compiled serializers against flask-restx's ``marshal``.
+
+Serializes ``--places`` in-memory place summaries (see bench_json.py) and
+as many users, with ``marshal`` and with the functions ``compile_model``
+generates, checks that both give the same output, and prints median and
+p95 latencies per list.
+
+Usage (from part3/):
+    python benchmarks/bench_serializers.py --places 10000
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_restx import marshal  # noqa: E402
+from app.api.serializers import compile_model  # noqa: E402
+from app.api.v1.places import place_response_model  # noqa: E402
+from app.api.v1.users import user_response_model  # noqa: E402
+from bench_json import summaries, timed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    places = summaries(args.places)
+    users = [place.owner for place in places]
+    print(f"{'model':<16} {'method':<10} {'median ms':>10} {'p95 ms':>10}")
+    for name, model, items in (('PlaceResponse', place_response_model, places),
+                               ('UserResponse', user_response_model, users)):
+        serialize = compile_model(model)
+        assert [serialize(item) for item in items] == marshal(items, model)
+        for method, function in (('marshal', lambda: marshal(items, model)),
+                                 ('compiled', lambda: [serialize(item) for item in items])):
+            median, p95 = timed(function, args.runs)
+            print(f"{name:<16} {method:<10} {median:>10.2f} {p95:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
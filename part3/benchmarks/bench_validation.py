@@ -0,0 +1,97 @@
+"""Measure POST throughput and the cost of validating a payload.
+
+Sends ``--requests`` POSTs to /api/v1/places/, then as many PUTs to
+one of the places, through the Flask test client (an admin token, a
+temporary SQLite file) and prints requests per second.
+``--restx-validate`` turns on flask-restx's jsonschema check of
+``@api.expect`` payloads as well, to show what validating every field a
+second time costs.
+
+Then times validating one place payload: with the compiled
+``Place.SCHEMA`` validator, and with the jsonschema validator flask-restx
+builds from ``place_model``.
+
+Usage (from part3/):
+    python benchmarks/bench_validation.py --requests 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from jsonschema import Draft4Validator  # noqa: E402
+from app import create_app  # noqa: E402
+from app.api.v1.places import place_model  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.place import Place  # noqa: E402
+from app.services import facade  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+PLACE = {'title': 'Harbour loft', 'description': 'Quiet flat near the harbour', 'price': 120.5,
+         'latitude': 43.296482, 'longitude': 5.36978, 'amenities': []}
+
+
+def post_throughput(args):
+    """POST and PUT places ``args.requests`` times each; return requests per second."""
+    uri = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_validation.db')
+    config = type('BenchConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': uri, 'RESTX_VALIDATE': args.restx_validate,
+        # The API puts a dict in the token's subject
+        'JWT_VERIFY_SUB': False
+    })
+    app = create_app(config)
+    results = {}
+    with app.app_context():
+        db.create_all()
+        admin = facade.create_user({'first_name': 'Bench', 'last_name': 'Admin', 'email': 'admin@example.com',
+                                    'password': 'password123', 'is_admin': True})
+        headers = {'Authorization': 'Bearer ' + create_access_token(identity={'id': admin.id, 'is_admin': True})}
+        client = app.test_client()
+        start = time.perf_counter()
+        for i in range(args.requests):
+            response = client.post('/api/v1/places/', json=dict(PLACE, title=f'Place {i}'), headers=headers)
+            assert response.status_code == 201, response.get_json()
+        results['POST /api/v1/places/'] = args.requests / (time.perf_counter() - start)
+
+        path = f"/api/v1/places/{response.get_json()['id']}"
+        start = time.perf_counter()
+        for i in range(args.requests):
+            response = client.put(path, json=dict(PLACE, price=float(i)), headers=headers)
+            assert response.status_code == 200, response.get_json()
+        results['PUT /api/v1/places/<id>'] = args.requests / (time.perf_counter() - start)
+        db.drop_all()
+    return results
+
+
+def validation_cost(runs):
+    """Return microseconds per place payload for each validator."""
+    schema = Draft4Validator(place_model.__schema__)
+    timings = {}
+    for name, validate in (('compiled', Place.SCHEMA.validate), ('jsonschema', schema.validate)):
+        start = time.perf_counter()
+        for _ in range(runs):
+            validate(PLACE)
+        timings[name] = (time.perf_counter() - start) / runs * 1e6
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--runs', type=int, default=100000, help='payloads validated per validator')
+    parser.add_argument('--restx-validate', action='store_true',
+                        help="also check payloads against the @api.expect models' JSON schema")
+    args = parser.parse_args()
+
+    for request, rate in post_throughput(args).items():
+        print(f"{request:<27} {rate:>8.0f} req/s")
+    for name, micros in validation_cost(args.runs).items():
+        print(f"validate place ({name:<10}) {micros:>8.2f} us")
+
+
+if __name__ == '__main__':
+    main()
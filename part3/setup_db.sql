@@ -9,7 +9,11 @@ CREATE TABLE IF NOT EXISTS users (
     last_name VARCHAR(255) NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
     password VARCHAR(255) NOT NULL,
-    is_admin BOOLEAN DEFAULT FALSE
+    is_admin BOOLEAN DEFAULT FALSE,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX ix_users_created_at_id (created_at, id),
+    INDEX ix_users_updated_at (updated_at)
 );
 
 -- Create Place table
@@ -20,8 +24,25 @@ CREATE TABLE IF NOT EXISTS places (
     price DECIMAL(10, 2) NOT NULL,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
-    owner_id CHAR(36),
-    FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
+    user_id CHAR(36) NOT NULL,
+    -- Rating aggregates maintained alongside the reviews
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_1 INT NOT NULL DEFAULT 0,
+    rating_2 INT NOT NULL DEFAULT 0,
+    rating_3 INT NOT NULL DEFAULT 0,
+    rating_4 INT NOT NULL DEFAULT 0,
+    rating_5 INT NOT NULL DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    INDEX ix_places_user_id (user_id),
+    INDEX ix_places_price (price),
+    INDEX ix_places_latitude_longitude (latitude, longitude),
+    -- Full-text search over titles and descriptions
+    FULLTEXT INDEX ix_places_fulltext (title, description),
+    INDEX ix_places_created_at_id (created_at, id),
+    INDEX ix_places_updated_at (updated_at)
 );
 
 -- Create Review table
@@ -31,15 +52,25 @@ CREATE TABLE IF NOT EXISTS reviews (
     rating INT CHECK (rating BETWEEN 1 AND 5) NOT NULL,
     user_id CHAR(36) NOT NULL,
     place_id CHAR(36) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
-    CONSTRAINT unique_review UNIQUE (user_id, place_id)
+    -- Also serves lookups by user_id (leftmost column)
+    CONSTRAINT unique_review UNIQUE (user_id, place_id),
+    INDEX ix_reviews_place_id (place_id),
+    INDEX ix_reviews_created_at_id (created_at, id),
+    INDEX ix_reviews_updated_at (updated_at)
 );
 
 -- Create Amenity table
 CREATE TABLE IF NOT EXISTS amenities (
     id CHAR(36) PRIMARY KEY,
-    name VARCHAR(255) UNIQUE NOT NULL
+    name VARCHAR(255) UNIQUE NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX ix_amenities_created_at_id (created_at, id),
+    INDEX ix_amenities_updated_at (updated_at)
 );
 
 -- Create Many-to-Many relation table between Place and Amenity
@@ -51,6 +82,44 @@ CREATE TABLE IF NOT EXISTS place_amenity (
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
 
+-- Create the denormalized place read model (rebuilt by
+-- "flask --app run rebuild-place-summaries")
+CREATE TABLE IF NOT EXISTS place_summaries (
+    id CHAR(36) PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    price FLOAT NOT NULL DEFAULT 0,
+    latitude FLOAT NOT NULL DEFAULT 0,
+    longitude FLOAT NOT NULL DEFAULT 0,
+    geohash CHAR(12) NOT NULL DEFAULT '',
+    unit_x DOUBLE NOT NULL DEFAULT 0,
+    unit_y DOUBLE NOT NULL DEFAULT 0,
+    unit_z DOUBLE NOT NULL DEFAULT 0,
+    owner_id CHAR(36) NOT NULL,
+    owner_first_name VARCHAR(255),
+    owner_last_name VARCHAR(255),
+    owner_email VARCHAR(255),
+    amenities JSON NOT NULL,
+    rating_histogram JSON NOT NULL,
+    review_count INT NOT NULL DEFAULT 0,
+    average_rating FLOAT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (id) REFERENCES places(id) ON DELETE CASCADE,
+    INDEX ix_place_summaries_created_at_id (created_at, id),
+    INDEX ix_place_summaries_updated_at (updated_at),
+    INDEX ix_place_summaries_price_id (price, id),
+    INDEX ix_place_summaries_owner_id (owner_id),
+    INDEX ix_place_summaries_geohash (geohash)
+);
+
+-- Create the per-table change counters behind the list ETags
+CREATE TABLE IF NOT EXISTS table_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Insert Admin User
 INSERT INTO users (id, first_name, last_name, email, password, is_admin) VALUES
 ('36c9050e-ddd3-4c3b-9731-9f487208bbc1', 'Admin', 'HBnB', 'admin@hbnb.io', '$2b$12$saltsalt.pXpXajXlQzQKuO1UmOmc5qpFgZ1kqed9zPq5G7Jv5B7m', TRUE);
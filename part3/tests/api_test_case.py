@@ -0,0 +1,35 @@
+"""Shared fixture for the endpoint tests that run on the SQLite TestingConfig database."""
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.services import facade
+
+class ApiTestCase(unittest.TestCase):
+    """A fresh database with one user (``self.user``), an app context and a test client."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        # Token identities are {'id', 'is_admin'} dicts rather than string subjects
+        self.app.config['JWT_VERIFY_SUB'] = False
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.user = facade.create_user({
+            "first_name": "Test",
+            "last_name": "Owner",
+            "email": "test.owner@example.com",
+            "password": "password123"
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def auth_headers(self, user=None, is_admin=False):
+        """Authorization header with a token for ``user``, ``self.user`` by default."""
+        token = create_access_token(identity={"id": (user or self.user).id, "is_admin": is_admin})
+        return {"Authorization": f"Bearer {token}"}
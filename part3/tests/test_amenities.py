@@ -1,6 +1,8 @@
 import unittest
 import json
 from app import create_app
+from api_test_case import ApiTestCase
+from app.services import facade
 
 class TestAmenityEndpoints(unittest.TestCase):
 
@@ -124,6 +126,35 @@ class TestAmenityEndpoints(unittest.TestCase):
         second_data = json.loads(second_response.data)
         self.assertNotEqual(first_data['id'], second_data['id'])
 
+class TestAmenityApi(ApiTestCase):
+    """Amenity endpoints against the SQLite TestingConfig database."""
+
+    def test_list_endpoint_next_cursor_header(self):
+        """Test that list endpoints advertise the next page in a header"""
+        facade.create_amenities([{"name": f"Amenity {i}"} for i in range(3)])
+        client = self.app.test_client()
+        response = client.get('/api/v1/amenities/?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+        cursor = response.headers['X-Next-Cursor']
+
+        response = client.get(f'/api/v1/amenities/?limit=2&cursor={cursor}')
+        self.assertEqual(len(response.get_json()), 1)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_amenity_detail_and_create_return_json(self):
+        """Test the amenity detail GET without ?fields= and the admin POST"""
+        amenity = facade.create_amenity({"name": "Wifi"})
+        response = self.client.get(f'/api/v1/amenities/{amenity.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['name'], "Wifi")
+        self.assertEqual(self.client.get('/api/v1/amenities/missing').status_code, 404)
+
+        response = self.client.post('/api/v1/amenities/', json={"name": "Pool"},
+                                    headers=self.auth_headers(is_admin=True))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['name'], "Pool")
+
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
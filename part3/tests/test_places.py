@@ -1,6 +1,22 @@
 import unittest
 import json
 from app import create_app
+from api_test_case import ApiTestCase
+import zlib
+from datetime import datetime
+from uuid import UUID
+from flask_restx import marshal
+from sqlalchemy import event
+from app.extensions import db
+from app.services import facade
+from app.persistence import geo
+from app.api.representations import make_dumps
+from app.api.serializers import compile_model
+from app.api.v1.amenities import amenity_response_model
+from app.api.v1.places import place_response_model, place_search_model
+from app.api.v1.reviews import review_output_model
+from app.api.v1.users import user_response_model
+from app.models.place_summary import PlaceSummary
 
 class TestPlaceEndpoints(unittest.TestCase):
 
@@ -225,6 +241,373 @@ class TestPlaceEndpoints(unittest.TestCase):
         self.assertIn(self.amenity_id, amenity_ids)
         self.assertIn(second_amenity_id, amenity_ids)
 
+class TestPlaceReadEndpoints(ApiTestCase):
+    """Place endpoints against the SQLite TestingConfig database, read model included."""
+
+    def test_stream_places_ndjson(self):
+        """Test streaming the full place list as newline-delimited JSON"""
+        facade.create_places([
+            {"title": f"Place {i}", "owner_id": self.user.id} for i in range(3)
+        ])
+        response = self.app.test_client().get(
+            '/api/v1/places/', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual([line['title'] for line in lines], ["Place 0", "Place 1", "Place 2"])
+
+    def test_streamed_lists_stay_streamed_after_hooks(self):
+        """Test that the after-request hooks do not buffer a streamed list"""
+        facade.create_places([
+            {"title": f"Place {i}", "owner_id": self.user.id} for i in range(3)
+        ])
+        for path, headers in (('/api/v1/places/?stream=true', {}),
+                              ('/api/v1/places/', {'Accept': 'application/x-ndjson'})):
+            with self.app.test_request_context(path, headers=headers):
+                response = self.app.full_dispatch_request()
+                self.assertTrue(response.is_streamed)
+                self.assertIn('ETag', response.headers)
+                self.assertNotIn('Content-Length', response.headers)
+                response.close()
+
+    def test_place_list_reads_one_range_from_summaries(self):
+        """Test that a place page is a single query whatever its size"""
+        amenity = facade.create_amenity({"name": "WiFi"})
+        facade.create_places([
+            {"title": f"Place {i}", "owner_id": self.user.id, "amenities": [amenity.id]}
+            for i in range(5)
+        ])
+        db.session.expire_all()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            response = self.app.test_client().get('/api/v1/places/')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        data = response.get_json()
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[0]['owner']['id'], self.user.id)
+        self.assertEqual(data[0]['amenities'][0]['name'], "WiFi")
+        # Besides the ETag's counter lookup
+        self.assertEqual(len([s for s in statements if 'table_versions' not in s]), 1)
+
+    def test_place_summaries_follow_writes(self):
+        """Test that the place read model is refreshed by related writes"""
+        amenity = facade.create_amenity({"name": "WiFi"})
+        place = facade.create_place({"title": "Place", "owner_id": self.user.id,
+                                     "amenities": [amenity.id]})
+        reviewer = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane.doe@example.com", "password": "password123"
+        })
+        facade.create_review({"text": "Great", "rating": 4, "user_id": reviewer.id, "place_id": place.id})
+        facade.update_user(self.user.id, {"first_name": "Renamed"})
+        facade.update_amenity(amenity.id, {"name": "Fast WiFi"})
+
+        client = self.app.test_client()
+        data = client.get(f'/api/v1/places/{place.id}').get_json()
+        self.assertEqual(data['owner']['first_name'], "Renamed")
+        self.assertEqual(data['amenities'], [{"id": amenity.id, "name": "Fast WiFi"}])
+        self.assertEqual(data['review_count'], 1)
+        self.assertEqual(data['average_rating'], 4.0)
+
+        db.session.execute(PlaceSummary.__table__.delete())
+        db.session.commit()
+        self.assertEqual(facade.rebuild_place_summaries(), 1)
+        self.assertEqual(client.get(f'/api/v1/places/{place.id}').get_json()['title'], "Place")
+
+        facade.delete_amenity(amenity.id)
+        self.assertEqual(facade.get_place_summary(place.id).amenities, [])
+
+    def test_create_place_rejects_non_finite_coordinates(self):
+        """Test that NaN and infinite numbers are a 400, not a database error"""
+        for literal in ('NaN', 'Infinity', '-Infinity'):
+            response = self.client.post('/api/v1/places/', headers=self.auth_headers(),
+                                        data=f'{{"title": "Loft", "latitude": {literal}}}',
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(facade.get_places(), [])
+
+    def test_update_place_allows_listed_fields_and_amenities(self):
+        """Test that a place PUT sets amenities and refuses fields outside the allow-list"""
+        wifi = facade.create_amenity({"name": "Wifi"})
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        url = f'/api/v1/places/{place.id}'
+
+        response = self.client.put(url, headers=self.auth_headers(), json={"title": "Loft", "amenities": [wifi.id]})
+        self.assertEqual(response.status_code, 200)
+        db.session.expire_all()
+        self.assertEqual([amenity.name for amenity in facade.get_place(place.id).amenities], ["Wifi"])
+        self.assertEqual(facade.get_place_summary(place.id).amenities, [{"id": wifi.id, "name": "Wifi"}])
+
+        self.assertEqual(self.client.put(url, headers=self.auth_headers(),
+                                         json={"amenities": ["missing"]}).status_code, 400)
+        response = self.client.put(url, headers=self.auth_headers(), json={"review_count": 99})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(facade.get_place(place.id).review_count, 0)
+
+    def test_place_list_filters_and_sorts_in_sql(self):
+        """Test price/owner filters and sorted keyset pages on the place list"""
+        other = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane.doe@example.com", "password": "password123"
+        })
+        facade.create_places([{"title": f"Place {price}", "price": price, "owner_id": owner.id}
+                              for price, owner in ((50, self.user), (120, other), (80, self.user),
+                                                   (200, self.user), (80, other))])
+        client = self.app.test_client()
+
+        response = client.get('/api/v1/places/?price_min=60&price_max=150&sort=-price&limit=2')
+        self.assertEqual([p['price'] for p in response.get_json()], [120.0, 80.0])
+        rest = client.get(f"/api/v1/places/?price_min=60&price_max=150&sort=-price&limit=2"
+                          f"&cursor={response.headers['X-Next-Cursor']}").get_json()
+        self.assertEqual([p['price'] for p in rest], [80.0])
+        for other_sort in ('price', 'updated_at'):
+            self.assertEqual(client.get(f"/api/v1/places/?sort={other_sort}&limit=2"
+                                        f"&cursor={response.headers['X-Next-Cursor']}").status_code, 400)
+        self.assertEqual(client.get('/api/v1/places/?limit=0').status_code, 400)
+
+        data = client.get(f'/api/v1/places/?owner_id={self.user.id}&sort=price').get_json()
+        self.assertEqual([p['price'] for p in data], [50.0, 80.0, 200.0])
+        self.assertEqual(client.get('/api/v1/places/?sort=description').status_code, 400)
+        self.assertEqual(client.get('/api/v1/places/?price_min=cheap').status_code, 400)
+        with self.assertRaises(ValueError):
+            facade.place_summary_repo.find(where={'price__like': 10})
+
+    def test_place_list_filters_on_amenity_sets(self):
+        """Test ?amenities= through the bitmap index, kept in step with writes"""
+        wifi, pool, ac = facade.create_amenities([{"name": n} for n in ("WiFi", "Pool", "AC")])['created']
+        sets = {"Bare": [], "Connected": [wifi], "Resort": [wifi, pool, ac], "Villa": [wifi, pool]}
+        facade.create_places([{"title": title, "owner_id": self.user.id, "amenities": [a.id for a in amenities]}
+                              for title, amenities in sets.items()])
+        client = self.app.test_client()
+        titles = lambda query: [p['title'] for p in client.get(f'/api/v1/places/?{query}').get_json()]
+
+        self.assertEqual(titles(f"amenities={wifi.id},{pool.id}"), ["Resort", "Villa"])
+        facade.create_place({"title": "Lodge", "owner_id": self.user.id, "amenities": [pool.id, wifi.id]})
+        facade.delete_amenity(ac.id)
+        self.assertEqual(titles(f"amenities={pool.id},{wifi.id}"), ["Resort", "Villa", "Lodge"])
+        self.assertEqual(titles(f"amenities={ac.id}"), [])
+
+        # Large matches are filtered while scanning instead of as id IN (...)
+        self.app.config['AMENITY_FILTER_MAX_IDS'] = 0
+        response = client.get(f"/api/v1/places/?amenities={wifi.id}&limit=2")
+        self.assertEqual([p['title'] for p in response.get_json()], ["Connected", "Resort"])
+        self.assertEqual(titles(f"amenities={wifi.id}&limit=2&cursor={response.headers['X-Next-Cursor']}"),
+                         ["Villa", "Lodge"])
+
+    def test_place_search_by_radius_and_bbox(self):
+        """Test that geo search filters on distance and pages nearest first"""
+        spots = {"Vieux-Port": (43.2951, 5.3744), "Notre-Dame": (43.2840, 5.3713),
+                 "Cassis": (43.2148, 5.5372), "Paris": (48.8566, 2.3522)}
+        facade.create_places([{"title": title, "owner_id": self.user.id, "latitude": lat, "longitude": lon}
+                              for title, (lat, lon) in spots.items()])
+        client = self.app.test_client()
+
+        response = client.get('/api/v1/places/search?lat=43.2965&lon=5.3698&radius_km=20&limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['title'] for p in response.get_json()], ["Vieux-Port", "Notre-Dame"])
+        rest = client.get('/api/v1/places/search?lat=43.2965&lon=5.3698&radius_km=20&limit=2'
+                          f"&cursor={response.headers['X-Next-Cursor']}").get_json()
+        self.assertEqual([p['title'] for p in rest], ["Cassis"])
+        self.assertEqual(rest[0]['distance_km'], round(geo.haversine_km(43.2965, 5.3698, *spots["Cassis"]), 3))
+
+        # Ordering, the cursor and the page size are applied by the database
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            client.get('/api/v1/places/search?lat=43.2965&lon=5.3698&radius_km=500&limit=1')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        search_sql = [s for s in statements if 'place_summaries' in s][-1]
+        self.assertIn('ORDER BY', search_sql)
+        self.assertIn('LIMIT', search_sql)
+
+        data = client.get('/api/v1/places/search?bbox=2,48,3,49').get_json()
+        self.assertEqual([p['title'] for p in data], ["Paris"])
+        self.assertEqual(client.get('/api/v1/places/search?lat=43&lon=5').status_code, 400)
+        self.assertEqual(client.get('/api/v1/places/search?bbox=5,43,4,44').status_code, 400)
+
+    def test_place_text_search_follows_place_writes(self):
+        """Test that full-text search ranks title hits first and tracks writes"""
+        facade.create_places([
+            {"title": "Harbour loft", "description": "Quiet street", "owner_id": self.user.id},
+            {"title": "Garden flat", "description": "Five minutes from the harbour", "owner_id": self.user.id},
+            {"title": "Mountain chalet", "description": "Ski in, ski out", "owner_id": self.user.id}
+        ])
+        client = self.app.test_client()
+
+        response = client.get('/api/v1/places/search?q=harb&limit=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['title'] for p in response.get_json()], ["Harbour loft"])
+        rest = client.get(f"/api/v1/places/search?q=harb&limit=1&cursor={response.headers['X-Next-Cursor']}")
+        self.assertEqual([p['title'] for p in rest.get_json()], ["Garden flat"])
+        self.assertNotIn('X-Next-Cursor', rest.headers)
+
+        chalet = facade.get_place_summaries_page()[0][2]
+        facade.update_place(chalet.id, {"title": "Seaside chalet"})
+        titles = lambda q: [p['title'] for p in client.get(f'/api/v1/places/search?q={q}').get_json()]
+        self.assertEqual(titles("seaside chalet"), ["Seaside chalet"])
+        self.assertEqual(titles("mountain"), [])
+        facade.delete_place(chalet.id)
+        self.assertEqual(titles("chalet"), [])
+        self.assertEqual(client.get('/api/v1/places/search?q=%2A%2A').status_code, 400)
+        self.assertEqual(client.get('/api/v1/places/search?q=loft&lat=1').status_code, 400)
+
+    def test_sparse_fieldsets_trim_responses_and_columns(self):
+        """Test that ?fields= trims the response and the columns read"""
+        place = facade.create_place({"title": "Loft", "description": "Long text", "price": 80.0,
+                                     "owner_id": self.user.id})
+        db.session.expire_all()
+        client = self.app.test_client()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            data = client.get('/api/v1/places/?fields=price,id,title').get_json()
+            detail = client.get(f'/api/v1/places/{place.id}?fields=owner').get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(data, [{"id": place.id, "title": "Loft", "price": 80.0}])
+        self.assertEqual(detail, {"owner": {"id": self.user.id, "first_name": "Test",
+                                            "last_name": "Owner", "email": "test.owner@example.com"}})
+        self.assertFalse([s for s in statements if 'place_summaries.description' in s])
+        self.assertEqual(client.get('/api/v1/places/?fields=title,secret').status_code, 400)
+
+        # Reads without fields still return the deferred columns
+        self.assertEqual(client.get(f'/api/v1/places/{place.id}').get_json()['description'], "Long text")
+
+    def test_batch_endpoint_reports_each_item(self):
+        """Test that a batch writes the valid items and reports the others"""
+        other = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane.doe@example.com", "password": "password123"
+        })
+        mine = facade.create_place({"title": "Mine", "owner_id": self.user.id})
+        theirs = facade.create_place({"title": "Theirs", "owner_id": other.id})
+        client = self.app.test_client()
+        response = client.post('/api/v1/places/batch', headers=self.auth_headers(), json={
+            "create": [{"title": "New", "price": 50.0}, {"title": "", "price": 10.0}],
+            "update": [{"id": mine.id, "price": 99.0}, {"id": theirs.id, "price": 1.0},
+                       {"id": mine.id, "owner_id": other.id}],
+            "delete": ["missing", mine.id]
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([item['status'] for item in data['create']], [201, 400])
+        self.assertEqual([item['status'] for item in data['update']], [200, 403, 400])
+        self.assertEqual([item['status'] for item in data['delete']], [404, 204])
+        db.session.expire_all()
+        self.assertEqual(facade.get_place_summary(data['create'][0]['id']).title, "New")
+        self.assertIsNone(facade.get_place(mine.id))
+        self.assertEqual(facade.get_place(theirs.id).price, 0.0)
+
+        self.app.config['BATCH_MAX_SIZE'] = 1
+        response = client.post('/api/v1/places/batch', headers=self.auth_headers(),
+                               json={"delete": [theirs.id, mine.id]})
+        self.assertEqual(response.status_code, 413)
+
+    def test_conditional_get_answers_304s(self):
+        """Test list ETags from table counters and detail ETag/Last-Modified revalidation"""
+        client = self.app.test_client()
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        first = client.get('/api/v1/places/')
+        etag = first.headers['ETag']
+        self.assertEqual(first.headers['Cache-Control'], 'no-cache')
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            self.assertEqual(client.get('/api/v1/places/', headers={'If-None-Match': etag}).status_code, 304)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertFalse([s for s in statements if 'place_summaries' in s])
+        self.assertNotEqual(client.get('/api/v1/places/?limit=1').headers['ETag'], etag)
+
+        # Savepoints inside a unit of work bump the counter once, on the outer commit
+        with facade.transaction():
+            facade.create_places([{"title": "Chalet", "owner_id": self.user.id}])
+            self.assertEqual(client.get('/api/v1/places/', headers={'If-None-Match': etag}).status_code, 304)
+        self.assertEqual(client.get('/api/v1/places/', headers={'If-None-Match': etag}).status_code, 200)
+        self.assertEqual(facade.get_collection_version(['place_summaries'])[0], 'place_summaries:2')
+
+        detail = client.get(f'/api/v1/places/{place.id}')
+        self.assertIn('Last-Modified', detail.headers)
+        self.assertEqual(client.get(f'/api/v1/places/{place.id}',
+                                    headers={'If-None-Match': detail.headers['ETag']}).status_code, 304)
+        self.assertEqual(client.get(f'/api/v1/places/{place.id}',
+                                    headers={'If-Modified-Since': detail.headers['Last-Modified']}).status_code, 304)
+        facade.update_place(place.id, {"title": "Renovated loft"})
+        self.assertEqual(client.get(f'/api/v1/places/{place.id}',
+                                    headers={'If-None-Match': detail.headers['ETag']}).status_code, 200)
+
+    def test_responses_are_compressed_when_large(self):
+        """Test gzip negotiation, the size threshold, streamed lists and revalidation"""
+        client = self.app.test_client()
+        gzip = {'Accept-Encoding': 'gzip, deflate;q=0.5'}
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        self.assertNotIn('Content-Encoding', client.get(f'/api/v1/places/{place.id}', headers=gzip).headers)
+
+        facade.create_places([{"title": f"Place {i}", "owner_id": self.user.id, "description": "Quiet " * 20}
+                              for i in range(20)])
+        plain = client.get('/api/v1/places/')
+        response = client.get('/api/v1/places/', headers=gzip)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(zlib.decompress(response.data, 31), plain.data)
+        self.assertEqual(response.headers['ETag'], plain.headers['ETag'][:-1] + '-gzip"')
+        self.assertEqual(client.get('/api/v1/places/', headers={'If-None-Match': response.headers['ETag'],
+                                                                **gzip}).status_code, 304)
+
+        # The second identical page reuses the cached compressed body
+        hits = self.app.extensions['compression_cache'].hits
+        self.assertEqual(client.get('/api/v1/places/', headers=gzip).data, response.data)
+        self.assertEqual(self.app.extensions['compression_cache'].hits, hits + 1)
+
+        streamed = client.get('/api/v1/places/?stream=true', headers={'Accept-Encoding': 'deflate'})
+        self.assertEqual(streamed.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(len(json.loads(zlib.decompress(streamed.data))), 21)
+
+    def test_json_encoders_write_datetimes_and_uuids(self):
+        """Test that both encoders agree, and that responses carry isoformat timestamps"""
+        value = {'at': datetime(2024, 5, 1, 12, 30, 0, 250), 'id': UUID(int=1), 'name': "Café"}
+        encoded = {name: make_dumps(name)(value) for name in ('json', 'auto')}
+        self.assertEqual(json.loads(encoded['json']), json.loads(encoded['auto']))
+        self.assertEqual(json.loads(encoded['json'])['at'], "2024-05-01T12:30:00.000250")
+        with self.assertRaises(ValueError):
+            make_dumps('yaml')
+
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        data = self.app.test_client().get(f'/api/v1/places/{place.id}').get_json()
+        self.assertEqual(data['created_at'], place.created_at.isoformat())
+
+    def test_compiled_serializers_match_marshal(self):
+        """Test that every compiled response model serializes like marshal()"""
+        amenity = facade.create_amenity({"name": "WiFi"})
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id, "amenities": [amenity.id]})
+        reviewer = facade.create_user({"first_name": "Rev", "last_name": "Iewer",
+                                       "email": "rev@example.com", "password": "password123"})
+        review = facade.create_review({"text": "Nice", "rating": 4, "place_id": place.id, "user_id": reviewer.id})
+        summary = facade.get_place_summary(place.id)
+        cases = [(place_response_model, summary), (place_search_model, summary), (place_response_model, None),
+                 (user_response_model, self.user), (user_response_model, self.user.to_dict()),
+                 (amenity_response_model, amenity), (review_output_model, review)]
+        for model, obj in cases:
+            self.assertEqual(compile_model(model)(obj), marshal(obj, model), model.name)
+
+    def test_place_list_by_ids(self):
+        """Test ?ids= returns the places in the order asked and names the misses"""
+        places = [facade.create_place({"title": f"Place {i}", "owner_id": self.user.id}) for i in range(3)]
+        client = self.app.test_client()
+        response = client.get(f'/api/v1/places/?ids={places[2].id},nope,{places[1].id}&fields=id,title')
+        self.assertEqual(response.get_json(), [{"id": places[2].id, "title": "Place 2"},
+                                               {"id": places[1].id, "title": "Place 1"}])
+        self.assertEqual(response.headers['X-Missing-Ids'], "nope")
+        self.assertEqual(client.get(f'/api/v1/places/?ids={places[0].id}&limit=2').status_code, 400)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,393 @@
+import unittest
+import warnings
+from datetime import datetime
+from sqlalchemy.exc import SAWarning
+from app import create_app
+from app.extensions import db
+from app.services import facade
+from app.persistence.bitmap import Bitmap
+from app.persistence.cache import LRUCache
+from app.persistence.routing import ReplicaRouter
+from app.persistence.pool_metrics import pool_stats
+from app.persistence.repository import _insert_unless_exists, _upsert_rows
+from app.persistence.versions import _bump_rows
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.models.place_summary import PlaceSummary
+from config import TestingConfig
+
+class TestRepositoryOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config['BULK_CHUNK_SIZE'] = 2
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.user = facade.create_user({
+            "first_name": "Test",
+            "last_name": "Owner",
+            "email": "test.owner@example.com",
+            "password": "password123"
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_create_amenities_bulk(self):
+        """Test bulk creation of amenities across several chunks"""
+        rows = [{"name": f"Amenity {i}"} for i in range(5)]
+        result = facade.create_amenities(rows)
+        self.assertEqual(len(result['created']), 5)
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(len(facade.get_all_amenities()), 5)
+
+    def test_create_places_bulk_reports_invalid_rows(self):
+        """Test that invalid rows are reported without aborting the batch"""
+        rows = [
+            {"title": "Valid 1", "price": 10.0, "owner_id": self.user.id},
+            {"title": "", "price": 10.0, "owner_id": self.user.id},
+            {"title": "Valid 2", "price": -5.0, "owner_id": self.user.id},
+            {"title": "Valid 3", "price": 20.0, "owner_id": "non-existent-owner-id"},
+            {"title": "Valid 4", "price": 30.0, "owner_id": self.user.id},
+        ]
+        result = facade.create_places(rows)
+        self.assertEqual(len(result['created']), 2)
+        self.assertEqual([error['index'] for error in result['errors']], [1, 2, 3])
+        self.assertEqual(len(facade.get_places()), 2)
+
+    def test_create_places_links_amenities_without_warnings(self):
+        """Test that amenities are linked once the places are in the session"""
+        wifi = facade.create_amenity({"name": "Wifi"})
+        rows = [{"title": f"Place {i}", "owner_id": self.user.id, "amenities": [wifi.id]} for i in range(3)]
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', SAWarning)
+            result = facade.create_places(rows)
+            single = facade.create_place({"title": "Single", "owner_id": self.user.id, "amenities": [wifi.id]})
+        db.session.expire_all()
+        for place in result['created'] + [single]:
+            self.assertEqual([amenity.name for amenity in facade.get_place(place.id).amenities], ["Wifi"])
+
+    def test_create_reviews_bulk(self):
+        """Test bulk creation of reviews with a missing place"""
+        place = facade.create_place({"title": "Place", "owner_id": self.user.id})
+        rows = [
+            {"text": "Great", "rating": 5, "user_id": self.user.id, "place_id": place.id},
+            {"text": "Bad", "rating": 1, "user_id": self.user.id, "place_id": "missing"},
+        ]
+        result = facade.create_reviews(rows)
+        self.assertEqual(len(result['created']), 1)
+        self.assertEqual(result['errors'][0]['index'], 1)
+
+    def test_create_review_rejects_duplicates(self):
+        """Test that a second review of the same place by a user is refused"""
+        place = facade.create_place({"title": "Place", "owner_id": self.user.id})
+        reviewer = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane.doe@example.com", "password": "password123"
+        })
+        review_data = {"text": "Great", "rating": 5, "user_id": reviewer.id, "place_id": place.id}
+        review = facade.create_review(dict(review_data))
+        self.assertEqual(facade.get_review_by_user_and_place(reviewer.id, place.id).id, review.id)
+
+        with self.assertRaises(ValueError):
+            facade.create_review(dict(review_data, text="Again"))
+        self.assertEqual(len(facade.get_all_reviews()), 1)
+
+    def test_portable_insert_ignore_and_upsert(self):
+        """Test the savepoint fallbacks used on dialects without INSERT IGNORE/upserts"""
+        table = Amenity.__table__
+        now = datetime.utcnow()
+        row = {"id": "a1", "name": "Wifi", "created_at": now, "updated_at": now}
+        with facade.transaction():
+            self.assertTrue(_insert_unless_exists(table, row))
+            self.assertFalse(_insert_unless_exists(table, dict(row, name="Again")))
+        self.assertEqual(facade.get_amenity("a1").name, "Wifi")
+
+        with facade.transaction():
+            _upsert_rows(table, [dict(row, name="Fast wifi"), dict(row, id="a2", name="Pool")])
+        db.session.expire_all()
+        self.assertEqual(sorted(amenity.name for amenity in facade.get_all_amenities()), ["Fast wifi", "Pool"])
+
+    def test_portable_table_version_bump(self):
+        """Test the SELECT-then-UPDATE/INSERT counter bump used on dialects without upserts"""
+        now = datetime.utcnow()
+        before = facade.get_collection_version(['amenities', 'users'])[0]
+        self.assertEqual(before, 'amenities:0,users:1')
+        _bump_rows(db.session, ['amenities', 'users'], now)
+        db.session.commit()
+        self.assertEqual(facade.get_collection_version(['amenities', 'users'])[0], 'amenities:1,users:2')
+
+    def test_rating_aggregates_follow_reviews(self):
+        """Test that place rating counters track review create/update/delete"""
+        place = facade.create_place({"title": "Place", "owner_id": self.user.id})
+        reviewers = [facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": f"jane{i}@example.com", "password": "password123"
+        }) for i in range(3)]
+        reviews = [facade.create_review({"text": "Nice", "rating": rating,
+                                         "user_id": reviewer.id, "place_id": place.id})
+                   for reviewer, rating in zip(reviewers, [5, 4, 4])]
+        facade.update_review(reviews[0].id, {"rating": 3})
+        facade.delete_review(reviews[1].id)
+
+        place = facade.get_place(place.id)
+        self.assertEqual(place.review_count, 2)
+        self.assertEqual(place.average_rating, 3.5)
+        self.assertEqual(place.rating_histogram, {1: 0, 2: 0, 3: 1, 4: 1, 5: 0})
+
+        # Corrupt the counters, then rebuild them from the reviews table
+        facade.place_repo.adjust_ratings(place.id, added=[1, 1])
+        self.assertEqual(facade.get_place(place.id).review_count, 4)
+        self.assertEqual(facade.repair_place_ratings(), 1)
+        place = facade.get_place(place.id)
+        self.assertEqual(place.review_count, 2)
+        self.assertEqual(place.rating_histogram, {1: 0, 2: 0, 3: 1, 4: 1, 5: 0})
+
+    def test_delete_user_updates_ratings_and_summaries(self):
+        """Test that deleting a user drops their places and reviews from the aggregates"""
+        host, guest = [facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": f"jane{i}@example.com", "password": "password123"
+        }) for i in range(2)]
+        owned = facade.create_place({"title": "Owned", "owner_id": self.user.id})
+        reviewed = facade.create_place({"title": "Reviewed", "owner_id": host.id})
+        facade.create_review({"text": "Nice", "rating": 5, "user_id": guest.id, "place_id": owned.id})
+        facade.create_review({"text": "Meh", "rating": 2, "user_id": self.user.id, "place_id": reviewed.id})
+        facade.create_review({"text": "Great", "rating": 4, "user_id": guest.id, "place_id": reviewed.id})
+
+        facade.delete_user(self.user.id)
+        db.session.expire_all()
+        self.assertIsNone(facade.get_user(self.user.id))
+        self.assertIsNone(facade.get_place(owned.id))
+        self.assertIsNone(db.session.get(PlaceSummary, owned.id))
+        self.assertEqual(facade.get_place(reviewed.id).rating_histogram, {1: 0, 2: 0, 3: 0, 4: 1, 5: 0})
+        summary = db.session.get(PlaceSummary, reviewed.id)
+        self.assertEqual((summary.review_count, summary.average_rating), (1, 4.0))
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_get_page_walks_all_rows(self):
+        """Test keyset pagination returns every row exactly once"""
+        facade.create_amenities([{"name": f"Amenity {i}"} for i in range(5)])
+        seen, cursor = [], None
+        while True:
+            page, cursor = facade.get_amenities_page(limit=2, cursor=cursor)
+            seen.extend(amenity.id for amenity in page)
+            if cursor is None:
+                break
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_get_page_invalid_cursor(self):
+        """Test that a malformed cursor or an empty page size is rejected"""
+        with self.assertRaises(ValueError):
+            facade.get_amenities_page(cursor="not-a-cursor")
+        with self.assertRaises(ValueError):
+            facade.get_amenities_page(limit=0)
+
+    def test_get_is_cached_and_invalidated(self):
+        """Test that repeated gets hit the cache and updates invalidate it"""
+        amenity = facade.create_amenity({"name": "WiFi"})
+        facade.get_amenity(amenity.id)
+        facade.get_amenity(amenity.id)
+        stats = facade.amenity_repo.cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['size'], 1)
+
+        facade.update_amenity(amenity.id, {"name": "Fast WiFi"})
+        self.assertEqual(facade.amenity_repo.cache_stats()['size'], 0)
+        self.assertEqual(facade.get_amenity(amenity.id).name, "Fast WiFi")
+
+    def test_get_by_attribute_after_email_change(self):
+        """Test that a cached attribute lookup never returns a stale row"""
+        self.assertEqual(facade.get_user_by_email("test.owner@example.com").id, self.user.id)
+        facade.update_user(self.user.id, {"email": "new.owner@example.com"})
+        self.assertIsNone(facade.get_user_by_email("test.owner@example.com"))
+        self.assertEqual(facade.get_user_by_email("new.owner@example.com").id, self.user.id)
+
+    def test_pool_metrics_count_checkouts(self):
+        """Test that pool listeners record checkouts and wait times"""
+        before = pool_stats()['default']['checkouts']
+        facade.get_all_amenities()
+        stats = pool_stats()['default']
+        self.assertGreater(stats['checkouts'], before)
+        self.assertEqual(stats['timeouts'], 0)
+        self.assertIn('checkout_wait_avg_ms', stats)
+
+    def test_get_many_keeps_order_and_reports_misses(self):
+        """Test that get_many reads chunks of ids in the order asked"""
+        self.app.config['GET_MANY_CHUNK_SIZE'] = 2
+        places = [facade.create_place({"title": f"Place {i}", "owner_id": self.user.id}) for i in range(5)]
+        ids = [places[3].id, "missing", places[0].id, places[4].id, places[0].id, places[1].id]
+        items, missing = facade.get_places_by_ids(ids)
+        self.assertEqual([place.id for place in items], [places[i].id for i in (3, 0, 4, 1)])
+        self.assertEqual(missing, ["missing"])
+
+    def test_bitmap_and_across_chunks(self):
+        """Test bitmap membership and intersection around chunk boundaries"""
+        evens = Bitmap(range(0, 200000, 2))
+        edges = Bitmap([0, 65535, 65536, 131072, 199999])
+        self.assertEqual(list(evens & edges), [0, 65536, 131072])
+        self.assertEqual(len(evens), 100000)
+        evens.discard(65536)
+        self.assertNotIn(65536, evens)
+        self.assertIn(65538, evens)
+
+    def test_compiled_validators_check_models_and_updates(self):
+        """Test the schema validators behind the constructors, setters and updates"""
+        self.assertEqual(Place.SCHEMA.validate({"title": "Loft", "price": 3, "latitude": 1, "longitude": 2}),
+                         {"title": "Loft", "price": 3.0, "latitude": 1.0, "longitude": 2.0})
+        for kwargs, message in (({"title": ""}, "Title cannot be empty"),
+                                ({"title": "Loft", "price": "3"}, "Price must be a number"),
+                                ({"title": "Loft", "price": -1}, "Price cannot be negative"),
+                                ({"title": "Loft", "latitude": 91}, "Latitude must be between -90 and 90")):
+            with self.assertRaisesRegex(ValueError, message):
+                Place(**kwargs)
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.assertRaisesRegex(ValueError, "Latitude must be a number"):
+                Place.SCHEMA.validate({"latitude": value}, partial=True)
+            with self.assertRaisesRegex(ValueError, "Price must be a number"):
+                Place.SCHEMA.validate({"price": value}, partial=True)
+        with self.assertRaisesRegex(ValueError, "Password is required."):
+            User(first_name="Jane", last_name="Doe", email="jane@example.com")
+        with self.assertRaisesRegex(ValueError, "Rating must be an integer between 1 and 5"):
+            Review.SCHEMA.validate({"rating": True}, partial=True)
+
+        place = Place(title="Loft", price=10)
+        with self.assertRaisesRegex(ValueError, "Longitude must be between -180 and 180"):
+            place.longitude = 200
+        with self.assertRaisesRegex(ValueError, "Invalid email format"):
+            facade.update_user(self.user.id, {"email": "not-an-email"})
+        self.assertEqual(facade.update_user(self.user.id, {"first_name": "Janet"}).first_name, "Janet")
+        saved = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        with self.assertRaisesRegex(ValueError, "Title cannot be empty"):
+            facade.update_place(saved.id, {"title": ""})
+        self.assertEqual(facade.get_place(saved.id).title, "Loft")
+
+    def test_transaction_commits_once_and_rolls_back_on_error(self):
+        """Test that writes in a unit of work are committed or discarded together"""
+        with facade.transaction():
+            facade.create_amenity({"name": "WiFi"})
+            facade.create_amenity({"name": "Pool"})
+        with self.assertRaises(RuntimeError):
+            with facade.transaction():
+                facade.create_amenity({"name": "Sauna"})
+                raise RuntimeError("abort")
+        self.assertEqual(sorted(a.name for a in facade.get_all_amenities()), ["Pool", "WiFi"])
+
+    def test_nested_transaction_uses_savepoint(self):
+        """Test that a failing bulk row only undoes its own savepoint"""
+        with facade.transaction():
+            facade.create_amenity({"name": "WiFi"})
+            result = facade.create_places([
+                {"title": "Valid", "owner_id": self.user.id},
+                {"title": "Orphan", "owner_id": "non-existent-owner-id"},
+                {"title": "Also valid", "owner_id": self.user.id},
+            ])
+        self.assertEqual(len(result['created']), 2)
+        self.assertEqual(len(facade.get_all_amenities()), 1)
+        self.assertEqual(len(facade.get_places()), 2)
+
+    def test_request_scoped_unit_of_work(self):
+        """Test that per-request mode rolls back writes of failed requests"""
+        app = create_app(type('PerRequestConfig', (TestingConfig,), {'UNIT_OF_WORK_PER_REQUEST': True}))
+
+        @app.route('/fail')
+        def fail():
+            facade.create_amenity({"name": "Ghost"})
+            return {"error": "nope"}, 400
+
+        @app.route('/ok')
+        def ok():
+            facade.create_amenity({"name": "Kept"})
+            return {}, 201
+
+        client = app.test_client()
+        self.assertEqual(client.get('/fail').status_code, 400)
+        self.assertEqual(client.get('/ok').status_code, 201)
+        db.session.remove()
+        self.assertEqual([a.name for a in facade.get_all_amenities()], ["Kept"])
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_eviction_and_expiry(self):
+        """Test LRU eviction and TTL expiry counters"""
+        now = [0]
+        cache = LRUCache(maxsize=2, ttl=10, clock=lambda: now[0])
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)  # evicts 'b', the least recently used
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+
+        now[0] = 11
+        self.assertIsNone(cache.get('c'))
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['hits'], 2)
+
+
+class ReplicaTestingConfig(TestingConfig):
+    """The SQLite test database as primary, and an in-memory database as its read replica."""
+    SQLALCHEMY_BINDS = {'replica': 'sqlite://'}
+    SQLALCHEMY_READ_REPLICAS = ['replica']
+    ENTITY_CACHE_ENABLED = False
+
+
+class TestReadReplicaRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(ReplicaTestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.replica = db.engines['replica']
+        db.metadata.create_all(self.replica)
+
+        # A row that only exists on the replica tells us where reads went
+        with self.replica.begin() as conn:
+            conn.execute(Amenity.__table__.insert(), {"name": "Replica only"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.metadata.drop_all(self.replica)
+        db.drop_all()
+        self.ctx.pop()
+        # init_app() registers a metadata per bind on the shared db object;
+        # drop it so later apps without the replica bind can create_all()
+        db.metadatas.pop('replica', None)
+
+    def test_reads_go_to_replica(self):
+        """Test that repository reads are served by the replica"""
+        names = [amenity.name for amenity in facade.get_all_amenities()]
+        self.assertEqual(names, ["Replica only"])
+
+    def test_reads_after_write_go_to_primary(self):
+        """Test read-your-own-writes once the session has written"""
+        facade.create_amenity({"name": "Primary only"})
+        names = [amenity.name for amenity in facade.get_all_amenities()]
+        self.assertEqual(names, ["Primary only"])
+
+    def test_router_skips_failed_replica(self):
+        """Test round-robin selection and passive health checking"""
+        now = [0]
+        router = ReplicaRouter(['r1', 'r2'], retry_interval=10, clock=lambda: now[0])
+        self.assertEqual([router.choose() for _ in range(3)], ['r1', 'r2', 'r1'])
+        router.mark_down('r2')
+        self.assertEqual([router.choose() for _ in range(2)], ['r1', 'r1'])
+        router.mark_down('r1')
+        self.assertIsNone(router.choose())
+        now[0] = 11
+        self.assertIn(router.choose(), ['r1', 'r2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
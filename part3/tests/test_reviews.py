@@ -1,6 +1,8 @@
 import unittest
 import json
 from app import create_app
+from api_test_case import ApiTestCase
+from app.services import facade
 
 class TestReviewEndpoints(unittest.TestCase):
 
@@ -81,4 +83,53 @@ class TestReviewEndpoints(unittest.TestCase):
         invalid_data = dict(self.test_review_data)
         invalid_data['user_id'] = "non-existent-user-id"
         response = self.client.post('/api/v1/reviews/', json=invalid_data)
-        self.assertEqual(response.status_code, 400)
\ No newline at end of file
+        self.assertEqual(response.status_code, 400)
+
+class TestReviewApi(ApiTestCase):
+    """Review endpoints against the SQLite TestingConfig database."""
+
+    def test_review_list_sparse_fields(self):
+        """Test that the review list keeps text by default and trims to ?fields="""
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        reviewer = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane.doe@example.com", "password": "password123"
+        })
+        facade.create_review({"text": "Great", "rating": 4, "user_id": reviewer.id, "place_id": place.id})
+        self.assertEqual(self.client.get('/api/v1/reviews/').get_json()[0]['text'], "Great")
+        self.assertEqual(self.client.get('/api/v1/reviews/?fields=rating').get_json(), [{"rating": 4}])
+
+    def test_review_detail_returns_json(self):
+        """Test the review detail GET without ?fields="""
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        reviewer = facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": "jane.doe@example.com", "password": "password123"
+        })
+        review = facade.create_review({"text": "Great", "rating": 4, "user_id": reviewer.id, "place_id": place.id})
+        response = self.client.get(f'/api/v1/reviews/{review.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['text'], "Great")
+        self.assertIn('Last-Modified', response.headers)
+
+    def test_review_update_and_delete_check_the_author(self):
+        """Test that a non-admin can edit and delete their own review but not someone else's"""
+        place = facade.create_place({"title": "Loft", "owner_id": self.user.id})
+        author, stranger = [facade.create_user({
+            "first_name": "Jane", "last_name": "Doe",
+            "email": f"jane{i}@example.com", "password": "password123"
+        }) for i in range(2)]
+        review = facade.create_review({"text": "Great", "rating": 4, "user_id": author.id, "place_id": place.id})
+        url = f'/api/v1/reviews/{review.id}'
+
+        response = self.client.put(url, json={"text": "Hijacked", "rating": 1, "place_id": place.id},
+                                   headers=self.auth_headers(stranger))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.delete(url, headers=self.auth_headers(stranger)).status_code, 403)
+
+        response = self.client.put(url, json={"text": "Still great", "rating": 5, "place_id": place.id},
+                                   headers=self.auth_headers(author))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['text'], "Still great")
+        self.assertEqual(self.client.delete(url, headers=self.auth_headers(author)).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -2,6 +2,8 @@
 import unittest
 import json
 from app import create_app
+from api_test_case import ApiTestCase
+from app.services import facade
 
 class TestUserEndpoints(unittest.TestCase):
 
@@ -93,5 +95,26 @@ class TestUserEndpoints(unittest.TestCase):
         response = self.client.get('/api/v1/users/nonexistent-id')
         self.assertEqual(response.status_code, 404)
 
+class TestUserIdsLookup(ApiTestCase):
+    """User multi-get against the SQLite TestingConfig database."""
+
+    def test_user_list_by_ids(self):
+        """Test ?ids= on the user list"""
+        response = self.client.get(f'/api/v1/users/?ids={self.user.id}')
+        self.assertEqual(response.get_json()[0]['email'], "test.owner@example.com")
+        self.assertNotIn('X-Missing-Ids', response.headers)
+
+    def test_admin_password_update_is_hashed(self):
+        """Test that a password set through PUT still logs the user in"""
+        response = self.client.put(f'/api/v1/users/{self.user.id}', headers=self.auth_headers(is_admin=True),
+                                   json={"password": "new-password"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(facade.get_user(self.user.id).password, "new-password")
+        response = self.client.post('/api/v1/auth/login',
+                                    json={"email": "test.owner@example.com", "password": "new-password"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.get_json())
+
+
 if __name__ == '__main__':
     unittest.main()